@@ -115,8 +115,19 @@ class AgentStack(Stack):
         self.agent_lambda.add_environment("MERLIN_DATA_LAKE_BUCKET", data_stack.landing_bucket.bucket_name)
         self.agent_lambda.add_environment("MERLIN_RUNS_TABLE", data_stack.runs_table.table_name)
         self.agent_lambda.add_environment("MERLIN_ACTIONS_TABLE", data_stack.actions_table.table_name)
+        self.agent_lambda.add_environment("MERLIN_VIDEO_JOBS_TABLE", data_stack.video_jobs_table.table_name)
+        self.agent_lambda.add_environment("MERLIN_CREATIVE_BUCKET", data_stack.creative_bucket.bucket_name)
         self.agent_lambda.add_environment("FORECAST_ENDPOINT_NAME", endpoint_name)
 
+        # Service role Bedrock assumes to read batch inputs and write outputs for nightly summaries
+        self.bedrock_batch_role = iam.Role(
+            self,
+            "BedrockBatchInferenceRole",
+            assumed_by=iam.ServicePrincipal("bedrock.amazonaws.com"),
+        )
+        data_stack.curated_bucket.grant_read_write(self.bedrock_batch_role)
+        self.agent_lambda.add_environment("MERLIN_BEDROCK_BATCH_ROLE_ARN", self.bedrock_batch_role.role_arn)
+
         self.event_rule = events.Rule(
             self,
             "ScheduledAgentRun",
@@ -124,10 +135,12 @@ class AgentStack(Stack):
         )
         self.event_rule.add_target(targets.LambdaFunction(self.agent_lambda))
 
-        data_stack.curated_bucket.grant_read(self.agent_lambda)
+        data_stack.curated_bucket.grant_read_write(self.agent_lambda)
         data_stack.landing_bucket.grant_read(self.agent_lambda)
         data_stack.runs_table.grant_read_write_data(self.agent_lambda)
         data_stack.actions_table.grant_read_write_data(self.agent_lambda)
+        data_stack.video_jobs_table.grant_read_write_data(self.agent_lambda)
+        data_stack.creative_bucket.grant_read_write(self.agent_lambda)
 
         self.agent_lambda.add_to_role_policy(
             iam.PolicyStatement(
@@ -155,10 +168,16 @@ class AgentStack(Stack):
                     "bedrock:InvokeAgent",
                     "bedrock:InvokeModel",
                     "bedrock:InvokeModelWithResponseStream",
+                    "bedrock:CreateModelInvocationJob",
+                    "bedrock:GetModelInvocationJob",
+                    "bedrock:StartAsyncInvoke",
+                    "bedrock:GetAsyncInvoke",
+                    "bedrock:ListAsyncInvokes",
                 ],
                 resources=["*"],
             )
         )
+        self.bedrock_batch_role.grant_pass_role(self.agent_lambda)
 
         self.ui_service = None
         if deploy_ui:
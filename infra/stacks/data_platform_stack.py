@@ -46,6 +46,13 @@ class DataPlatformStack(Stack):
             removal_policy=RemovalPolicy.DESTROY,
         )
 
+        # Resolves the newest model of a type with one Limit=1 query instead of a table scan
+        self.runs_table.add_global_secondary_index(
+            index_name="model_type-created_at-index",
+            partition_key=dynamodb.Attribute(name="model_type", type=dynamodb.AttributeType.STRING),
+            sort_key=dynamodb.Attribute(name="created_at", type=dynamodb.AttributeType.STRING),
+        )
+
         self.actions_table = dynamodb.Table(
             self,
             "ActionsTable",
@@ -54,6 +61,22 @@ class DataPlatformStack(Stack):
             removal_policy=RemovalPolicy.DESTROY,
         )
 
+        # Nova Reel async invocations, keyed by invocation ARN
+        self.video_jobs_table = dynamodb.Table(
+            self,
+            "VideoJobsTable",
+            partition_key=dynamodb.Attribute(name="job_id", type=dynamodb.AttributeType.STRING),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=RemovalPolicy.DESTROY,
+        )
+
+        # Status sweeps query the pending jobs instead of scanning every job ever submitted
+        self.video_jobs_table.add_global_secondary_index(
+            index_name="status-submitted_at-index",
+            partition_key=dynamodb.Attribute(name="status", type=dynamodb.AttributeType.STRING),
+            sort_key=dynamodb.Attribute(name="submitted_at", type=dynamodb.AttributeType.STRING),
+        )
+
         self.glue_database = glue.CfnDatabase(
             self,
             "GlueDatabase",
@@ -85,3 +108,4 @@ class DataPlatformStack(Stack):
         CfnOutput(self, "CreativeBucketOutput", export_name=f"MerlinCreativeBucket-{env_name}", value=self.creative_bucket.bucket_name)
         CfnOutput(self, "RunsTableOutput", export_name=f"MerlinRunsTable-{env_name}", value=self.runs_table.table_name)
         CfnOutput(self, "ActionsTableOutput", export_name=f"MerlinActionsTable-{env_name}", value=self.actions_table.table_name)
+        CfnOutput(self, "VideoJobsTableOutput", export_name=f"MerlinVideoJobsTable-{env_name}", value=self.video_jobs_table.table_name)
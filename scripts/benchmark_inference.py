@@ -0,0 +1,302 @@
+"""
+Forecast inference benchmark.
+
+Trains a throwaway model on synthetic features, then measures:
+
+* ``local``    - ``LocalDemandForecaster.predict`` per payload size and booster thread count;
+* ``endpoint`` - ``DemandForecastClient.predict`` against a local HTTP stand-in for the SageMaker
+  runtime (InvokeEndpoint is served from the same booster);
+* ``batched``  - ``DemandForecastClient.predict_many`` over many SKUs per batch size, request
+  concurrency and content type.
+
+Each scenario reports p50/p95/p99 latency, rows/sec and process RSS, and the full run is written
+as JSON so two revisions can be diffed. No AWS account is needed.
+
+    poetry run python scripts/benchmark_inference.py --output benchmarks/inference.json
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import resource
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+import xgboost
+from xgboost import XGBRegressor
+
+from aws_merlin_agent.features.engineering import FORECAST_FEATURES
+from aws_merlin_agent.models.inference.batching_client import (
+    CONTENT_JSON,
+    CONTENT_NPY,
+    BatchingForecastClient,
+)
+from aws_merlin_agent.models.inference.local_runner import LocalDemandForecaster
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+ENDPOINT_NAME = "merlin-bench-demand-forecast"
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part]
+
+
+def _rss_mb() -> float:
+    """Current resident set size (falls back to the peak where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        return _peak_rss_mb()
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if platform.system() == "Darwin" else peak / 1e3
+
+
+def synthetic_features(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    units = rng.integers(1, 40, rows).astype(float)
+    price = rng.uniform(15, 35, rows)
+    ad_spend = rng.uniform(5, 40, rows)
+    inventory = rng.integers(20, 300, rows).astype(float)
+    revenue = units * price
+    return pd.DataFrame(
+        {
+            "net_revenue": revenue,
+            "ad_spend": ad_spend,
+            "inventory_on_hand": inventory,
+            "revenue_per_unit": price,
+            "ad_efficiency": revenue / ad_spend,
+            "stockout_risk": units * 7 / inventory,
+            "lag_days": np.arange(rows, dtype=float),
+        },
+        columns=FORECAST_FEATURES,
+    )
+
+
+def train_model(path: Path, n_estimators: int) -> None:
+    frame = synthetic_features(5_000)
+    target = frame["net_revenue"] / frame["revenue_per_unit"]
+    model = XGBRegressor(n_estimators=n_estimators, max_depth=6, learning_rate=0.1, tree_method="hist")
+    model.fit(frame, target)
+    model.save_model(str(path))
+
+
+def measure(
+    name: str,
+    params: Dict[str, Any],
+    rows_per_call: int,
+    calls: int,
+    fn: Callable[[], Any],
+    warmup: int = 3,
+) -> Dict[str, Any]:
+    """Time ``calls`` sequential invocations of ``fn`` after a short warm-up."""
+    for _ in range(warmup):
+        fn()
+    latencies = np.empty(calls, dtype=np.float64)
+    started = time.perf_counter()
+    for idx in range(calls):
+        tick = time.perf_counter()
+        fn()
+        latencies[idx] = time.perf_counter() - tick
+    elapsed = time.perf_counter() - started
+    p50, p95, p99 = np.percentile(latencies * 1000, [50, 95, 99])
+    result = {
+        "scenario": name,
+        **params,
+        "rows_per_call": rows_per_call,
+        "calls": calls,
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "rows_per_s": round(rows_per_call * calls / elapsed, 1),
+        "rss_mb": round(_rss_mb(), 1),
+    }
+    logger.info(
+        "%-8s %-40s p50=%8.3fms p95=%8.3fms p99=%8.3fms %12.1f rows/s",
+        name,
+        json.dumps(params, sort_keys=True),
+        result["p50_ms"],
+        result["p95_ms"],
+        result["p99_ms"],
+        result["rows_per_s"],
+    )
+    return result
+
+
+class _RuntimeStandIn(BaseHTTPRequestHandler):
+    """Minimal InvokeEndpoint: JSON, CSV or .npy in; JSON or .npy out."""
+
+    forecaster: LocalDemandForecaster
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        content_type = self.headers.get("Content-Type", CONTENT_JSON)
+        if content_type == CONTENT_JSON:
+            predictions = self.forecaster.predict(json.loads(body))["predictions"]
+        else:
+            if content_type == CONTENT_NPY:
+                matrix = np.load(io.BytesIO(body), allow_pickle=False)
+            else:
+                matrix = np.loadtxt(io.StringIO(body.decode("utf-8")), delimiter=",", ndmin=2)
+            predictions = self.forecaster.predict_matrix(FORECAST_FEATURES, matrix)
+        if self.headers.get("Accept") == CONTENT_NPY:
+            buffer = io.BytesIO()
+            np.save(buffer, np.asarray(predictions, dtype=np.float32), allow_pickle=False)
+            payload, response_type = buffer.getvalue(), CONTENT_NPY
+        else:
+            payload = json.dumps({"predictions": np.asarray(predictions).tolist()}).encode("utf-8")
+            response_type = CONTENT_JSON
+        self.send_response(200)
+        self.send_header("Content-Type", response_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *_args) -> None:
+        pass
+
+
+def start_runtime_stand_in(forecaster: LocalDemandForecaster) -> ThreadingHTTPServer:
+    handler = type("Handler", (_RuntimeStandIn,), {"forecaster": forecaster})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def configure_endpoint_env(port: int) -> None:
+    """Point every sagemaker-runtime client at the stand-in and keep the prediction cache out of the way."""
+    os.environ["AWS_ENDPOINT_URL_SAGEMAKER_RUNTIME"] = f"http://127.0.0.1:{port}"
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+    os.environ.setdefault("AWS_REGION", "us-east-1")
+    os.environ["MERLIN_INFERENCE_MODE"] = "sagemaker"
+    os.environ["MERLIN_PREDICTION_CACHE_SIZE"] = "0"
+    # Resource names are irrelevant here; setting them skips the CloudFormation lookup in settings.
+    for env_var in (
+        "MERLIN_DATA_LAKE_BUCKET",
+        "MERLIN_CURATED_BUCKET",
+        "MERLIN_CREATIVE_BUCKET",
+        "MERLIN_RUNS_TABLE",
+        "MERLIN_ACTIONS_TABLE",
+        "MERLIN_VIDEO_JOBS_TABLE",
+    ):
+        os.environ.setdefault(env_var, "merlin-bench")
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    workdir = Path(tempfile.mkdtemp(prefix="merlin-bench-"))
+    model_path = workdir / "model.json"
+    train_model(model_path, args.n_estimators)
+    baseline_rss = _rss_mb()
+
+    payloads = {
+        rows: {"instances": synthetic_features(rows, seed=rows).to_dict(orient="records")} for rows in args.rows
+    }
+
+    if "local" in args.scenarios:
+        for nthread in args.threads:
+            forecaster = LocalDemandForecaster.from_path(model_path, nthread=nthread)
+            for rows, payload in payloads.items():
+                results.append(
+                    measure("local", {"nthread": nthread}, rows, args.calls, lambda: forecaster.predict(payload))
+                )
+
+    if {"endpoint", "batched"} & set(args.scenarios):
+        from aws_merlin_agent.models.inference.demand_forecast_client import DemandForecastClient
+
+        server = start_runtime_stand_in(LocalDemandForecaster.from_path(model_path, nthread=1))
+        configure_endpoint_env(server.server_address[1])
+        try:
+            if "endpoint" in args.scenarios:
+                client = DemandForecastClient(endpoint_name=ENDPOINT_NAME)
+                for rows, payload in payloads.items():
+                    results.append(measure("endpoint", {}, rows, args.calls, lambda: client.predict(payload)))
+
+            if "batched" in args.scenarios:
+                per_sku = synthetic_features(7 * args.skus, seed=7)
+                fleet = {
+                    f"SKU-{idx:05d}": {"instances": per_sku.iloc[idx * 7 : (idx + 1) * 7].to_dict(orient="records")}
+                    for idx in range(args.skus)
+                }
+                for content_type in args.content_types:
+                    for batch_size in args.batch_sizes:
+                        for in_flight in args.threads:
+                            batching = BatchingForecastClient(
+                                ENDPOINT_NAME,
+                                content_type=content_type,
+                                max_batch_instances=batch_size,
+                                max_in_flight=in_flight,
+                                feature_order=FORECAST_FEATURES,
+                            )
+                            client = DemandForecastClient(endpoint_name=ENDPOINT_NAME, batching=batching)
+                            params = {"content_type": content_type, "batch_size": batch_size, "in_flight": in_flight}
+                            results.append(
+                                measure(
+                                    "batched",
+                                    params,
+                                    7 * args.skus,
+                                    max(1, args.calls // 10),
+                                    lambda: client.predict_many(fleet),
+                                )
+                            )
+        finally:
+            server.shutdown()
+
+    return {
+        "generated_at": datetime.utcnow().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "xgboost": xgboost.__version__,
+            "numpy": np.__version__,
+            "n_estimators": args.n_estimators,
+            "baseline_rss_mb": round(baseline_rss, 1),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MERLIN forecast inference paths.")
+    parser.add_argument("--scenarios", default="local,endpoint,batched", type=lambda v: v.split(","))
+    parser.add_argument("--rows", default="1,7,100,1000", type=_int_list, help="Instances per payload")
+    parser.add_argument("--threads", default="1,4", type=_int_list, help="Booster threads / requests in flight")
+    parser.add_argument("--batch-sizes", default="100,500", type=_int_list, help="Max instances per request")
+    parser.add_argument(
+        "--content-types", default=f"{CONTENT_JSON},{CONTENT_NPY}", type=lambda v: v.split(",")
+    )
+    parser.add_argument("--skus", type=int, default=500, help="SKUs in the batched fleet run")
+    parser.add_argument("--calls", type=int, default=200, help="Timed calls per scenario")
+    parser.add_argument("--n-estimators", type=int, default=250)
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/inference.json"))
+    args = parser.parse_args()
+
+    # Per-request library logs would dominate the output; scenario summaries are logged from here.
+    logging.getLogger("aws_merlin_agent").setLevel(logging.WARNING)
+    report = run(args)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"Wrote {len(report['results'])} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -83,11 +83,13 @@ echo -e "${YELLOW}Step 8: Training ML model (optional)...${NC}"
 read -p "Train ML model now? This takes 10-15 minutes. (y/N): " -n 1 -r
 echo
 if [[ $REPLY =~ ^[Yy]$ ]]; then
-    poetry run python -m aws_merlin_agent.models.training.pipeline --env $ENV
+    # The SageMaker XGBoost container reads plain model files, so publish this run uncompressed JSON
+    MERLIN_MODEL_FORMAT=json MERLIN_MODEL_COMPRESSION=none \
+        poetry run python -m aws_merlin_agent.models.training.pipeline --env $ENV
     echo -e "${GREEN}✓ Model trained${NC}"
     
-    # Get model artifact URI
-    MODEL_URI=$(aws s3 ls s3://$(aws cloudformation describe-stacks --stack-name MerlinDataPlatformStack-$ENV --query "Stacks[0].Outputs[?OutputKey=='CuratedBucketOutput'].OutputValue" --output text)/models/$ENV/demand_forecast/ --recursive | sort | tail -n 1 | awk '{print "s3://"$4}')
+    # Get the active model's artifact URI from the registry (each run has its own key plus a .meta.json sidecar)
+    MODEL_URI=$(poetry run python -m aws_merlin_agent.models.registry artifact-uri)
     echo "Model URI: $MODEL_URI"
     
     # Deploy agent stack with model
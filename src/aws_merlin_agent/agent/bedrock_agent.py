@@ -10,6 +10,9 @@ import json
 import uuid
 from typing import Any, Dict, Optional
 
+from aws_merlin_agent.bedrock.adapters import TextRequest
+from aws_merlin_agent.bedrock.client import BedrockClient
+from aws_merlin_agent.bedrock.router import get_router
 from aws_merlin_agent.config.settings import EnvironmentSettings
 from aws_merlin_agent.utils import aws
 from aws_merlin_agent.utils.logging import get_logger
@@ -27,7 +30,8 @@ class BedrockAgentOrchestrator:
     def __init__(self, agent_id: Optional[str] = None, agent_alias_id: Optional[str] = None):
         self.settings = EnvironmentSettings.load()
         self.bedrock_agent_runtime = aws.client("bedrock-agent-runtime", region_name=self.settings.region)
-        self.bedrock_runtime = aws.client("bedrock-runtime", region_name=self.settings.region)
+        self.router = get_router()
+        self.llm = BedrockClient(self.settings.region, router=self.router)
         
         # Agent configuration (can be overridden with deployed agent)
         self.agent_id = agent_id
@@ -75,7 +79,7 @@ class BedrockAgentOrchestrator:
         logger.info("Invoking inline Bedrock agent for session %s", session_id)
         
         # Define action groups for MERLIN tools (for future inline agent API support)
-        # Currently using Converse API directly, but action_groups define available tools
+        # Currently using the shared Bedrock client directly, but action_groups define available tools
         _action_groups = [
             {
                 "actionGroupName": "MetricsAnalysis",
@@ -163,43 +167,33 @@ When users ask questions:
 
 Be concise, data-driven, and focused on helping sellers grow their business."""
 
+        decision = self.router.route(prompt, task="agent")
+        request = TextRequest(prompt=prompt, system=instruction, max_tokens=decision.max_tokens)
+
         try:
-            # Use Converse API with inline agent configuration
-            response = self.bedrock_runtime.converse(
-                modelId="amazon.nova-pro-v1:0",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [{"text": prompt}]
-                    }
-                ],
-                system=[{"text": instruction}],
-                inferenceConfig={
-                    "maxTokens": 1000,
-                    "temperature": 0.7,
-                    "topP": 0.9
-                }
-            )
-            
-            output_text = response["output"]["message"]["content"][0]["text"]
-            
-            result = {
-                "response": output_text,
-                "session_id": session_id,
-                "trace": {
-                    "reasoning": "Using Nova Pro for intelligent analysis",
-                    "model": "amazon.nova-pro-v1:0"
-                } if enable_trace else None,
-                "stop_reason": response.get("stopReason", "end_turn")
-            }
-            
-            logger.info("Inline agent invocation successful")
-            return result
-            
+            # Models with an open circuit are skipped without paying their failure latency
+            completion = self.llm.generate(request, decision.candidates)
         except Exception as e:
-            logger.error("Inline agent invocation failed: %s", str(e))
-            # Fallback to Claude
-            return self._fallback_to_claude(prompt, session_id, instruction)
+            logger.error("Inline agent invocation failed on all models: %s", str(e))
+            raise
+
+        model_id = completion.model_id
+        if model_id == decision.model_id:
+            reasoning = f"Routed {decision.tier} request to {model_id}"
+        else:
+            reasoning = f"Fallback from {decision.model_id} to {model_id}"
+        
+        logger.info("Inline agent invocation successful using %s", model_id)
+        return {
+            "response": completion.text,
+            "session_id": session_id,
+            "trace": {
+                "reasoning": reasoning,
+                "model": model_id,
+                "tier": decision.tier,
+            } if enable_trace else None,
+            "stop_reason": completion.stop_reason
+        }
     
     def _invoke_deployed_agent(
         self,
@@ -245,52 +239,6 @@ Be concise, data-driven, and focused on helping sellers grow their business."""
         except Exception as e:
             logger.error("Deployed agent invocation failed: %s", str(e))
             raise
-    
-    def _fallback_to_claude(
-        self,
-        prompt: str,
-        session_id: str,
-        instruction: str
-    ) -> Dict[str, Any]:
-        """Fallback to Claude when Nova is unavailable."""
-        logger.info("Using Claude fallback for agent reasoning")
-        
-        try:
-            full_prompt = f"{instruction}\n\nUser: {prompt}\n\nAssistant:"
-            
-            request_body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 1000,
-                "temperature": 0.7,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": full_prompt
-                    }
-                ]
-            }
-            
-            response = self.bedrock_runtime.invoke_model(
-                modelId="anthropic.claude-3-sonnet-20240229-v1:0",
-                body=json.dumps(request_body)
-            )
-            
-            response_body = json.loads(response["body"].read())
-            output_text = response_body["content"][0]["text"]
-            
-            return {
-                "response": output_text,
-                "session_id": session_id,
-                "trace": {
-                    "reasoning": "Using Claude fallback",
-                    "model": "anthropic.claude-3-sonnet-20240229-v1:0"
-                },
-                "stop_reason": "end_turn"
-            }
-            
-        except Exception as e:
-            logger.error("Claude fallback also failed: %s", str(e))
-            raise
 
 
 def create_conversational_response(
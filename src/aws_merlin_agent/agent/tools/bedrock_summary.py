@@ -1,118 +1,160 @@
 from __future__ import annotations
 
-import json
-from typing import List, Dict
+from datetime import datetime
+from typing import Any, List, Dict, Optional
 
+from aws_merlin_agent.agent.tools.kpi_prompt import build_kpi_prompt
+from aws_merlin_agent.bedrock.adapters import TextRequest, adapter_for
+from aws_merlin_agent.bedrock.batch import BatchBackend, default_backend, record_id
+from aws_merlin_agent.bedrock.client import BedrockClient
+from aws_merlin_agent.bedrock.router import get_router
 from aws_merlin_agent.config.settings import EnvironmentSettings
-from aws_merlin_agent.utils import aws
 from aws_merlin_agent.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
+def _totals(rows: List[Dict[str, Any]]) -> Dict[str, float]:
+    return {
+        "units": sum(float(row.get("units_sold", 0)) for row in rows),
+        "revenue": sum(float(row.get("net_revenue_usd", 0)) for row in rows),
+        "ad_spend": sum(float(row.get("ad_spend_usd", 0)) for row in rows),
+    }
+
+
+def build_summary_prompt(rows: List[Dict[str, Any]]) -> str:
+    """Render the narrative-summary prompt for one SKU's recent KPI rows."""
+    # Compact table + precomputed aggregates, trimmed to MERLIN_SUMMARY_TOKEN_BUDGET
+    return build_kpi_prompt(rows)
+
+
+def basic_summary(rows: List[Dict[str, Any]]) -> str:
+    """Deterministic summary used when no LLM output is available."""
+    totals = _totals(rows)
+    avg_acos = (totals["ad_spend"] / totals["revenue"] * 100) if totals["revenue"] > 0 else 0
+    return (
+        f"Performance Summary ({len(rows)} days):\n"
+        f"• Units Sold: {int(totals['units'])}\n"
+        f"• Revenue: ${totals['revenue']:,.2f}\n"
+        f"• Ad Spend: ${totals['ad_spend']:,.2f}\n"
+        f"• ACOS: {avg_acos:.1f}%\n"
+        f"Note: LLM analysis unavailable - check Bedrock model access."
+    )
+
+
 def summarize_rows(rows: List[Dict[str, str]]) -> str:
     """
     Use Amazon Bedrock (Nova or Claude) to generate intelligent narrative summaries from KPI data.
-    
+
+    The model is picked by the shared router, with the configured fallback chain tried in order.
+
     This implements the required LLM reasoning component for the hackathon.
     """
     if not rows:
         return "No recent data available."
-    
+
     settings = EnvironmentSettings.load()
-    bedrock_runtime = aws.client("bedrock-runtime", region_name=settings.region)
-    
-    # Calculate basic metrics for context
-    total_units = sum(float(row.get("units_sold", 0)) for row in rows)
-    total_revenue = sum(float(row.get("net_revenue_usd", 0)) for row in rows)
-    total_ad_spend = sum(float(row.get("ad_spend_usd", 0)) for row in rows)
-    
-    # Prepare data for LLM analysis
-    data_summary = {
-        "period_days": len(rows),
-        "total_units_sold": int(total_units),
-        "total_revenue_usd": round(total_revenue, 2),
-        "total_ad_spend_usd": round(total_ad_spend, 2),
-        "daily_data": rows[:7]  # Include recent daily breakdown
-    }
-    
-    prompt = f"""You are MERLIN, an AI agent helping Amazon marketplace sellers optimize their business.
+    prompt = build_summary_prompt(rows)
+
+    decision = get_router().route(prompt, task="summary")
+    try:
+        # Open circuits are skipped and, when enabled, slow calls are hedged to the next model
+        completion = BedrockClient(settings.region).generate(
+            TextRequest(prompt=prompt, max_tokens=decision.max_tokens), decision.candidates
+        )
+        summary = completion.text
+        logger.info("Generated Bedrock summary using %s (%s tier)", completion.model_id, decision.tier)
+    except Exception as e:
+        logger.error("All summary models failed (%s): %s", ", ".join(decision.candidates), str(e))
+        # Provide basic summary as last resort
+        summary = basic_summary(rows)
 
-Analyze this sales performance data and provide actionable insights:
+    return summary
 
-{json.dumps(data_summary, indent=2)}
 
-Provide a concise analysis covering:
-1. Overall performance trend
-2. Key metrics (units sold, revenue, advertising efficiency)
-3. Specific recommendations for improvement
-4. Any concerning patterns or opportunities
+def submit_summary_batch(
+    rows_by_sku: Dict[str, List[Dict[str, Any]]],
+    backend: Optional[BatchBackend] = None,
+    model_id: Optional[str] = None,
+) -> str:
+    """
+    Queue narrative summaries for many SKUs as one Bedrock batch-inference job.
 
-Keep your response focused and actionable for a busy seller."""
+    Prompts are identical to ``summarize_rows`` so batch and interactive narratives match; the
+    interactive path is untouched. Returns the job identifier to pass to ``collect_summary_batch``.
+    """
+    settings = EnvironmentSettings.load()
+    backend = backend or default_backend(settings)
+    skus = [sku for sku, rows in rows_by_sku.items() if rows]
+    if not skus:
+        raise ValueError("No SKU rows to summarize")
 
-    try:
-        # Try Amazon Nova Pro first (preferred for hackathon)
-        model_id = "amazon.nova-pro-v1:0"
-        request_body = {
-            "messages": [
-                {
-                    "role": "user",
-                    "content": [{"text": prompt}]
-                }
-            ],
-            "inferenceConfig": {
-                "max_new_tokens": 500,
-                "temperature": 0.7,
-                "top_p": 0.9
-            }
+    sample = build_summary_prompt(rows_by_sku[skus[0]])
+    decision = get_router().route(sample, task="summary")
+    model_id = model_id or decision.model_id
+    adapter = adapter_for(model_id)
+    # SKUs do not fit Bedrock's record id format, so records are numbered and mapped back on collect.
+    record_skus = {record_id(index): sku for index, sku in enumerate(skus)}
+    records = [
+        {
+            "recordId": rid,
+            "modelInput": adapter.build_body(
+                TextRequest(prompt=build_summary_prompt(rows_by_sku[sku]), max_tokens=decision.max_tokens)
+            ),
         }
-        
-        response = bedrock_runtime.invoke_model(
-            modelId=model_id,
-            body=json.dumps(request_body)
-        )
-        
-        response_body = json.loads(response["body"].read())
-        summary = response_body["output"]["message"]["content"][0]["text"]
-        logger.info("Generated Bedrock summary using %s", model_id)
-        
-    except Exception as e:
-        logger.warning("Nova Pro failed (%s), falling back to Claude", str(e))
+        for rid, sku in record_skus.items()
+    ]
+    job_name = f"merlin-{settings.env}-summaries-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}"
+    job_id = backend.submit(job_name, model_id, records, metadata={"record_skus": record_skus})
+    logger.info("Submitted summary batch %s for %d SKUs on %s", job_id, len(records), model_id)
+    return job_id
+
+
+def collect_summary_batch(
+    job_id: str,
+    rows_by_sku: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    backend: Optional[BatchBackend] = None,
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Gather a finished summary batch and write one result per SKU to the backend's results store.
+
+    Returns None while the job is still running. Records the model could not complete fall back to
+    ``basic_summary`` when their rows are supplied, otherwise they are stored with status ``error``.
+    """
+    backend = backend or default_backend(EnvironmentSettings.load())
+    status = backend.status(job_id)
+    if status not in BatchBackend.TERMINAL_STATES:
+        logger.info("Summary batch %s is %s", job_id, status)
+        return None
+
+    model_id = backend.model_id(job_id)
+    record_skus = backend.metadata(job_id).get("record_skus", {})
+    adapter = adapter_for(model_id)
+    generated_at = datetime.utcnow().isoformat()
+    results: Dict[str, Dict[str, Any]] = {}
+    for record in backend.outputs(job_id):
+        sku = record_skus.get(record["recordId"], record["recordId"])
+        result: Dict[str, Any] = {"sku": sku, "job_id": job_id, "model_id": model_id, "generated_at": generated_at}
         try:
-            # Fallback to Claude 3 Sonnet
-            model_id = "anthropic.claude-3-sonnet-20240229-v1:0"
-            request_body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 500,
-                "temperature": 0.7,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
+            result["summary"] = adapter.parse_response(model_id, record["modelOutput"]).text
+            result["status"] = "success"
+        except (KeyError, IndexError, TypeError) as exc:
+            logger.warning("Batch record %s failed: %s", sku, record.get("error", exc))
+            result["status"] = "error"
+            result["error"] = str(record.get("error", exc))
+        results[sku] = result
+
+    for sku, rows in (rows_by_sku or {}).items():
+        if rows and results.get(sku, {}).get("status") != "success":
+            results[sku] = {
+                "sku": sku,
+                "job_id": job_id,
+                "model_id": None,
+                "generated_at": generated_at,
+                "summary": basic_summary(rows),
+                "status": "fallback",
             }
-            
-            response = bedrock_runtime.invoke_model(
-                modelId=model_id,
-                body=json.dumps(request_body)
-            )
-            
-            response_body = json.loads(response["body"].read())
-            summary = response_body["content"][0]["text"]
-            logger.info("Generated Bedrock summary using Claude fallback")
-            
-        except Exception as fallback_error:
-            logger.error("Both Nova and Claude failed: %s", str(fallback_error))
-            # Provide basic summary as last resort
-            avg_acos = (total_ad_spend / total_revenue * 100) if total_revenue > 0 else 0
-            summary = (
-                f"Performance Summary ({len(rows)} days):\n"
-                f"• Units Sold: {int(total_units)}\n"
-                f"• Revenue: ${total_revenue:,.2f}\n"
-                f"• Ad Spend: ${total_ad_spend:,.2f}\n"
-                f"• ACOS: {avg_acos:.1f}%\n"
-                f"Note: LLM analysis unavailable - check Bedrock model access."
-            )
-    
-    return summary
+
+    location = backend.store_results(job_id, results)
+    logger.info("Collected %d summaries from batch %s (%s) into %s", len(results), job_id, status, location)
+    return results
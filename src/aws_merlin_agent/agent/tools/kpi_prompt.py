@@ -0,0 +1,152 @@
+"""
+Compact prompt encoding for KPI rows sent to the LLM.
+
+Daily rows are rendered as a pipe-delimited table with a single header instead of repeated JSON
+keys, and the trend figures the model would otherwise have to derive (slope, week-over-week
+deltas, ACOS, stockout days) are precomputed with NumPy. The table is trimmed, oldest rows first,
+until the prompt fits the input-token budget.
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# (row key, table header) pairs in table column order.
+TABLE_COLUMNS = (
+    ("sale_date", "date"),
+    ("units_sold", "units"),
+    ("net_revenue_usd", "rev"),
+    ("ad_spend_usd", "ad"),
+    ("inventory_on_hand", "inv"),
+)
+DEFAULT_TOKEN_BUDGET = 600
+
+INSTRUCTIONS = """You are MERLIN, an AI agent helping Amazon marketplace sellers optimize their business.
+Analyze this SKU's sales performance and give actionable insights: overall trend, key metrics
+(units, revenue, ad efficiency), specific recommendations, and concerning patterns or opportunities.
+Aggregates are precomputed; slopes are per day, deltas compare the last 7 days with the 7 before.
+Keep it focused and actionable for a busy seller."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for budgeting."""
+    return (len(text) + 3) // 4
+
+
+def _column(rows: Sequence[Dict[str, Any]], key: str) -> np.ndarray:
+    values = np.full(len(rows), np.nan, dtype=np.float64)
+    for idx, row in enumerate(rows):
+        value = row.get(key)
+        if value is None or value == "":
+            continue
+        try:
+            values[idx] = float(value)
+        except (TypeError, ValueError):
+            continue
+    return values
+
+
+def _fmt(value: Optional[float]) -> str:
+    if value is None or not np.isfinite(value):
+        return "n/a"
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _sorted_rows(rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if all(row.get("sale_date") for row in rows):
+        return sorted(rows, key=lambda row: str(row["sale_date"]))
+    return list(rows)
+
+
+def _pct_delta(current: float, previous: float) -> Optional[float]:
+    if previous == 0:
+        return None
+    return (current - previous) / previous * 100.0
+
+
+def compute_kpi_aggregates(rows: Sequence[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    """Vectorized period aggregates for one SKU's daily rows (rows are ordered by date first)."""
+    ordered = _sorted_rows(rows)
+    units = _column(ordered, "units_sold")
+    revenue = _column(ordered, "net_revenue_usd")
+    ad_spend = _column(ordered, "ad_spend_usd")
+    inventory = _column(ordered, "inventory_on_hand")
+
+    units_total = float(np.nansum(units))
+    revenue_total = float(np.nansum(revenue))
+    ad_total = float(np.nansum(ad_spend))
+    aggregates: Dict[str, Optional[float]] = {
+        "days": float(len(ordered)),
+        "units_total": units_total,
+        "revenue_total": revenue_total,
+        "ad_spend_total": ad_total,
+        "acos_pct": ad_total / revenue_total * 100.0 if revenue_total > 0 else None,
+        "avg_daily_units": float(np.nanmean(units)) if np.isfinite(units).any() else None,
+        "units_slope": None,
+        "revenue_slope": None,
+        "units_wow_pct": None,
+        "revenue_wow_pct": None,
+        "stockout_days": None,
+        "days_of_cover": None,
+    }
+
+    day_index = np.arange(len(ordered), dtype=np.float64)
+    for name, series in (("units_slope", units), ("revenue_slope", revenue)):
+        mask = np.isfinite(series)
+        if mask.sum() >= 2:
+            aggregates[name] = float(np.polyfit(day_index[mask], series[mask], 1)[0])
+
+    if len(ordered) >= 14:
+        for name, series in (("units_wow_pct", units), ("revenue_wow_pct", revenue)):
+            aggregates[name] = _pct_delta(float(np.nansum(series[-7:])), float(np.nansum(series[-14:-7])))
+
+    if np.isfinite(inventory).any():
+        aggregates["stockout_days"] = float(np.sum(inventory[np.isfinite(inventory)] <= 0))
+        last_inventory = inventory[np.isfinite(inventory)][-1]
+        avg_units = aggregates["avg_daily_units"]
+        if avg_units:
+            aggregates["days_of_cover"] = float(last_inventory / avg_units)
+    return aggregates
+
+
+def encode_daily_table(rows: Sequence[Dict[str, Any]]) -> str:
+    """Render rows as a header line plus one pipe-delimited line per day."""
+    present = [(key, header) for key, header in TABLE_COLUMNS if any(key in row for row in rows)]
+    lines = ["|".join(header for _, header in present)]
+    for row in rows:
+        cells = []
+        for key, _ in present:
+            value = row.get(key)
+            if key == "sale_date":
+                cells.append(str(value or ""))
+                continue
+            try:
+                cells.append(_fmt(float(value)))
+            except (TypeError, ValueError):
+                cells.append("")
+        lines.append("|".join(cells))
+    return "\n".join(lines)
+
+
+def build_kpi_prompt(rows: Sequence[Dict[str, Any]], token_budget: Optional[int] = None) -> str:
+    """Assemble instructions, aggregates and the most recent daily rows within ``token_budget``."""
+    if token_budget is None:
+        token_budget = int(os.getenv("MERLIN_SUMMARY_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET))
+    ordered = _sorted_rows(rows)
+    aggregates = compute_kpi_aggregates(ordered)
+    aggregate_line = "; ".join(f"{key}={_fmt(value)}" for key, value in aggregates.items())
+    subject = f"SKU {ordered[0]['sku']}, " if ordered and ordered[0].get("sku") else ""
+    header = f"{INSTRUCTIONS}\n\n{subject}Aggregates: {aggregate_line}\n"
+
+    if not ordered:
+        return header
+    header_line, *day_lines = encode_daily_table(ordered).split("\n")
+    # Drop the oldest days until the prompt fits; each dropped line frees len(line) + 1 characters.
+    chars = len(header) + len(header_line) + sum(len(line) + 1 for line in day_lines) + 32
+    while day_lines and (chars + 3) // 4 > token_budget:
+        chars -= len(day_lines.pop(0)) + 1
+    if not day_lines:
+        return header
+    return f"{header}\nDaily ({len(day_lines)} most recent days):\n{header_line}\n" + "\n".join(day_lines)
@@ -10,6 +10,7 @@ from aws_merlin_agent.agent.bedrock_agent import BedrockAgentOrchestrator
 from aws_merlin_agent.features.engineering import build_feature_frame
 from aws_merlin_agent.config.settings import EnvironmentSettings
 from aws_merlin_agent.models.inference.demand_forecast_client import DemandForecastClient
+from aws_merlin_agent.models.inference.explanations import format_drivers
 from aws_merlin_agent.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -160,10 +161,21 @@ The product shows {('strong' if total_units > 100 else 'moderate')} sales perfor
                 rows = self._fetch_recent_rows(sku)
                 agent_response["tool_output"] = rows
             elif action == "forecast_demand":
-                # Agent wants a forecast
-                sku = agent_response.get("parameters", {}).get("sku", "SKU-001")
+                # Agent wants a forecast; drivers only when asked for, so a missing local model
+                # never breaks the forecast itself
+                parameters = agent_response.get("parameters", {})
+                sku = parameters.get("sku", "SKU-001")
                 forecast = self.forecast(sku=sku)
+                if parameters.get("explain"):
+                    explanation = self._try_explain(sku, forecast.get("model_id"))
+                    if explanation is not None:
+                        forecast["explanation"] = explanation
                 agent_response["tool_output"] = forecast
+            elif action == "explain_forecast":
+                sku = agent_response.get("parameters", {}).get("sku", "SKU-001")
+                agent_response["tool_output"] = self._try_explain(sku) or {
+                    "error": "Feature attributions are unavailable (no loadable registered model)."
+                }
         
         return agent_response
 
@@ -219,6 +231,80 @@ The product shows {('strong' if total_units > 100 else 'moderate')} sales perfor
         logger.info("Requesting forecast from SageMaker")
         return self.forecast_client.predict(feature_payload)
 
+    def explain_forecast(self, skus: List[str], top_k: int = 3) -> Dict[str, Any]:
+        """
+        Ground "explain the key factors" in the model: per-SKU TreeSHAP drivers plus a one-line
+        summary per SKU that can be handed to the LLM instead of the raw feature rows.
+        """
+        inference_mode = os.getenv("MERLIN_INFERENCE_MODE", "local")
+        if inference_mode == "local" or not os.getenv("AWS_ACCESS_KEY_ID"):
+            return {
+                "explanations": {sku: {"baseline": None, "prediction": None, "top_drivers": []} for sku in skus},
+                "summary": "Demo mode - feature attributions require a registered model.",
+            }
+
+        payloads = {sku: self.prepare_forecast_payload(sku) for sku in skus}
+        result = self.forecast_client.explain_many(payloads, top_k)
+        result["summary"] = format_drivers(result["explanations"])
+        return result
+
+    def _try_explain(self, sku: str, forecast_model_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Drivers for one SKU, or None (logged) when no registered model can be loaded locally."""
+        try:
+            result = self.explain_forecast([sku])
+        except Exception as exc:
+            logger.warning("Forecast explanation for %s unavailable: %s", sku, exc)
+            return None
+        explanation = {"summary": result["summary"], "model_id": result.get("model_id")}
+        if forecast_model_id and result.get("model_id") and forecast_model_id != result["model_id"]:
+            # TreeSHAP runs on the registry's active artifact, which an endpoint may not be serving yet.
+            explanation["note"] = f"Drivers come from model {result['model_id']}, not the forecasting model."
+        return explanation
+
+    def forecast_horizon(self, skus: List[str], horizon: int = 7, window: int = 14) -> Dict[str, Any]:
+        """
+        Forecast ``horizon`` days ahead for several SKUs at once.
+
+        The recent history of every SKU is stacked into one frame and projected forward with a
+        single batched model call per day (see ``models.inference.horizon``).
+        """
+        rows = [row for sku in skus for row in self._fetch_recent_rows(sku, limit=window)]
+        if not rows:
+            logger.warning("No history available for horizon forecast")
+            return {"horizon": horizon, "forecasts": {}}
+
+        inference_mode = os.getenv("MERLIN_INFERENCE_MODE", "local")
+        if inference_mode == "local" or not os.getenv("AWS_ACCESS_KEY_ID"):
+            import random
+            from datetime import datetime, timedelta
+
+            start = datetime.now()
+            logger.info("Returning mock horizon forecast (demo mode)")
+            return {
+                "horizon": horizon,
+                "forecasts": {
+                    sku: [
+                        {
+                            "date": (start + timedelta(days=day + 1)).strftime("%Y-%m-%d"),
+                            "units": float(random.randint(15, 30)),
+                        }
+                        for day in range(horizon)
+                    ]
+                    for sku in dict.fromkeys(row["sku"] for row in rows)
+                },
+                "note": "Demo mode - using mock ML predictions. Deploy with AWS for real forecasts.",
+            }
+
+        history = pd.DataFrame(rows).rename(
+            columns={
+                "sale_date": "date",
+                "net_revenue_usd": "net_revenue",
+                "ad_spend_usd": "ad_spend",
+            }
+        )
+        logger.info("Requesting %d-day forecast for %d SKUs", horizon, len(skus))
+        return self.forecast_client.forecast_horizon(history, horizon)
+
 
 def lambda_handler(event, _context):
     """
@@ -0,0 +1,153 @@
+"""
+Model-family adapters that translate a generic text/vision request into Bedrock ``invoke_model``
+bodies and parse the family-specific responses back into a common ``Completion``.
+"""
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Rough per-image input cost used for TPM budgeting; Bedrock reports the exact figure afterwards.
+IMAGE_TOKEN_ESTIMATE = 1600
+
+
+@dataclass
+class ImageInput:
+    """Raw image bytes plus the Bedrock format name (png, jpeg, gif, webp)."""
+
+    data: bytes
+    format: str = "png"
+
+    @property
+    def base64(self) -> str:
+        return base64.b64encode(self.data).decode("utf-8")
+
+
+@dataclass
+class TextRequest:
+    """Model-agnostic generation request."""
+
+    prompt: str
+    system: Optional[str] = None
+    images: List[ImageInput] = field(default_factory=list)
+    max_tokens: int = 500
+    temperature: float = 0.7
+    top_p: float = 0.9
+
+    def estimated_tokens(self) -> int:
+        """Approximate input + reserved output tokens, as counted against a TPM quota."""
+        text_chars = len(self.prompt) + len(self.system or "")
+        return text_chars // 4 + len(self.images) * IMAGE_TOKEN_ESTIMATE + self.max_tokens
+
+
+@dataclass
+class Completion:
+    """Normalized model output with usage accounting."""
+
+    text: str
+    model_id: str
+    stop_reason: str = "end_turn"
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class ModelAdapter:
+    """Base adapter; subclasses implement one model family's request/response schema."""
+
+    family = "generic"
+
+    def build_body(self, request: TextRequest) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def parse_response(self, model_id: str, body: Dict[str, Any]) -> Completion:
+        raise NotImplementedError
+
+
+class NovaAdapter(ModelAdapter):
+    """Amazon Nova messages-v1 schema."""
+
+    family = "nova"
+
+    def build_body(self, request: TextRequest) -> Dict[str, Any]:
+        content: List[Dict[str, Any]] = [
+            {"image": {"format": image.format, "source": {"bytes": image.base64}}} for image in request.images
+        ]
+        content.append({"text": request.prompt})
+        body: Dict[str, Any] = {
+            "messages": [{"role": "user", "content": content}],
+            "inferenceConfig": {
+                "max_new_tokens": request.max_tokens,
+                "temperature": request.temperature,
+                "top_p": request.top_p,
+            },
+        }
+        if request.system:
+            body["system"] = [{"text": request.system}]
+        return body
+
+    def parse_response(self, model_id: str, body: Dict[str, Any]) -> Completion:
+        usage = body.get("usage", {})
+        return Completion(
+            text=body["output"]["message"]["content"][0]["text"],
+            model_id=model_id,
+            stop_reason=body.get("stopReason", "end_turn"),
+            input_tokens=int(usage.get("inputTokens", 0)),
+            output_tokens=int(usage.get("outputTokens", 0)),
+        )
+
+
+class ClaudeAdapter(ModelAdapter):
+    """Anthropic Claude messages schema on Bedrock."""
+
+    family = "claude"
+
+    def build_body(self, request: TextRequest) -> Dict[str, Any]:
+        if request.images:
+            content: Any = [
+                {
+                    "type": "image",
+                    "source": {"type": "base64", "media_type": f"image/{image.format}", "data": image.base64},
+                }
+                for image in request.images
+            ]
+            content.append({"type": "text", "text": request.prompt})
+        else:
+            content = request.prompt
+        body: Dict[str, Any] = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": request.max_tokens,
+            "temperature": request.temperature,
+            "messages": [{"role": "user", "content": content}],
+        }
+        if request.system:
+            body["system"] = request.system
+        return body
+
+    def parse_response(self, model_id: str, body: Dict[str, Any]) -> Completion:
+        usage = body.get("usage", {})
+        return Completion(
+            text=body["content"][0]["text"],
+            model_id=model_id,
+            stop_reason=body.get("stop_reason", "end_turn"),
+            input_tokens=int(usage.get("input_tokens", 0)),
+            output_tokens=int(usage.get("output_tokens", 0)),
+        )
+
+
+_ADAPTERS: Dict[str, ModelAdapter] = {
+    "amazon.nova": NovaAdapter(),
+    "anthropic.": ClaudeAdapter(),
+}
+
+
+def adapter_for(model_id: str) -> ModelAdapter:
+    """Resolve the adapter from the model id prefix (cross-region profile prefixes are ignored)."""
+    bare = model_id
+    for geo in ("us.", "eu.", "apac."):
+        if model_id.startswith(geo):
+            bare = model_id[len(geo):]
+    for prefix, adapter in _ADAPTERS.items():
+        if bare.startswith(prefix):
+            return adapter
+    raise ValueError(f"No Bedrock adapter registered for model {model_id}")
@@ -0,0 +1,231 @@
+"""
+Bedrock batch inference (model invocation jobs) for high-volume, non-interactive workloads.
+
+Records are written as JSONL (``{"recordId", "modelInput"}``) to S3 and submitted as a model
+invocation job; finished ``.jsonl.out`` files are read back and results written to a results
+store. Bedrock expects 11-character alphanumeric record ids (``record_id``), so callers keep their
+own identifiers in the job ``metadata`` written at submit time. ``LocalBatchBackend`` mirrors the
+same layout on disk and runs records synchronously so the flow can be exercised without Bedrock.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import quote
+
+from aws_merlin_agent.bedrock.client import BedrockClient
+from aws_merlin_agent.config.settings import EnvironmentSettings
+from aws_merlin_agent.utils import aws
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def record_id(index: int) -> str:
+    """The ``index``-th record id in the 11-character alphanumeric form batch inputs require."""
+    return f"R{index:010d}"
+
+
+def result_name(name: str) -> str:
+    """Percent-encode an identifier (e.g. a SKU) for use as one S3 key or file name segment."""
+    return quote(name, safe="-_.") if name not in (".", "..") else quote(name, safe="")
+
+
+class BatchBackend:
+    """Interface shared by the S3/Bedrock backend and the local stand-in."""
+
+    TERMINAL_STATES = frozenset({"Completed", "PartiallyCompleted", "Failed", "Stopped", "Expired"})
+
+    def submit(
+        self, job_name: str, model_id: str, records: List[Dict[str, Any]], metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        raise NotImplementedError
+
+    def metadata(self, job_id: str) -> Dict[str, Any]:
+        """The ``metadata`` passed to ``submit`` (empty when none was given)."""
+        raise NotImplementedError
+
+    def status(self, job_id: str) -> str:
+        raise NotImplementedError
+
+    def model_id(self, job_id: str) -> str:
+        raise NotImplementedError
+
+    def outputs(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def store_results(self, job_id: str, results: Dict[str, Dict[str, Any]]) -> str:
+        raise NotImplementedError
+
+
+def _to_jsonl(records: List[Dict[str, Any]]) -> str:
+    return "\n".join(json.dumps(record) for record in records) + "\n"
+
+
+def _from_jsonl(text: str) -> Iterator[Dict[str, Any]]:
+    for line in text.splitlines():
+        if line.strip():
+            yield json.loads(line)
+
+
+class S3BatchBackend(BatchBackend):
+    """Runs jobs through Bedrock ``CreateModelInvocationJob`` with inputs and outputs in S3."""
+
+    # Bedrock rejects invocation jobs below this record count.
+    min_records = 100
+
+    def __init__(self, bucket: str, role_arn: str, region: str, prefix: str = "bedrock-batch") -> None:
+        self.bucket = bucket
+        self.role_arn = role_arn
+        self.region = region
+        self.prefix = prefix.rstrip("/")
+
+    @property
+    def _s3(self):
+        return aws.client("s3", region_name=self.region)
+
+    @property
+    def _bedrock(self):
+        return aws.client("bedrock", region_name=self.region)
+
+    def _metadata_key(self, job_name: str) -> str:
+        return f"{self.prefix}/{job_name}/metadata.json"
+
+    def submit(
+        self, job_name: str, model_id: str, records: List[Dict[str, Any]], metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        if len(records) < self.min_records:
+            raise ValueError(
+                f"Bedrock batch jobs need at least {self.min_records} records (got {len(records)}); "
+                "use the on-demand path for small runs"
+            )
+        input_key = f"{self.prefix}/{job_name}/input/records.jsonl"
+        self._s3.put_object(
+            Bucket=self.bucket,
+            Key=input_key,
+            Body=_to_jsonl(records).encode("utf-8"),
+            ContentType="application/jsonl",
+        )
+        self._s3.put_object(
+            Bucket=self.bucket,
+            Key=self._metadata_key(job_name),
+            Body=json.dumps(metadata or {}).encode("utf-8"),
+            ContentType="application/json",
+        )
+        response = self._bedrock.create_model_invocation_job(
+            jobName=job_name,
+            roleArn=self.role_arn,
+            modelId=model_id,
+            inputDataConfig={
+                "s3InputDataConfig": {"s3Uri": f"s3://{self.bucket}/{input_key}", "s3InputFormat": "JSONL"}
+            },
+            outputDataConfig={"s3OutputDataConfig": {"s3Uri": f"s3://{self.bucket}/{self.prefix}/{job_name}/output/"}},
+        )
+        return response["jobArn"]
+
+    def _job(self, job_id: str) -> Dict[str, Any]:
+        return self._bedrock.get_model_invocation_job(jobIdentifier=job_id)
+
+    def status(self, job_id: str) -> str:
+        return self._job(job_id)["status"]
+
+    def model_id(self, job_id: str) -> str:
+        # Bedrock reports the model as an ARN (``...:foundation-model/<id>``); adapters match bare ids.
+        return self._job(job_id)["modelId"].rsplit("/", 1)[-1]
+
+    def metadata(self, job_id: str) -> Dict[str, Any]:
+        key = self._metadata_key(self._job(job_id)["jobName"])
+        return json.loads(self._s3.get_object(Bucket=self.bucket, Key=key)["Body"].read())
+
+    def outputs(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        output_uri = self._job(job_id)["outputDataConfig"]["s3OutputDataConfig"]["s3Uri"]
+        prefix = output_uri.split(f"s3://{self.bucket}/", 1)[1]
+        paginator = self._s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                if obj["Key"].endswith(".jsonl.out"):
+                    body = self._s3.get_object(Bucket=self.bucket, Key=obj["Key"])["Body"].read()
+                    yield from _from_jsonl(body.decode("utf-8"))
+
+    def store_results(self, job_id: str, results: Dict[str, Dict[str, Any]]) -> str:
+        for sku, result in results.items():
+            self._s3.put_object(
+                Bucket=self.bucket,
+                Key=f"narratives/{result_name(sku)}.json",
+                Body=json.dumps(result).encode("utf-8"),
+                ContentType="application/json",
+            )
+        return f"s3://{self.bucket}/narratives/"
+
+
+class LocalBatchBackend(BatchBackend):
+    """File-based stand-in that runs each record through ``invoke`` at submit time."""
+
+    def __init__(self, root: str | Path, invoke: Optional[Callable[[str, Dict[str, Any]], Dict[str, Any]]] = None) -> None:
+        self.root = Path(root)
+        self._invoke = invoke
+
+    def _job_dir(self, job_id: str) -> Path:
+        return self.root / "jobs" / job_id
+
+    def _invoke_record(self, model_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        if self._invoke is not None:
+            return self._invoke(model_id, body)
+        return BedrockClient().invoke_json(model_id, body)
+
+    def submit(
+        self, job_name: str, model_id: str, records: List[Dict[str, Any]], metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        job_dir = self._job_dir(job_name)
+        (job_dir / "output").mkdir(parents=True, exist_ok=True)
+        (job_dir / "records.jsonl").write_text(_to_jsonl(records), encoding="utf-8")
+
+        outputs = []
+        for record in records:
+            output = {"recordId": record["recordId"], "modelInput": record["modelInput"]}
+            try:
+                output["modelOutput"] = self._invoke_record(model_id, record["modelInput"])
+            except Exception as exc:
+                output["error"] = {"errorMessage": str(exc)}
+            outputs.append(output)
+        (job_dir / "output" / "records.jsonl.out").write_text(_to_jsonl(outputs), encoding="utf-8")
+
+        failed = sum(1 for output in outputs if "error" in output)
+        status = "Completed" if not failed else ("Failed" if failed == len(outputs) else "PartiallyCompleted")
+        (job_dir / "job.json").write_text(json.dumps({"modelId": model_id, "status": status, "metadata": metadata or {}}), encoding="utf-8")
+        return job_name
+
+    def _job(self, job_id: str) -> Dict[str, Any]:
+        return json.loads((self._job_dir(job_id) / "job.json").read_text(encoding="utf-8"))
+
+    def status(self, job_id: str) -> str:
+        return self._job(job_id)["status"]
+
+    def model_id(self, job_id: str) -> str:
+        return self._job(job_id)["modelId"]
+
+    def metadata(self, job_id: str) -> Dict[str, Any]:
+        return self._job(job_id).get("metadata", {})
+
+    def outputs(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        for path in sorted((self._job_dir(job_id) / "output").glob("*.jsonl.out")):
+            yield from _from_jsonl(path.read_text(encoding="utf-8"))
+
+    def store_results(self, job_id: str, results: Dict[str, Dict[str, Any]]) -> str:
+        target = self.root / "narratives"
+        target.mkdir(parents=True, exist_ok=True)
+        for sku, result in results.items():
+            (target / f"{result_name(sku)}.json").write_text(json.dumps(result), encoding="utf-8")
+        return str(target)
+
+
+def default_backend(settings: EnvironmentSettings) -> BatchBackend:
+    """Use the local stand-in when MERLIN_BEDROCK_BATCH_DIR is set, otherwise Bedrock + S3."""
+    local_dir = os.getenv("MERLIN_BEDROCK_BATCH_DIR")
+    if local_dir:
+        return LocalBatchBackend(local_dir)
+    if not settings.bedrock_batch_role_arn:
+        raise RuntimeError("MERLIN_BEDROCK_BATCH_ROLE_ARN must be set to submit Bedrock batch jobs")
+    return S3BatchBackend(settings.curated_bucket, settings.bedrock_batch_role_arn, settings.region)
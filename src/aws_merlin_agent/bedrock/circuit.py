@@ -0,0 +1,251 @@
+"""
+Per-model circuit breakers and hedged requests for Bedrock fallback chains.
+
+A breaker opens when a model's recent error rate or slow-call rate crosses its threshold, so
+callers skip straight to the next model instead of paying the failure latency on every request.
+After a cool-down the breaker lets a few trial calls through (half-open) and closes again once
+they succeed.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from aws_merlin_agent.bedrock.rate_limit import RateLimitTimeout
+from aws_merlin_agent.bedrock.router import ModelRouter, get_router
+from aws_merlin_agent.config.settings import apply_env_overrides
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when every candidate model is short-circuited."""
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """Thresholds shared by all per-model breakers."""
+
+    window: int = 20
+    min_calls: int = 5
+    error_rate_threshold: float = 0.5
+    slow_call_ms: float = 15000.0
+    slow_rate_threshold: float = 0.8
+    open_seconds: float = 30.0
+    half_open_max_calls: int = 1
+
+    @classmethod
+    def load(cls) -> "CircuitBreakerConfig":
+        """Build the default config, applying overrides from MERLIN_CIRCUIT_BREAKER."""
+        return apply_env_overrides(cls(), "MERLIN_CIRCUIT_BREAKER")
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker driven by a rolling window of call outcomes."""
+
+    def __init__(
+        self,
+        name: str,
+        config: Optional[CircuitBreakerConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.config = config or CircuitBreakerConfig()
+        self._clock = clock
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=self.config.window)
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True when a call may proceed; half-open breakers admit a limited number of trials."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == STATE_CLOSED:
+                return True
+            if self._state == STATE_HALF_OPEN and self._half_open_calls < self.config.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            return False
+
+    def record_success(self, latency_ms: float) -> None:
+        slow = latency_ms >= self.config.slow_call_ms
+        with self._lock:
+            if self._state == STATE_HALF_OPEN:
+                if slow:
+                    self._trip("slow trial call")
+                else:
+                    self._reset()
+                return
+            self._outcomes.append((False, slow))
+            self._evaluate()
+
+    def release(self) -> None:
+        """Return a half-open trial slot for a call that never reached the model (no outcome to record)."""
+        with self._lock:
+            if self._state == STATE_HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == STATE_HALF_OPEN:
+                self._trip("failed trial call")
+                return
+            self._outcomes.append((True, False))
+            self._evaluate()
+
+    def _maybe_half_open(self) -> None:
+        if self._state == STATE_OPEN and self._clock() - self._opened_at >= self.config.open_seconds:
+            self._state = STATE_HALF_OPEN
+            self._half_open_calls = 0
+            logger.info("Circuit for %s is half-open", self.name)
+
+    def _evaluate(self) -> None:
+        total = len(self._outcomes)
+        if total < self.config.min_calls:
+            return
+        errors = sum(1 for failed, _ in self._outcomes if failed)
+        slow = sum(1 for _, was_slow in self._outcomes if was_slow)
+        if errors / total >= self.config.error_rate_threshold:
+            self._trip(f"error rate {errors}/{total}")
+        elif slow / total >= self.config.slow_rate_threshold:
+            self._trip(f"slow-call rate {slow}/{total}")
+
+    def _trip(self, reason: str) -> None:
+        self._state = STATE_OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        logger.warning("Circuit for %s opened (%s)", self.name, reason)
+
+    def _reset(self) -> None:
+        self._state = STATE_CLOSED
+        self._outcomes.clear()
+        logger.info("Circuit for %s closed", self.name)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+_hedge_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="merlin-hedge")
+
+
+def breaker_for(model_id: str) -> CircuitBreaker:
+    """Return the process-wide breaker for a model id."""
+    with _breakers_lock:
+        breaker = _breakers.get(model_id)
+        if breaker is None:
+            breaker = CircuitBreaker(model_id, CircuitBreakerConfig.load())
+            _breakers[model_id] = breaker
+        return breaker
+
+
+def reset_breakers() -> None:
+    """Forget all breaker state (used by tests and after configuration changes)."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def _timed_call(model_id: str, invoke: Callable[[str], T], router: ModelRouter) -> T:
+    breaker = breaker_for(model_id)
+    start = time.perf_counter()
+    try:
+        result = invoke(model_id)
+    except RateLimitTimeout:
+        # Client-side pacing says nothing about the model's health.
+        breaker.release()
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+    latency_ms = (time.perf_counter() - start) * 1000
+    breaker.record_success(latency_ms)
+    router.record_latency(model_id, latency_ms)
+    return result
+
+
+def _hedged_call(
+    primary: str,
+    hedge: str,
+    delay_ms: float,
+    invoke: Callable[[str], T],
+    router: ModelRouter,
+    attempted: List[str],
+) -> Tuple[str, T]:
+    futures: Dict[Future, str] = {_hedge_executor.submit(_timed_call, primary, invoke, router): primary}
+    done, _ = wait(futures, timeout=delay_ms / 1000.0)
+    if not done and breaker_for(hedge).allow_request():
+        logger.info("Hedging %s with %s after %.0fms", primary, hedge, delay_ms)
+        attempted.append(hedge)
+        futures[_hedge_executor.submit(_timed_call, hedge, invoke, router)] = hedge
+
+    pending = set(futures)
+    last_error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            error = future.exception()
+            if error is None:
+                return futures[future], future.result()
+            last_error = error
+    assert last_error is not None
+    raise last_error
+
+
+def call_with_fallback(
+    candidates: Sequence[str],
+    invoke: Callable[[str], T],
+    router: Optional[ModelRouter] = None,
+) -> Tuple[str, T]:
+    """
+    Call ``invoke(model_id)`` on each candidate in order, skipping models whose circuit is open.
+
+    When the router has hedging enabled and a primary call runs past its latency percentile, the
+    next candidate is fired in parallel and whichever succeeds first wins. A candidate whose local
+    quota could not be acquired in time (``RateLimitTimeout``) is passed over without counting
+    against its breaker. Returns the model id that served the request together with its result.
+    """
+    router = router or get_router()
+    remaining = list(candidates)
+    last_error: Optional[BaseException] = None
+    while remaining:
+        model_id = remaining.pop(0)
+        if not breaker_for(model_id).allow_request():
+            logger.info("Skipping %s: circuit open", model_id)
+            continue
+        delay_ms = router.hedge_delay_ms(model_id)
+        hedge = next((m for m in remaining if breaker_for(m).state != STATE_OPEN), None)
+        try:
+            if delay_ms is None or hedge is None:
+                return model_id, _timed_call(model_id, invoke, router)
+            attempted: List[str] = []
+            try:
+                return _hedged_call(model_id, hedge, delay_ms, invoke, router, attempted)
+            finally:
+                for fired in attempted:
+                    remaining.remove(fired)
+        except RateLimitTimeout as exc:
+            logger.info("Skipping %s: %s", model_id, exc)
+            last_error = exc
+        except Exception as exc:
+            logger.warning("Model %s failed: %s", model_id, exc)
+            last_error = exc
+    if last_error is not None:
+        raise last_error
+    raise CircuitOpenError(f"All candidate models are short-circuited: {', '.join(candidates)}")
@@ -0,0 +1,201 @@
+"""
+Unified Bedrock invocation client.
+
+All ``invoke_model`` and ``start_async_invoke`` traffic from the agent, summary and creative
+modules goes through ``BedrockClient`` so request bodies, response parsing, quota-aware rate limiting, jittered retries
+on throttling, circuit breaking and usage accounting live in one place.
+"""
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from botocore.exceptions import ClientError
+
+from aws_merlin_agent.bedrock.adapters import Completion, TextRequest, adapter_for
+from aws_merlin_agent.bedrock.circuit import call_with_fallback
+from aws_merlin_agent.bedrock.rate_limit import QuotaLimiter
+from aws_merlin_agent.bedrock.router import ModelRouter, get_router
+from aws_merlin_agent.utils import aws
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+RETRYABLE_ERROR_CODES = frozenset(
+    {
+        "ThrottlingException",
+        "TooManyRequestsException",
+        "ServiceUnavailableException",
+        "ModelNotReadyException",
+    }
+)
+
+
+@dataclass
+class ModelUsage:
+    """Running usage totals for one model id."""
+
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    throttled: int = 0
+    failures: int = 0
+
+
+class UsageLedger:
+    """Process-wide usage accounting shared by every ``BedrockClient``."""
+
+    def __init__(self) -> None:
+        self._usage: Dict[str, ModelUsage] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, model_id: str) -> ModelUsage:
+        return self._usage.setdefault(model_id, ModelUsage())
+
+    def record_success(self, model_id: str, input_tokens: int = 0, output_tokens: int = 0) -> None:
+        with self._lock:
+            entry = self._entry(model_id)
+            entry.requests += 1
+            entry.input_tokens += input_tokens
+            entry.output_tokens += output_tokens
+
+    def record_throttle(self, model_id: str) -> None:
+        with self._lock:
+            self._entry(model_id).throttled += 1
+
+    def record_failure(self, model_id: str) -> None:
+        with self._lock:
+            self._entry(model_id).failures += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {model_id: asdict(usage) for model_id, usage in self._usage.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._usage.clear()
+
+
+class BedrockClient:
+    """Rate-limited, retrying ``invoke_model`` wrapper with model-family adapters."""
+
+    def __init__(
+        self,
+        region_name: Optional[str] = None,
+        router: Optional[ModelRouter] = None,
+        limiter: Optional[QuotaLimiter] = None,
+        ledger: Optional[UsageLedger] = None,
+    ) -> None:
+        self.region_name = region_name
+        self.router = router or get_router()
+        self.limiter = limiter or get_limiter()
+        self.ledger = ledger or get_ledger()
+
+    @property
+    def runtime(self):
+        # Resolved per call so the cached boto3 client (and test patches of it) are always honoured.
+        return aws.client("bedrock-runtime", region_name=self.region_name)
+
+    def generate(self, request: TextRequest, candidates: Sequence[str]) -> Completion:
+        """Run ``request`` against the first healthy candidate, falling back in order."""
+
+        def invoke(model_id: str) -> Completion:
+            return self.complete(model_id, request)
+
+        _, completion = call_with_fallback(candidates, invoke, self.router)
+        return completion
+
+    def complete(self, model_id: str, request: TextRequest) -> Completion:
+        """Invoke a single text/vision model without fallback."""
+        adapter = adapter_for(model_id)
+        estimated = request.estimated_tokens()
+        body = self.invoke_json(model_id, adapter.build_body(request), estimated_tokens=estimated, record=False)
+        completion = adapter.parse_response(model_id, body)
+        actual = completion.input_tokens + completion.output_tokens
+        if actual:  # a response without usage would otherwise refund the whole reservation
+            self.limiter.settle(model_id, estimated, actual)
+        self.ledger.record_success(model_id, completion.input_tokens, completion.output_tokens)
+        return completion
+
+    def invoke_json(
+        self,
+        model_id: str,
+        body: Dict[str, Any],
+        estimated_tokens: int = 0,
+        record: bool = True,
+    ) -> Dict[str, Any]:
+        """Send a raw JSON body (used directly for Canvas) under the model's quota."""
+        payload = json.dumps(body)
+        response = self._call_with_retries(
+            model_id,
+            estimated_tokens,
+            lambda: self.runtime.invoke_model(
+                modelId=model_id,
+                body=payload,
+                contentType="application/json",
+                accept="application/json",
+            ),
+        )
+        result = json.loads(response["body"].read())
+        if record:
+            self.ledger.record_success(model_id)
+        return result
+
+    def start_async(self, model_id: str, model_input: Dict[str, Any], output_uri: str) -> str:
+        """Submit a long-running generation (e.g. Nova Reel) and return its invocation ARN."""
+        response = self._call_with_retries(
+            model_id,
+            0,
+            lambda: self.runtime.start_async_invoke(
+                modelId=model_id,
+                modelInput=model_input,
+                outputDataConfig={"s3OutputDataConfig": {"s3Uri": output_uri}},
+            ),
+        )
+        self.ledger.record_success(model_id)
+        return response["invocationArn"]
+
+    def _call_with_retries(self, model_id: str, estimated_tokens: int, call: Callable[[], Any]) -> Any:
+        config = self.limiter.config
+        attempt = 0
+        while True:
+            self.limiter.acquire(model_id, estimated_tokens)
+            try:
+                return call()
+            except ClientError as exc:
+                # Each attempt reserves its own tokens; only the successful one is settled by the caller.
+                self.limiter.release(model_id, estimated_tokens)
+                code = exc.response.get("Error", {}).get("Code", "")
+                if code not in RETRYABLE_ERROR_CODES:
+                    self.ledger.record_failure(model_id)
+                    raise
+                self.ledger.record_throttle(model_id)
+                if attempt >= config.max_retries:
+                    self.ledger.record_failure(model_id)
+                    raise
+                # Full jitter keeps concurrent workers from retrying in lock-step.
+                backoff = random.uniform(0, min(config.max_backoff_s, config.base_backoff_s * 2**attempt))
+                logger.info("%s throttled (%s); retrying in %.2fs", model_id, code, backoff)
+                time.sleep(backoff)
+                attempt += 1
+            except Exception:
+                self.limiter.release(model_id, estimated_tokens)
+                self.ledger.record_failure(model_id)
+                raise
+
+
+@lru_cache(maxsize=None)
+def get_limiter() -> QuotaLimiter:
+    """Return the process-wide limiter so every caller draws from the same quota buckets."""
+    return QuotaLimiter()
+
+
+@lru_cache(maxsize=None)
+def get_ledger() -> UsageLedger:
+    """Return the process-wide usage ledger."""
+    return UsageLedger()
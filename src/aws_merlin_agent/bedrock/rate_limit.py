@@ -0,0 +1,156 @@
+"""
+Token-bucket rate limiting against per-model Bedrock RPM/TPM quotas.
+
+Buckets refill continuously at a fraction (``headroom``) of the configured quota, so a concurrent
+fleet run converges on a steady request rate just under the limit instead of bursting into
+``ThrottlingException`` storms and backing off in waves.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+from aws_merlin_agent.bedrock.router import CLAUDE_SONNET, NOVA_LITE, NOVA_MICRO, NOVA_PRO
+from aws_merlin_agent.config.settings import apply_env_overrides
+
+NOVA_CANVAS = "amazon.nova-canvas-v1:0"
+NOVA_REEL = "amazon.nova-reel-v1:0"
+
+
+class RateLimitTimeout(RuntimeError):
+    """Raised when capacity does not free up within the acquire timeout."""
+
+
+@dataclass
+class QuotaConfig:
+    """Per-model request/token quotas plus retry settings for throttled calls."""
+
+    quotas: Dict[str, Dict[str, float]] = field(
+        default_factory=lambda: {
+            NOVA_MICRO: {"rpm": 200, "tpm": 400000},
+            NOVA_LITE: {"rpm": 200, "tpm": 400000},
+            NOVA_PRO: {"rpm": 100, "tpm": 200000},
+            CLAUDE_SONNET: {"rpm": 50, "tpm": 200000},
+            NOVA_CANVAS: {"rpm": 10, "tpm": 0},
+            NOVA_REEL: {"rpm": 5, "tpm": 0},
+        }
+    )
+    default_rpm: float = 50
+    default_tpm: float = 100000
+    headroom: float = 0.9
+    burst_seconds: float = 10.0
+    acquire_timeout_s: float = 60.0
+    max_retries: int = 4
+    base_backoff_s: float = 0.5
+    max_backoff_s: float = 8.0
+
+    @classmethod
+    def load(cls) -> "QuotaConfig":
+        """Build the default config, applying overrides from MERLIN_BEDROCK_QUOTAS."""
+        return apply_env_overrides(cls(), "MERLIN_BEDROCK_QUOTAS")
+
+    def limits_for(self, model_id: str) -> Dict[str, float]:
+        limits = self.quotas.get(model_id, {})
+        return {"rpm": limits.get("rpm", self.default_rpm), "tpm": limits.get("tpm", self.default_tpm)}
+
+
+class TokenBucket:
+    """Thread-safe token bucket; balances may go negative to absorb under-estimated usage."""
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate_per_second
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, amount: float) -> float:
+        """Take ``amount`` if available and return 0, otherwise return the seconds to wait."""
+        # Requests larger than the bucket would never fit; let them through once the bucket is full.
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+    def acquire(self, amount: float, timeout: Optional[float] = None) -> None:
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            wait_s = self.try_acquire(amount)
+            if wait_s <= 0:
+                return
+            if deadline is not None and self._clock() + wait_s > deadline:
+                raise RateLimitTimeout(f"Could not acquire {amount} tokens within {timeout}s")
+            self._sleep(wait_s)
+
+    def consume(self, amount: float) -> None:
+        """Charge usage after the fact (e.g. actual tokens above the estimate); a negative amount refunds."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+
+class QuotaLimiter:
+    """Per-model request and token buckets derived from a ``QuotaConfig``."""
+
+    def __init__(self, config: Optional[QuotaConfig] = None) -> None:
+        self.config = config or QuotaConfig.load()
+        self._buckets: Dict[str, Dict[str, Optional[TokenBucket]]] = {}
+        self._lock = threading.Lock()
+
+    def _model_buckets(self, model_id: str) -> Dict[str, Optional[TokenBucket]]:
+        with self._lock:
+            buckets = self._buckets.get(model_id)
+            if buckets is None:
+                buckets = {}
+                for kind, per_minute in self.config.limits_for(model_id).items():
+                    if not per_minute:
+                        buckets[kind] = None
+                        continue
+                    rate = per_minute * self.config.headroom / 60.0
+                    buckets[kind] = TokenBucket(rate, rate * self.config.burst_seconds)
+                self._buckets[model_id] = buckets
+            return buckets
+
+    def acquire(self, model_id: str, estimated_tokens: int = 0) -> None:
+        """Block until one request and ``estimated_tokens`` fit under the model's quota."""
+        buckets = self._model_buckets(model_id)
+        timeout = self.config.acquire_timeout_s
+        if buckets.get("rpm") is not None:
+            buckets["rpm"].acquire(1, timeout)  # type: ignore[union-attr]
+        if estimated_tokens and buckets.get("tpm") is not None:
+            try:
+                buckets["tpm"].acquire(estimated_tokens, timeout)  # type: ignore[union-attr]
+            except RateLimitTimeout:
+                # No request goes out, so the request slot taken above is given back.
+                if buckets.get("rpm") is not None:
+                    buckets["rpm"].consume(-1)  # type: ignore[union-attr]
+                raise
+
+    def settle(self, model_id: str, estimated_tokens: int, actual_tokens: int) -> None:
+        """Reconcile a reservation with actual usage: charge an overrun, refund what went unused."""
+        bucket = self._model_buckets(model_id).get("tpm")
+        if bucket is not None and actual_tokens != estimated_tokens:
+            bucket.consume(actual_tokens - estimated_tokens)
+
+    def release(self, model_id: str, estimated_tokens: int) -> None:
+        """Refund a whole reservation for an attempt the model never processed (e.g. it was throttled)."""
+        if estimated_tokens:
+            self.settle(model_id, estimated_tokens, 0)
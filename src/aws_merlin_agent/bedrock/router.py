@@ -0,0 +1,212 @@
+"""
+Latency- and cost-aware model routing for Bedrock text and vision calls.
+
+Requests are classified into tiers (simple, standard, complex) and sent to the cheapest Nova
+model that serves the tier. Observed per-model latencies feed back into routing, so a tier whose
+preferred model breaches its latency SLO shifts to the next candidate until it recovers.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Deque, Dict, List, Optional
+
+from aws_merlin_agent.config.settings import apply_env_overrides
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+NOVA_MICRO = "amazon.nova-micro-v1:0"
+NOVA_LITE = "amazon.nova-lite-v1:0"
+NOVA_PRO = "amazon.nova-pro-v1:0"
+CLAUDE_SONNET = "anthropic.claude-3-sonnet-20240229-v1:0"
+
+TIER_SIMPLE = "simple"
+TIER_STANDARD = "standard"
+TIER_COMPLEX = "complex"
+TIER_ORDER = (TIER_SIMPLE, TIER_STANDARD, TIER_COMPLEX)
+
+_SKU_PATTERN = re.compile(r"\bSKU[-_ ]?\w+", re.IGNORECASE)
+
+
+@dataclass
+class RoutingPolicy:
+    """Routing rules, latency SLOs and the fallback chain used to pick a Bedrock model."""
+
+    tier_models: Dict[str, List[str]] = field(
+        default_factory=lambda: {
+            TIER_SIMPLE: [NOVA_MICRO, NOVA_LITE],
+            TIER_STANDARD: [NOVA_LITE, NOVA_PRO],
+            TIER_COMPLEX: [NOVA_PRO, NOVA_LITE],
+        }
+    )
+    latency_slo_ms: Dict[str, float] = field(
+        default_factory=lambda: {TIER_SIMPLE: 1500.0, TIER_STANDARD: 4000.0, TIER_COMPLEX: 12000.0}
+    )
+    max_tokens: Dict[str, int] = field(
+        default_factory=lambda: {TIER_SIMPLE: 300, TIER_STANDARD: 600, TIER_COMPLEX: 1000}
+    )
+    # Tier and token cap for callers whose task shape is known up front. Their prompts are not
+    # classified: fixed instructions and data tables would trip the keyword and length heuristics.
+    task_tiers: Dict[str, str] = field(default_factory=lambda: {"summary": TIER_STANDARD, "vision": TIER_STANDARD})
+    task_max_tokens: Dict[str, int] = field(default_factory=lambda: {"summary": 500, "vision": 300})
+    fallback_chain: List[str] = field(default_factory=lambda: [CLAUDE_SONNET])
+    vision_models: List[str] = field(default_factory=lambda: [NOVA_LITE, NOVA_PRO, CLAUDE_SONNET])
+    complex_keywords: List[str] = field(
+        default_factory=lambda: [
+            "analy",
+            "compare",
+            "explain",
+            "forecast",
+            "optimi",
+            "perform",
+            "recommend",
+            "strategy",
+            "trend",
+            "why",
+        ]
+    )
+    simple_max_chars: int = 80
+    complex_min_chars: int = 600
+    latency_percentile: float = 95.0
+    latency_window: int = 50
+    min_latency_samples: int = 5
+    # Hedged requests fire the next candidate once the primary exceeds this latency percentile.
+    hedge_percentile: Optional[float] = None
+    hedge_min_delay_ms: float = 250.0
+
+    @classmethod
+    def load(cls) -> "RoutingPolicy":
+        """Build the default policy, applying overrides from MERLIN_MODEL_ROUTING (inline JSON or a file path)."""
+        return apply_env_overrides(cls(), "MERLIN_MODEL_ROUTING")
+
+
+@dataclass
+class RouteDecision:
+    """Outcome of routing one request: the chosen model plus the ordered fallbacks."""
+
+    tier: str
+    model_id: str
+    max_tokens: int
+    fallbacks: List[str] = field(default_factory=list)
+
+    @property
+    def candidates(self) -> List[str]:
+        ordered: List[str] = []
+        for model_id in [self.model_id, *self.fallbacks]:
+            if model_id not in ordered:
+                ordered.append(model_id)
+        return ordered
+
+
+class LatencyTracker:
+    """Thread-safe rolling window of observed latencies per model id."""
+
+    def __init__(self, window: int = 50) -> None:
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model_id: str, latency_ms: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(model_id, deque(maxlen=self.window))
+            samples.append(float(latency_ms))
+
+    def count(self, model_id: str) -> int:
+        with self._lock:
+            return len(self._samples.get(model_id, ()))
+
+    def percentile(self, model_id: str, pct: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(model_id, ()))
+        if not samples:
+            return None
+        rank = min(len(samples) - 1, max(0, int(round(pct / 100.0 * (len(samples) - 1)))))
+        return samples[rank]
+
+
+class ModelRouter:
+    """Classifies requests and picks the cheapest model that meets the tier's latency SLO."""
+
+    def __init__(self, policy: Optional[RoutingPolicy] = None) -> None:
+        self.policy = policy or RoutingPolicy.load()
+        self.latency = LatencyTracker(self.policy.latency_window)
+
+    def classify(self, prompt: str, task: Optional[str] = None) -> str:
+        """Tier for ``prompt``; a task listed in ``task_tiers`` gets its configured tier directly."""
+        pinned = self.policy.task_tiers.get(task or "")
+        if pinned in TIER_ORDER:
+            return pinned
+        text = prompt.strip()
+        lowered = text.lower()
+        sku_mentions = {match.upper() for match in _SKU_PATTERN.findall(text)}
+        if (
+            len(text) >= self.policy.complex_min_chars
+            or len(sku_mentions) > 1
+            or any(keyword in lowered for keyword in self.policy.complex_keywords)
+        ):
+            tier = TIER_COMPLEX
+        elif len(text) <= self.policy.simple_max_chars and not sku_mentions:
+            tier = TIER_SIMPLE
+        else:
+            tier = TIER_STANDARD
+        return tier
+
+    def route(self, prompt: str, task: Optional[str] = None, requires_vision: bool = False) -> RouteDecision:
+        tier = self.classify(prompt, task)
+        candidates = list(self.policy.tier_models.get(tier) or self.policy.tier_models[TIER_COMPLEX])
+        fallbacks = list(self.policy.fallback_chain)
+        if requires_vision:
+            vision = set(self.policy.vision_models)
+            candidates = [m for m in candidates if m in vision] or [m for m in self.policy.vision_models]
+            fallbacks = [m for m in fallbacks if m in vision]
+
+        model_id = self._select_within_slo(candidates, self.policy.latency_slo_ms.get(tier))
+        max_tokens = self.policy.task_max_tokens.get(task or "", self.policy.max_tokens.get(tier, 1000))
+        decision = RouteDecision(
+            tier=tier,
+            model_id=model_id,
+            max_tokens=max_tokens,
+            fallbacks=[m for m in fallbacks if m != model_id],
+        )
+        logger.debug("Routed %s request (task=%s) to %s", tier, task, model_id)
+        return decision
+
+    def record_latency(self, model_id: str, latency_ms: float) -> None:
+        self.latency.record(model_id, latency_ms)
+
+    def hedge_delay_ms(self, model_id: str) -> Optional[float]:
+        """Return how long to wait on ``model_id`` before hedging, or None when hedging is off."""
+        if self.policy.hedge_percentile is None:
+            return None
+        if self.latency.count(model_id) < self.policy.min_latency_samples:
+            return None
+        observed = self.latency.percentile(model_id, self.policy.hedge_percentile)
+        if observed is None:
+            return None
+        return max(self.policy.hedge_min_delay_ms, observed)
+
+    def _select_within_slo(self, candidates: List[str], slo_ms: Optional[float]) -> str:
+        if slo_ms is None:
+            return candidates[0]
+        observed: Dict[str, float] = {}
+        for model_id in candidates:
+            if self.latency.count(model_id) < self.policy.min_latency_samples:
+                # Not enough evidence to demote this model yet.
+                return model_id
+            value = self.latency.percentile(model_id, self.policy.latency_percentile)
+            if value is None or value <= slo_ms:
+                return model_id
+            observed[model_id] = value
+        fastest = min(observed, key=observed.get)  # type: ignore[arg-type]
+        logger.warning("No model meets the %.0fms SLO; using fastest observed %s", slo_ms, fastest)
+        return fastest
+
+
+@lru_cache(maxsize=None)
+def get_router() -> ModelRouter:
+    """Return the process-wide router so latency observations are shared across callers."""
+    return ModelRouter()
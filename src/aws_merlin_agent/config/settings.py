@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import json
 import os
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, fields
+from typing import Any, Optional
+
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
 
 
 @dataclass
@@ -16,7 +21,9 @@ class EnvironmentSettings:
     creative_bucket: str
     dynamodb_table_runs: str
     dynamodb_table_actions: str
+    dynamodb_table_video_jobs: Optional[str] = None
     agent_policy_param: Optional[str] = None
+    bedrock_batch_role_arn: Optional[str] = None
 
     @classmethod
     def load(cls) -> "EnvironmentSettings":
@@ -50,5 +57,39 @@ class EnvironmentSettings:
             creative_bucket=get_from_cfn("MERLIN_CREATIVE_BUCKET", "CreativeBucketOutput", f"{prefix}-creative"),
             dynamodb_table_runs=get_from_cfn("MERLIN_RUNS_TABLE", "RunsTableOutput", f"{prefix}-runs"),
             dynamodb_table_actions=get_from_cfn("MERLIN_ACTIONS_TABLE", "ActionsTableOutput", f"{prefix}-actions"),
+            dynamodb_table_video_jobs=get_from_cfn("MERLIN_VIDEO_JOBS_TABLE", "VideoJobsTableOutput", f"{prefix}-video-jobs"),
             agent_policy_param=os.getenv("MERLIN_AGENT_POLICY_PARAM"),
+            bedrock_batch_role_arn=os.getenv("MERLIN_BEDROCK_BATCH_ROLE_ARN"),
         )
+
+
+def apply_env_overrides(target: Any, env_var: str) -> Any:
+    """
+    Update a settings dataclass in place from a JSON object held in ``env_var``.
+
+    The variable may contain inline JSON or a path to a JSON file. Dict fields are merged key by key;
+    unknown keys and unreadable values are logged and ignored so a bad override never blocks startup.
+    """
+    raw = os.getenv(env_var)
+    if not raw:
+        return target
+    try:
+        if raw.lstrip().startswith("{"):
+            overrides = json.loads(raw)
+        else:
+            with open(raw, encoding="utf-8") as handle:
+                overrides = json.load(handle)
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring invalid %s (%s)", env_var, exc)
+        return target
+    known = {f.name for f in fields(target)}
+    for key, value in overrides.items():
+        if key not in known:
+            logger.warning("Ignoring unknown %s option %s", env_var, key)
+            continue
+        current = getattr(target, key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            current.update(value)
+        else:
+            setattr(target, key, value)
+    return target
@@ -0,0 +1,104 @@
+"""
+Content-addressed storage for generated creative assets.
+
+Assets are keyed by a SHA-256 of the model id and the full request body (prompt, generation config
+and seed), so an identical request resolves to the same S3 object. Callers check ``exists`` (a HEAD
+request) before generating, and generated payloads are decoded and streamed into the creative
+bucket rather than returned inline. A request that produces several objects writes a small
+``manifest.json`` after all of them, so a set is only reused once it is complete.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import json
+from typing import Any, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+from aws_merlin_agent.utils import aws
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+GENERATED_PREFIX = "assets/generated"
+
+
+def request_digest(model_id: str, body: Dict[str, Any]) -> str:
+    """Stable hash of a generation request; key order in ``body`` does not matter."""
+    canonical = json.dumps({"model": model_id, "body": body}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class AssetStore:
+    """S3-backed store for generated assets under ``GENERATED_PREFIX``."""
+
+    def __init__(self, bucket: str, region: Optional[str] = None, prefix: str = GENERATED_PREFIX) -> None:
+        self.bucket = bucket
+        self.region = region
+        self.prefix = prefix.rstrip("/")
+
+    @property
+    def _s3(self):
+        return aws.client("s3", region_name=self.region)
+
+    def key_for(self, digest: str, index: int = 0, extension: str = "png") -> str:
+        return f"{self.prefix}/{digest}/{index}.{extension}"
+
+    def uri(self, key: str) -> str:
+        return f"s3://{self.bucket}/{key}"
+
+    def exists(self, key: str) -> bool:
+        try:
+            self._s3.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def manifest_key(self, digest: str) -> str:
+        return f"{self.prefix}/{digest}/manifest.json"
+
+    def load_manifest(self, digest: str) -> Optional[Dict[str, Any]]:
+        """The manifest of a completed set, or None when the set was never finished."""
+        try:
+            return json.loads(self.get_bytes(self.manifest_key(digest)))
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def put_manifest(self, digest: str, keys: List[str]) -> str:
+        """Mark the set as complete; write it only after every key in ``keys`` is stored."""
+        body = json.dumps({"keys": keys}).encode("utf-8")
+        return self.put_bytes(self.manifest_key(digest), body, content_type="application/json")
+
+    def put_bytes(
+        self,
+        key: str,
+        data: bytes,
+        content_type: str = "image/png",
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Stream ``data`` to ``key``; returns the S3 URI."""
+        extra_args: Dict[str, Any] = {"ContentType": content_type}
+        if metadata:
+            extra_args["Metadata"] = metadata
+        self._s3.upload_fileobj(io.BytesIO(data), self.bucket, key, ExtraArgs=extra_args)
+        logger.debug("Stored generated asset at s3://%s/%s", self.bucket, key)
+        return self.uri(key)
+
+    def put_base64(
+        self,
+        key: str,
+        payload: str,
+        content_type: str = "image/png",
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Decode a base64 payload and stream it to ``key``; returns the S3 URI."""
+        return self.put_bytes(key, base64.b64decode(payload), content_type, metadata)
+
+    def get_bytes(self, key: str) -> bytes:
+        return self._s3.get_object(Bucket=self.bucket, Key=key)["Body"].read()
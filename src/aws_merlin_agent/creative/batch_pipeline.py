@@ -0,0 +1,154 @@
+"""
+Catalog-wide creative refresh.
+
+A manifest lists one entry per SKU (``sku``, ``prompt`` and optionally ``variants``, ``seed`` and
+``questions``). Entries run on a thread pool sized from the Nova Canvas quota - the limiter already
+paces requests, so the pool only needs enough workers to keep the quota busy. Each finished SKU is
+appended to a JSONL result manifest immediately, and a rerun skips SKUs that already succeeded, so
+an interrupted refresh resumes where it stopped. A SKU whose images were generated but whose
+analysis failed is recorded as ``analysis_error`` and retried by the next run.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from aws_merlin_agent.bedrock.client import get_limiter
+from aws_merlin_agent.bedrock.rate_limit import NOVA_CANVAS
+from aws_merlin_agent.config.settings import EnvironmentSettings
+from aws_merlin_agent.creative import nova_assets
+from aws_merlin_agent.creative.asset_store import AssetStore
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DONE_STATUSES = frozenset({"success", "cached"})
+
+
+def quota_concurrency(model_id: str = NOVA_CANVAS, latency_s: float = 10.0, ceiling: int = 16) -> int:
+    """Workers needed to keep ``model_id``'s request quota saturated (Little's law: rate x latency)."""
+    config = get_limiter().config
+    rate_per_second = config.limits_for(model_id)["rpm"] * config.headroom / 60.0
+    return max(1, min(ceiling, math.ceil(rate_per_second * latency_s)))
+
+
+def load_manifest(path: str | Path) -> List[Dict[str, Any]]:
+    """Read a JSON array or JSONL manifest of creative entries."""
+    text = Path(path).read_text(encoding="utf-8").strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _completed_skus(result_path: Path) -> Dict[str, Dict[str, Any]]:
+    if not result_path.exists():
+        return {}
+    completed = {}
+    for line in result_path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            # A crash mid-write can leave a truncated last line; that SKU simply runs again.
+            continue
+        if record.get("status") in DONE_STATUSES:
+            completed[record["sku"]] = record
+    return completed
+
+
+def _process_entry(
+    entry: Dict[str, Any],
+    variants: int,
+    thumbnail_size: Optional[int],
+    store: AssetStore,
+) -> Dict[str, Any]:
+    sku = entry["sku"]
+    result: Dict[str, Any] = {"sku": sku}
+    try:
+        generated = nova_assets.generate_listing_variants(
+            entry["prompt"],
+            product_name=sku,
+            variants=int(entry.get("variants", variants)),
+            seed=int(entry.get("seed", 42)),
+            thumbnail_size=thumbnail_size,
+        )
+        result.update(generated)
+        questions = entry.get("questions")
+        if questions and generated["asset_uris"]:
+            key = generated["asset_uris"][0].split(f"s3://{store.bucket}/", 1)[1]
+            analysis = nova_assets.analyze_product_image(store.get_bytes(key), list(questions))
+            result["analysis"] = analysis
+            if analysis.error:
+                # Not a done status, so a rerun retries the analysis (the images come from the cache).
+                logger.error("Image analysis for %s failed: %s", sku, analysis.error)
+                result.update({"status": "analysis_error", "error": analysis.error})
+    except Exception as exc:
+        logger.error("Creative refresh for %s failed: %s", sku, exc)
+        result.update({"status": "error", "error": str(exc)})
+    return result
+
+
+def run_creative_batch(
+    entries: Iterable[Dict[str, Any]],
+    result_manifest: str | Path,
+    variants: int = 1,
+    thumbnail_size: Optional[int] = 256,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Generate (and optionally analyze) imagery for every manifest entry.
+
+    Results are appended to ``result_manifest`` (JSONL) as they finish; SKUs already recorded as
+    ``success`` or ``cached`` there are skipped. Returns counts per status plus the manifest path.
+    """
+    settings = EnvironmentSettings.load()
+    store = AssetStore(settings.creative_bucket, settings.region)
+    result_path = Path(result_manifest)
+    result_path.parent.mkdir(parents=True, exist_ok=True)
+
+    completed = _completed_skus(result_path)
+    pending = [entry for entry in entries if entry["sku"] not in completed]
+    workers = max_workers or quota_concurrency()
+    logger.info("Creative batch: %d pending, %d already done, %d workers", len(pending), len(completed), workers)
+
+    counts: Dict[str, int] = {"skipped": len(completed)}
+    write_lock = threading.Lock()
+    with result_path.open("a", encoding="utf-8") as handle, ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_process_entry, entry, variants, thumbnail_size, store) for entry in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            with write_lock:
+                handle.write(json.dumps(result) + "\n")
+                handle.flush()
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+
+    logger.info("Creative batch finished: %s", counts)
+    return {"counts": counts, "result_manifest": str(result_path)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh listing imagery for a catalog manifest.")
+    parser.add_argument("--manifest", required=True, help="JSON or JSONL manifest of {sku, prompt, ...}")
+    parser.add_argument("--output", required=True, help="JSONL result manifest (reruns resume from it)")
+    parser.add_argument("--variants", type=int, default=1, help="Images per SKU (max 5)")
+    parser.add_argument("--thumbnail-size", type=int, default=256, help="Thumbnail edge in pixels; 0 disables")
+    parser.add_argument("--workers", type=int, help="Override the quota-derived concurrency")
+    args = parser.parse_args()
+    summary = run_creative_batch(
+        load_manifest(args.manifest),
+        args.output,
+        variants=args.variants,
+        thumbnail_size=args.thumbnail_size or None,
+        max_workers=args.workers,
+    )
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Catalog image audit with perceptual-hash deduplication.
+
+Sellers reuse the same photo across SKUs and variants, so images are hashed first (a 64-bit
+difference hash when Pillow is installed, SHA-256 otherwise) and near-duplicates within a Hamming
+distance threshold collapse into one group. Without Pillow only byte-identical images group, and
+the report says so (``stats["hash_mode"] == "exact"``); images Pillow cannot decode fall back to
+SHA-256 individually and the report says ``mixed``. Images are read and hashed one at a time;
+only the group representatives that need analysis are read again. Vision analysis runs once per
+group, answers fan back out to every SKU in it, and results are cached in the creative bucket
+under each member's hash so later audits skip images that were already analyzed.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+from botocore.exceptions import ClientError
+
+from aws_merlin_agent.config.settings import EnvironmentSettings
+from aws_merlin_agent.creative import nova_assets
+from aws_merlin_agent.creative.asset_store import AssetStore
+from aws_merlin_agent.creative.image_prep import Image
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+AUDIT_PREFIX = "audits"
+DEFAULT_MAX_DISTANCE = 4
+
+ImageSource = Union[bytes, str]
+
+
+def hash_mode() -> str:
+    """``perceptual`` with Pillow installed, ``exact`` (SHA-256) without it."""
+    return "exact" if Image is None else "perceptual"
+
+
+def image_hash(data: bytes, hash_size: int = 8) -> str:
+    """
+    ``p:<hex>`` difference hash, or ``s:<sha256>`` (exact matching only) without Pillow or when
+    Pillow cannot decode ``data``.
+    """
+    if Image is None:
+        return "s:" + hashlib.sha256(data).hexdigest()
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            pixels = np.asarray(img.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS), dtype=np.int16)
+    except (OSError, Image.DecompressionBombError) as exc:
+        logger.warning("Could not decode image for perceptual hashing, using SHA-256: %s", exc)
+        return "s:" + hashlib.sha256(data).hexdigest()
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return "p:" + np.packbits(bits).tobytes().hex()
+
+
+def group_hashes(hashes: List[str], max_distance: int = DEFAULT_MAX_DISTANCE) -> List[int]:
+    """
+    Assign each hash to a group; returns the index of the group representative for every input.
+
+    Perceptual hashes join the nearest representative within ``max_distance`` bits, compared
+    against all representatives at once; SHA-256 hashes only group on exact matches.
+    """
+    groups: List[int] = []
+    exact: Dict[str, int] = {}
+    rep_values: List[int] = []
+    rep_indexes: List[int] = []
+    for idx, value in enumerate(hashes):
+        if value in exact:
+            groups.append(exact[value])
+            continue
+        if value.startswith("p:") and rep_values:
+            xor = np.array(rep_values, dtype=np.uint64) ^ np.uint64(int(value[2:], 16))
+            distances = np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+            nearest = int(np.argmin(distances))
+            if distances[nearest] <= max_distance:
+                exact[value] = rep_indexes[nearest]
+                groups.append(rep_indexes[nearest])
+                continue
+        exact[value] = idx
+        groups.append(idx)
+        if value.startswith("p:"):
+            rep_values.append(int(value[2:], 16))
+            rep_indexes.append(idx)
+    return groups
+
+
+def _questions_digest(questions: List[str]) -> str:
+    return hashlib.sha256(json.dumps(questions).encode("utf-8")).hexdigest()[:16]
+
+
+class AuditCache:
+    """Analysis results in S3 under ``audits/<image hash>/<questions digest>.json``."""
+
+    def __init__(self, store: AssetStore) -> None:
+        self.store = store
+
+    def _key(self, image_hash_value: str, questions: List[str]) -> str:
+        return f"{AUDIT_PREFIX}/{image_hash_value.replace(':', '-')}/{_questions_digest(questions)}.json"
+
+    def get(self, image_hash_value: str, questions: List[str]) -> Optional[Dict[str, str]]:
+        try:
+            return json.loads(self.store.get_bytes(self._key(image_hash_value, questions)))
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return None
+            raise
+
+    def put(self, image_hash_value: str, questions: List[str], answers: Dict[str, str]) -> None:
+        self.store.put_bytes(
+            self._key(image_hash_value, questions),
+            json.dumps(answers).encode("utf-8"),
+            content_type="application/json",
+        )
+
+
+def audit_catalog_images(
+    images: Dict[str, ImageSource],
+    questions: List[str],
+    max_distance: int = DEFAULT_MAX_DISTANCE,
+    max_workers: int = 4,
+    cache: Optional[AuditCache] = None,
+) -> Dict[str, Any]:
+    """
+    Audit ``images`` (SKU -> raw bytes or a creative-bucket key) with one analysis per unique image.
+
+    Returns ``{"results": {sku: {...}}, "stats": {...}}``; each result carries the SKU's hash, its
+    group representative's SKU, the answers, whether they came from the cache and, when the
+    analysis failed, the ``error``. ``stats["hash_mode"]`` is ``exact`` when near-duplicates could
+    not be detected because Pillow is missing, and ``mixed`` when some images could not be decoded
+    and only match byte-identical copies (``stats["exact_fallbacks"]`` counts them).
+    """
+    settings = EnvironmentSettings.load()
+    store = AssetStore(settings.creative_bucket, settings.region)
+    cache = cache or AuditCache(store)
+
+    def load(sku: str) -> bytes:
+        source = images[sku]
+        return source if isinstance(source, bytes) else store.get_bytes(source)
+
+    mode = hash_mode()
+    if mode == "exact":
+        logger.warning("Pillow is not installed; image audit falls back to exact SHA-256 matching")
+    skus = list(images)
+    hashes = [image_hash(load(sku)) for sku in skus]
+    fallbacks = sum(value.startswith("s:") for value in hashes) if mode == "perceptual" else 0
+    if fallbacks:
+        mode = "mixed"
+    groups = group_hashes(hashes, max_distance)
+    members: Dict[int, List[int]] = {}
+    for idx, rep in enumerate(groups):
+        members.setdefault(rep, []).append(idx)
+
+    answers: Dict[int, Dict[str, str]] = {}
+    sources: Dict[int, str] = {}
+    errors: Dict[int, str] = {}
+    to_analyze: List[int] = []
+    for rep, indexes in members.items():
+        cached = next(
+            (hit for hit in (cache.get(h, questions) for h in dict.fromkeys(hashes[i] for i in indexes)) if hit),
+            None,
+        )
+        if cached is not None:
+            answers[rep], sources[rep] = cached, "cached"
+        else:
+            to_analyze.append(rep)
+
+    def analyze(rep: int) -> nova_assets.VisionAnswers:
+        return nova_assets.analyze_product_image(load(skus[rep]), questions)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_analyze) or 1))) as pool:
+        for rep, result in zip(to_analyze, pool.map(analyze, to_analyze)):
+            answers[rep] = dict(result)
+            if result.error:
+                sources[rep], errors[rep] = "error", result.error
+                continue
+            sources[rep] = "analyzed"
+            for value in dict.fromkeys(hashes[i] for i in members[rep]):
+                cache.put(value, questions, answers[rep])
+
+    results = {
+        sku: {
+            "image_hash": hashes[idx],
+            "duplicate_of": skus[groups[idx]] if groups[idx] != idx else None,
+            "answers": answers[groups[idx]],
+            "source": sources[groups[idx]],
+            **({"error": errors[groups[idx]]} if groups[idx] in errors else {}),
+        }
+        for idx, sku in enumerate(skus)
+    }
+    stats = {
+        "hash_mode": mode,
+        "exact_fallbacks": fallbacks,
+        "listings": len(skus),
+        "unique_images": len(members),
+        "analyzed": len(to_analyze),
+        "cache_hits": len(members) - len(to_analyze),
+    }
+    logger.info("Image audit: %s", stats)
+    return {"results": results, "stats": stats}
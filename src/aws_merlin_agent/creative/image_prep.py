@@ -0,0 +1,105 @@
+"""
+Image preprocessing for vision requests.
+
+Images are identified from their magic bytes rather than trusted to be PNG, and - when Pillow is
+installed (``pip install aws-merlin-agent[imaging]``) - downscaled to a maximum edge and recompressed
+before they are base64-encoded into a Bedrock request. Without Pillow the original bytes are sent.
+"""
+from __future__ import annotations
+
+import io
+import os
+from typing import Optional
+
+from aws_merlin_agent.bedrock.adapters import ImageInput
+from aws_merlin_agent.utils.logging import get_logger
+
+try:  # Pillow is optional; preprocessing degrades to format detection only.
+    from PIL import Image
+except ImportError:  # pragma: no cover - exercised when the imaging extra is absent
+    Image = None
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_DIMENSION = 1024
+DEFAULT_JPEG_QUALITY = 85
+
+_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+
+
+def detect_image_format(data: bytes) -> str:
+    """Return the Bedrock format name (png, jpeg, gif, webp) from the image's magic bytes."""
+    for signature, name in _SIGNATURES:
+        if data.startswith(signature):
+            return name
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    raise ValueError("Unsupported image format; expected PNG, JPEG, GIF or WEBP bytes")
+
+
+def prepare_image(
+    data: bytes,
+    max_dimension: Optional[int] = None,
+    quality: Optional[int] = None,
+) -> ImageInput:
+    """
+    Downscale ``data`` so its longest edge is at most ``max_dimension`` and recompress it.
+
+    Opaque images are re-encoded as JPEG, images with transparency as PNG. Images that already fit
+    keep their original bytes unless recompression makes them smaller.
+    """
+    if max_dimension is None:
+        max_dimension = int(os.getenv("MERLIN_VISION_MAX_DIMENSION", DEFAULT_MAX_DIMENSION))
+    if quality is None:
+        quality = int(os.getenv("MERLIN_VISION_JPEG_QUALITY", DEFAULT_JPEG_QUALITY))
+
+    original = ImageInput(data=data, format=detect_image_format(data))
+    if Image is None:
+        logger.debug("Pillow not installed; sending %s image without resizing", original.format)
+        return original
+    # Animated GIFs would lose their frames; leave them alone.
+    if original.format == "gif":
+        return original
+
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.load()
+            resized = max(img.size) > max_dimension
+            if resized:
+                img.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+            has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+            buffer = io.BytesIO()
+            if has_alpha:
+                img.save(buffer, format="PNG", optimize=True)
+                candidate = ImageInput(data=buffer.getvalue(), format="png")
+            else:
+                img.convert("RGB").save(buffer, format="JPEG", quality=quality, optimize=True)
+                candidate = ImageInput(data=buffer.getvalue(), format="jpeg")
+    except (OSError, Image.DecompressionBombError) as exc:
+        # The magic bytes matched but Pillow cannot decode the rest; let the model see the original.
+        logger.warning("Could not preprocess %s image, sending it unchanged: %s", original.format, exc)
+        return original
+
+    # Image tokens scale with resolution, so a downscaled image always wins.
+    if not resized and len(candidate.data) >= len(original.data):
+        return original
+    logger.debug("Recompressed image %d -> %d bytes", len(original.data), len(candidate.data))
+    return candidate
+
+
+def make_thumbnail(data: bytes, size: int = 256, quality: Optional[int] = None) -> Optional[bytes]:
+    """JPEG thumbnail with the longest edge at ``size``, or None when Pillow is not installed."""
+    if Image is None:
+        return None
+    if quality is None:
+        quality = int(os.getenv("MERLIN_VISION_JPEG_QUALITY", DEFAULT_JPEG_QUALITY))
+    with Image.open(io.BytesIO(data)) as img:
+        img.thumbnail((size, size), Image.LANCZOS)
+        buffer = io.BytesIO()
+        img.convert("RGB").save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
@@ -8,69 +8,138 @@ from __future__ import annotations
 
 import base64
 import json
-from typing import Dict
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
+from aws_merlin_agent.bedrock.adapters import TextRequest
+from aws_merlin_agent.bedrock.client import BedrockClient
+from aws_merlin_agent.bedrock.rate_limit import NOVA_CANVAS
+from aws_merlin_agent.bedrock.router import get_router
 from aws_merlin_agent.config.settings import EnvironmentSettings
-from aws_merlin_agent.utils import aws, logging
+from aws_merlin_agent.creative import video_jobs
+from aws_merlin_agent.creative.asset_store import AssetStore, request_digest
+from aws_merlin_agent.creative.image_prep import make_thumbnail, prepare_image
+from aws_merlin_agent.utils import logging
 
 logger = logging.get_logger(__name__)
 
+# Nova Canvas returns at most five images per request.
+MAX_CANVAS_IMAGES = 5
 
-def generate_listing_image(prompt: str, product_name: str = "product") -> Dict[str, str]:
+_NUMBERED_ANSWER = re.compile(r"^\s*(\d+)[.):]\s*(.+)$", re.MULTILINE)
+
+
+class VisionAnswers(dict):
+    """Question -> answer mapping; ``error`` is set when the analysis failed and the answers are placeholders."""
+
+    def __init__(self, answers: Dict[str, str], error: Optional[str] = None) -> None:
+        super().__init__(answers)
+        self.error = error
+
+
+def build_canvas_request(prompt: str, seed: int = 42, number_of_images: int = 1) -> Dict[str, Any]:
+    """Nova Canvas TEXT_IMAGE body for a product shot."""
+    return {
+        "taskType": "TEXT_IMAGE",
+        "textToImageParams": {
+            "text": f"Professional product photography: {prompt}"
+        },
+        "imageGenerationConfig": {
+            "numberOfImages": number_of_images,
+            "width": 1024,
+            "height": 1024,
+            "cfgScale": 8.0,
+            "seed": seed
+        }
+    }
+
+
+def generate_listing_variants(
+    prompt: str,
+    product_name: str = "product",
+    variants: int = 1,
+    seed: int = 42,
+    thumbnail_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Generate ``variants`` images for one prompt in a single Nova Canvas call.
+
+    Images are content-addressed by (model, prompt, config, seed): a repeat request is answered
+    from the creative bucket once the set's manifest exists, and new images are streamed straight to
+    S3 with the manifest written last, so an interrupted upload is regenerated. When
+    ``thumbnail_size`` is set (and Pillow is installed) a JPEG thumbnail is stored beside each
+    variant. Raises on Bedrock or S3 errors; ``status`` is ``cached``, ``success`` or ``no_images``.
+    """
+    settings = EnvironmentSettings.load()
+    model_id = NOVA_CANVAS
+    request_body = build_canvas_request(prompt, seed, number_of_images=min(max(variants, 1), MAX_CANVAS_IMAGES))
+    store = AssetStore(settings.creative_bucket, settings.region)
+    digest = request_digest(model_id, request_body)
+    count = request_body["imageGenerationConfig"]["numberOfImages"]
+    keys = [store.key_for(digest, index) for index in range(count)]
+    thumb_keys = [store.key_for(digest, index, f"thumb{thumbnail_size}.jpg") for index in range(count)]
+    result: Dict[str, Any] = {"prompt": prompt, "cache_key": digest, "asset_uris": [store.uri(key) for key in keys]}
+
+    manifest = store.load_manifest(digest)
+    if manifest is not None:
+        logger.info("Reusing cached Nova Canvas images %s", digest[:12])
+        # Canvas may have returned fewer images than requested; the manifest lists what was stored.
+        keys = manifest["keys"]
+        result["asset_uris"] = [store.uri(key) for key in keys]
+        result["status"] = "cached"
+        images = None
+    else:
+        response_body = BedrockClient(settings.region).invoke_json(model_id, request_body)
+        images = [base64.b64decode(image) for image in response_body.get("images", [])[:count]]
+        if not images:
+            logger.warning("No images returned from Nova Canvas")
+            return {**result, "asset_uris": [], "status": "no_images"}
+        keys = keys[:len(images)]
+        result["asset_uris"] = [
+            store.put_bytes(key, image, metadata={"product": product_name}) for key, image in zip(keys, images)
+        ]
+        store.put_manifest(digest, keys)
+        result["status"] = "success"
+        logger.info("Generated %d product image(s) using Nova Canvas", len(images))
+
+    if thumbnail_size:
+        thumbnails = []
+        for index, key in enumerate(keys):
+            thumb_key = thumb_keys[index]
+            if images is None and store.exists(thumb_key):
+                thumbnails.append(store.uri(thumb_key))
+                continue
+            thumbnail = make_thumbnail(images[index] if images else store.get_bytes(key), thumbnail_size)
+            if thumbnail is not None:
+                thumbnails.append(store.put_bytes(thumb_key, thumbnail, content_type="image/jpeg"))
+        result["thumbnail_uris"] = thumbnails
+    return result
+
+
+def generate_listing_image(prompt: str, product_name: str = "product", seed: int = 42) -> Dict[str, str]:
     """
     Generate product imagery using Amazon Nova Canvas.
     
-    This demonstrates Nova's multimodal capabilities for the hackathon.
+    Backed by ``generate_listing_variants``, so identical requests are served from the creative
+    bucket and the response carries the asset URI, never the image bytes.
     """
     settings = EnvironmentSettings.load()
-    bedrock_runtime = aws.client("bedrock-runtime", region_name=settings.region)
-    
-    full_prompt = f"Professional product photography: {prompt}"
     
     try:
-        # Use Nova Canvas for image generation
-        model_id = "amazon.nova-canvas-v1:0"
-        
-        request_body = {
-            "taskType": "TEXT_IMAGE",
-            "textToImageParams": {
-                "text": full_prompt
-            },
-            "imageGenerationConfig": {
-                "numberOfImages": 1,
-                "width": 1024,
-                "height": 1024,
-                "cfgScale": 8.0,
-                "seed": 42
-            }
-        }
-        
-        response = bedrock_runtime.invoke_model(
-            modelId=model_id,
-            body=json.dumps(request_body)
-        )
-        
-        response_body = json.loads(response["body"].read())
-        
-        # Extract base64 image
-        if "images" in response_body and len(response_body["images"]) > 0:
-            image_base64 = response_body["images"][0]
-            # In production, save to S3
-            asset_uri = f"s3://{settings.creative_bucket}/assets/{product_name}-generated.png"
-            logger.info("Generated product image using Nova Canvas")
-            return {
-                "prompt": prompt,
-                "asset_uri": asset_uri,
-                "image_base64": image_base64,
-                "status": "success"
-            }
-        else:
-            logger.warning("No images returned from Nova Canvas")
+        result = generate_listing_variants(prompt, product_name, variants=1, seed=seed)
+        if result["status"] == "no_images":
             return {
                 "prompt": prompt,
                 "asset_uri": f"s3://{settings.creative_bucket}/assets/mock-image.png",
                 "status": "no_images"
             }
+        return {
+            "prompt": prompt,
+            "asset_uri": result["asset_uris"][0],
+            "cache_key": result["cache_key"],
+            "status": result["status"]
+        }
             
     except Exception as e:
         logger.error("Nova Canvas image generation failed: %s", str(e))
@@ -88,7 +157,10 @@ def generate_promotional_video(
     duration_seconds: int = 6
 ) -> Dict[str, str]:
     """
-    Generate promotional video using Amazon Nova Reel.
+    Queue a promotional video using Amazon Nova Reel.
+    
+    Rendering takes minutes, so this submits an async job and returns straight away; poll with
+    ``video_jobs.refresh_video_jobs`` or ``video_jobs.collect_completed_videos``.
     
     Args:
         product_name: Name of the product
@@ -96,59 +168,21 @@ def generate_promotional_video(
         duration_seconds: Video duration (max 6 seconds)
         
     Returns:
-        Dict with video URI and metadata
+        Dict with the job id, output location and status
     """
     settings = EnvironmentSettings.load()
-    bedrock_runtime = aws.client("bedrock-runtime", region_name=settings.region)
-    
-    features_text = ", ".join(key_features)
-    prompt = f"Professional product showcase video for {product_name}. Highlights: {features_text}. Clean, modern aesthetic."
     
     try:
-        # Use Nova Reel for video generation
-        model_id = "amazon.nova-reel-v1:0"
-        
-        request_body = {
-            "taskType": "TEXT_VIDEO",
-            "textToVideoParams": {
-                "text": prompt
-            },
-            "videoGenerationConfig": {
-                "durationSeconds": min(duration_seconds, 6),
-                "fps": 24,
-                "dimension": "1280x720",
-                "seed": 42
-            }
+        job = video_jobs.submit_video_job(product_name, key_features, duration_seconds)
+        return {
+            "product_name": product_name,
+            "job_id": job.job_id,
+            "asset_uri": job.output_uri,
+            "status": "submitted"
         }
-        
-        response = bedrock_runtime.invoke_model(
-            modelId=model_id,
-            body=json.dumps(request_body)
-        )
-        
-        response_body = json.loads(response["body"].read())
-        
-        # Extract base64 video
-        if "video" in response_body:
-            video_base64 = response_body["video"]
-            asset_uri = f"s3://{settings.creative_bucket}/videos/{product_name}-promo.mp4"
-            logger.info("Generated promotional video using Nova Reel")
-            return {
-                "product_name": product_name,
-                "asset_uri": asset_uri,
-                "video_base64": video_base64,
-                "status": "success"
-            }
-        else:
-            logger.warning("No video returned from Nova Reel")
-            return {
-                "product_name": product_name,
-                "asset_uri": f"s3://{settings.creative_bucket}/videos/mock-video.mp4",
-                "status": "no_video"
-            }
             
     except Exception as e:
-        logger.error("Nova Reel video generation failed: %s", str(e))
+        logger.error("Nova Reel video submission failed: %s", str(e))
         return {
             "product_name": product_name,
             "asset_uri": f"s3://{settings.creative_bucket}/videos/mock-video.mp4",
@@ -157,66 +191,112 @@ def generate_promotional_video(
         }
 
 
-def analyze_product_image(image_bytes: bytes, questions: list[str]) -> dict[str, str]:
+def build_vision_prompt(questions: List[str]) -> str:
+    """Ask every question in one request and require a JSON object keyed by question number."""
+    numbered = "\n".join(f"{idx}. {question}" for idx, question in enumerate(questions, start=1))
+    return (
+        "Answer each question about the product image.\n"
+        f"{numbered}\n\n"
+        'Respond with only a JSON object mapping each question number to its answer, e.g. {"1": "...", "2": "..."}.'
+    )
+
+
+def parse_vision_answers(text: str, questions: List[str]) -> Dict[str, str]:
+    """
+    Map a structured multi-question response back onto ``questions``.
+
+    Accepts the requested JSON object (optionally wrapped in prose or a code fence) and falls back
+    to ``N. answer`` lines. Questions without a parsable answer are omitted from the result.
     """
-    Analyze product images using Amazon Nova Pro's vision capabilities.
+    answers: Dict[str, str] = {}
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        try:
+            parsed = json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            parsed = None
+        if isinstance(parsed, dict):
+            for idx, question in enumerate(questions, start=1):
+                value = parsed.get(str(idx), parsed.get(question))
+                if value is not None:
+                    answers[question] = str(value).strip()
+            return answers
+
+    for match in _NUMBERED_ANSWER.finditer(text):
+        idx = int(match.group(1))
+        if 1 <= idx <= len(questions):
+            answers[questions[idx - 1]] = match.group(2).strip()
+    return answers
+
+
+def analyze_product_image(
+    image_bytes: bytes,
+    questions: list[str],
+    mode: str = "single",
+    max_workers: int = 4,
+) -> VisionAnswers:
+    """
+    Analyze product images using Amazon Nova's vision capabilities.
+    
+    The router sends short factual questions to Nova Lite and reasoning-heavy ones to Nova Pro.
+    The image is format-sniffed and downscaled once, then either all questions go out in a single
+    structured-output call (``mode="single"``) or each question gets its own call, run
+    concurrently (``mode="per_question"``) for long answer sets. Questions a single call leaves
+    unanswered are retried individually.
     
     Args:
         image_bytes: Image data
         questions: List of questions to ask about the image
+        mode: ``single`` or ``per_question``
+        max_workers: Concurrent requests in ``per_question`` mode
         
     Returns:
-        Dict mapping questions to answers
+        Dict mapping questions to answers. On failure every answer is an ``Analysis failed``
+        placeholder and ``.error`` holds the reason.
     """
+    if mode not in ("single", "per_question"):
+        raise ValueError(f"Unknown vision mode {mode!r}; expected 'single' or 'per_question'")
     settings = EnvironmentSettings.load()
-    bedrock_runtime = aws.client("bedrock-runtime", region_name=settings.region)
+    
+    decision = get_router().route(" ".join(questions), task="vision", requires_vision=True)
+    client = BedrockClient(settings.region)
+    model_id = decision.model_id
     
     try:
-        # Use Nova Pro for vision analysis
-        model_id = "amazon.nova-pro-v1:0"
-        
-        # Encode image to base64
-        image_base64 = base64.b64encode(image_bytes).decode("utf-8")
-        
-        results = {}
-        for question in questions:
-            request_body = {
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "image": {
-                                    "format": "png",
-                                    "source": {
-                                        "bytes": image_base64
-                                    }
-                                }
-                            },
-                            {
-                                "text": question
-                            }
-                        ]
-                    }
-                ],
-                "inferenceConfig": {
-                    "max_new_tokens": 300,
-                    "temperature": 0.7
-                }
-            }
-            
-            response = bedrock_runtime.invoke_model(
-                modelId=model_id,
-                body=json.dumps(request_body)
+        image = prepare_image(image_bytes)
+
+        def ask(question: str) -> str:
+            completion = client.generate(
+                TextRequest(prompt=question, images=[image], max_tokens=decision.max_tokens),
+                decision.candidates,
             )
-            
-            response_body = json.loads(response["body"].read())
-            answer = response_body["output"]["message"]["content"][0]["text"]
-            results[question] = answer
+            return completion.text
+
+        results: Dict[str, str] = {}
+        pending = list(questions)
+        if mode == "single" and len(questions) > 1:
+            completion = client.generate(
+                TextRequest(
+                    prompt=build_vision_prompt(questions),
+                    images=[image],
+                    max_tokens=decision.max_tokens * len(questions),
+                ),
+                decision.candidates,
+            )
+            model_id = completion.model_id
+            results = parse_vision_answers(completion.text, questions)
+            pending = [question for question in questions if question not in results]
+            if pending:
+                logger.warning("Structured vision response missed %d of %d answers", len(pending), len(questions))
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as pool:
+                for question, answer in zip(pending, pool.map(ask, pending)):
+                    results[question] = answer
         
-        logger.info("Analyzed product image using Nova Pro vision")
-        return results
+        logger.info("Analyzed product image using %s vision (%s mode)", model_id, mode)
+        return VisionAnswers({question: results[question] for question in questions})
         
     except Exception as e:
-        logger.error("Nova Pro vision analysis failed: %s", str(e))
-        return {q: f"Analysis failed: {str(e)}" for q in questions}
+        logger.error("Nova vision analysis with %s failed: %s", model_id, str(e))
+        return VisionAnswers({q: f"Analysis failed: {str(e)}" for q in questions}, error=str(e))
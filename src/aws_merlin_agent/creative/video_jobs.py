@@ -0,0 +1,282 @@
+"""
+Asynchronous Nova Reel video generation.
+
+Videos take minutes to render, so jobs are submitted with ``start_async_invoke`` and tracked in a
+job store (DynamoDB, or JSON files when MERLIN_VIDEO_JOBS_DIR is set) instead of holding a worker
+open. ``refresh_video_jobs`` reconciles every pending job with a paginated ``list_async_invokes``
+sweep, and ``collect_completed_videos`` returns the finished ``output.mp4`` URIs in bulk.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from boto3.dynamodb.conditions import Key
+
+from aws_merlin_agent.bedrock.client import BedrockClient
+from aws_merlin_agent.bedrock.rate_limit import NOVA_REEL
+from aws_merlin_agent.config.settings import EnvironmentSettings
+from aws_merlin_agent.utils import aws
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+STATUS_IN_PROGRESS = "InProgress"
+STATUS_COMPLETED = "Completed"
+STATUS_FAILED = "Failed"
+
+STATUS_INDEX = "status-submitted_at-index"
+# ``submitted_at`` is recorded after StartAsyncInvoke returns, so it trails Bedrock's submitTime.
+LIST_SUBMIT_TIME_MARGIN = timedelta(minutes=5)
+
+
+@dataclass
+class VideoJob:
+    """One Nova Reel async invocation and where its output lands."""
+
+    job_id: str
+    product_name: str
+    prompt: str
+    output_uri: str
+    status: str = STATUS_IN_PROGRESS
+    asset_uri: Optional[str] = None
+    failure_message: Optional[str] = None
+    submitted_at: str = ""
+    updated_at: str = ""
+
+    @classmethod
+    def from_item(cls, item: Dict[str, Any]) -> "VideoJob":
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in item.items() if key in known})
+
+
+class VideoJobStore:
+    """Persistence interface for video job records."""
+
+    def put(self, job: VideoJob) -> None:
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[VideoJob]:
+        raise NotImplementedError
+
+    def list_jobs(self, status: Optional[str] = None) -> List[VideoJob]:
+        raise NotImplementedError
+
+
+class DynamoVideoJobStore(VideoJobStore):
+    """
+    Job records in the video jobs DynamoDB table (hash key ``job_id``).
+
+    Listing by status queries the ``status``/``submitted_at`` index, so a sweep reads only the jobs
+    in that state rather than the whole history; listing every job is still a scan.
+    """
+
+    def __init__(self, table_name: str, region: Optional[str] = None) -> None:
+        self.table_name = table_name
+        self.region = region
+
+    @property
+    def _table(self):
+        return aws.resource("dynamodb", region_name=self.region).Table(self.table_name)
+
+    def put(self, job: VideoJob) -> None:
+        # DynamoDB rejects empty strings for index keys, so unset timestamps are left off the item.
+        self._table.put_item(Item={key: value for key, value in asdict(job).items() if value not in (None, "")})
+
+    def get(self, job_id: str) -> Optional[VideoJob]:
+        item = self._table.get_item(Key={"job_id": job_id}).get("Item")
+        return VideoJob.from_item(item) if item else None
+
+    def list_jobs(self, status: Optional[str] = None) -> List[VideoJob]:
+        table = self._table
+        kwargs: Dict[str, Any] = {}
+        if status:
+            kwargs["IndexName"] = STATUS_INDEX
+            kwargs["KeyConditionExpression"] = Key("status").eq(status)
+        read = table.query if status else table.scan
+        jobs: List[VideoJob] = []
+        while True:
+            response = read(**kwargs)
+            jobs.extend(VideoJob.from_item(item) for item in response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                return jobs
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+class LocalVideoJobStore(VideoJobStore):
+    """One JSON file per job under ``root``; a stand-in for DynamoDB in local runs."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, job_id: str) -> Path:
+        return self.root / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', job_id)}.json"
+
+    def put(self, job: VideoJob) -> None:
+        self._path(job.job_id).write_text(json.dumps(asdict(job)), encoding="utf-8")
+
+    def get(self, job_id: str) -> Optional[VideoJob]:
+        path = self._path(job_id)
+        if not path.exists():
+            return None
+        return VideoJob.from_item(json.loads(path.read_text(encoding="utf-8")))
+
+    def list_jobs(self, status: Optional[str] = None) -> List[VideoJob]:
+        jobs = [VideoJob.from_item(json.loads(path.read_text(encoding="utf-8"))) for path in sorted(self.root.glob("*.json"))]
+        return [job for job in jobs if status is None or job.status == status]
+
+
+def default_job_store(settings: EnvironmentSettings) -> VideoJobStore:
+    """Use the local stand-in when MERLIN_VIDEO_JOBS_DIR is set, otherwise DynamoDB."""
+    local_dir = os.getenv("MERLIN_VIDEO_JOBS_DIR")
+    if local_dir:
+        return LocalVideoJobStore(local_dir)
+    if not settings.dynamodb_table_video_jobs:
+        raise RuntimeError("MERLIN_VIDEO_JOBS_TABLE must be set to track video jobs")
+    return DynamoVideoJobStore(settings.dynamodb_table_video_jobs, settings.region)
+
+
+def build_reel_request(product_name: str, key_features: List[str], duration_seconds: int = 6) -> Dict[str, Any]:
+    """Nova Reel TEXT_VIDEO model input for a product showcase clip."""
+    features_text = ", ".join(key_features)
+    prompt = f"Professional product showcase video for {product_name}. Highlights: {features_text}. Clean, modern aesthetic."
+    return {
+        "taskType": "TEXT_VIDEO",
+        "textToVideoParams": {"text": prompt},
+        "videoGenerationConfig": {
+            "durationSeconds": min(duration_seconds, 6),
+            "fps": 24,
+            "dimension": "1280x720",
+            "seed": 42,
+        },
+    }
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-") or "product"
+
+
+def submit_video_job(
+    product_name: str,
+    key_features: List[str],
+    duration_seconds: int = 6,
+    store: Optional[VideoJobStore] = None,
+    client: Optional[BedrockClient] = None,
+) -> VideoJob:
+    """Start one Nova Reel render and record it as ``InProgress``; returns immediately."""
+    settings = EnvironmentSettings.load()
+    store = store or default_job_store(settings)
+    client = client or BedrockClient(settings.region)
+
+    model_input = build_reel_request(product_name, key_features, duration_seconds)
+    output_uri = f"s3://{settings.creative_bucket}/videos/{_slug(product_name)}/"
+    job_id = client.start_async(NOVA_REEL, model_input, output_uri)
+    now = datetime.utcnow().isoformat()
+    job = VideoJob(
+        job_id=job_id,
+        product_name=product_name,
+        prompt=model_input["textToVideoParams"]["text"],
+        output_uri=output_uri,
+        submitted_at=now,
+        updated_at=now,
+    )
+    store.put(job)
+    logger.info("Submitted Nova Reel job %s for %s", job_id, product_name)
+    return job
+
+
+def submit_video_jobs(
+    requests: Iterable[Dict[str, Any]],
+    store: Optional[VideoJobStore] = None,
+) -> List[VideoJob]:
+    """
+    Queue many renders at once. Each request holds ``product_name``, ``key_features`` and an
+    optional ``duration_seconds``; submissions share the Reel quota bucket, so large batches are
+    paced rather than throttled. Failed submissions are logged and skipped.
+    """
+    settings = EnvironmentSettings.load()
+    store = store or default_job_store(settings)
+    client = BedrockClient(settings.region)
+    jobs = []
+    for request in requests:
+        try:
+            jobs.append(
+                submit_video_job(
+                    request["product_name"],
+                    list(request.get("key_features", [])),
+                    int(request.get("duration_seconds", 6)),
+                    store=store,
+                    client=client,
+                )
+            )
+        except Exception as exc:
+            logger.error("Nova Reel submission for %s failed: %s", request.get("product_name"), exc)
+    return jobs
+
+
+def _apply_status(job: VideoJob, summary: Dict[str, Any]) -> bool:
+    status = summary.get("status", job.status)
+    if status == job.status:
+        return False
+    job.status = status
+    job.updated_at = datetime.utcnow().isoformat()
+    if status == STATUS_COMPLETED:
+        # Reel writes output.mp4 under a per-invocation folder below the requested prefix.
+        output = summary.get("outputDataConfig", {}).get("s3OutputDataConfig", {}).get("s3Uri", job.output_uri)
+        job.asset_uri = f"{output.rstrip('/')}/output.mp4"
+    elif status == STATUS_FAILED:
+        job.failure_message = summary.get("failureMessage")
+    return True
+
+
+def refresh_video_jobs(store: Optional[VideoJobStore] = None) -> List[VideoJob]:
+    """Update every pending job's status; returns the jobs whose status changed."""
+    settings = EnvironmentSettings.load()
+    store = store or default_job_store(settings)
+    pending = {job.job_id: job for job in store.list_jobs(STATUS_IN_PROGRESS)}
+    if not pending:
+        return []
+
+    runtime = aws.client("bedrock-runtime", region_name=settings.region)
+    summaries: Dict[str, Dict[str, Any]] = {}
+    # One paginated sweep covers the whole queue instead of a GetAsyncInvoke per job.
+    oldest = min(job.submitted_at for job in pending.values())
+    kwargs: Dict[str, Any] = (
+        {"submitTimeAfter": datetime.fromisoformat(oldest) - LIST_SUBMIT_TIME_MARGIN} if oldest else {}
+    )
+    for page in runtime.get_paginator("list_async_invokes").paginate(**kwargs):
+        for summary in page.get("asyncInvokeSummaries", []):
+            if summary.get("invocationArn") in pending:
+                summaries[summary["invocationArn"]] = summary
+    for job_id in pending.keys() - summaries.keys():
+        try:
+            summaries[job_id] = runtime.get_async_invoke(invocationArn=job_id)
+        except Exception as exc:
+            logger.warning("Could not fetch status for video job %s: %s", job_id, exc)
+
+    changed = []
+    for job_id, summary in summaries.items():
+        job = pending[job_id]
+        if _apply_status(job, summary):
+            store.put(job)
+            changed.append(job)
+    logger.info("Refreshed %d pending video jobs; %d changed", len(pending), len(changed))
+    return changed
+
+
+def collect_completed_videos(store: Optional[VideoJobStore] = None) -> Dict[str, Dict[str, Any]]:
+    """Refresh pending jobs, then return every completed or failed job keyed by job id."""
+    settings = EnvironmentSettings.load()
+    store = store or default_job_store(settings)
+    refresh_video_jobs(store)
+    return {
+        job.job_id: asdict(job)
+        for status in (STATUS_COMPLETED, STATUS_FAILED)
+        for job in store.list_jobs(status)
+    }
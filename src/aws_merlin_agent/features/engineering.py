@@ -2,6 +2,17 @@ from __future__ import annotations
 
 import pandas as pd
 
+# Model inputs in training column order (see ``models.training.demand_forecast``).
+FORECAST_FEATURES = [
+    "net_revenue",
+    "ad_spend",
+    "inventory_on_hand",
+    "revenue_per_unit",
+    "ad_efficiency",
+    "stockout_risk",
+    "lag_days",
+]
+
 
 def build_feature_frame(sales_df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -0,0 +1,103 @@
+"""
+Model artifact formats.
+
+Boosters are published as UBJSON (``model.ubj``), XGBoost's binary model format: it parses an
+order of magnitude faster than the JSON format and, for production-sized models, is about a
+third smaller; gzip (``model.ubj.gz``) shrinks it several-fold again. The format is carried by the key suffix.
+Loaders sniff the bytes, so every artifact in the registry - including older ``model.json``
+files - loads through the same path. Each artifact gets a small ``model.meta.json`` sidecar
+with the feature order, dtypes and training watermark so tools can inspect a model without
+downloading or parsing it.
+
+The SageMaker XGBoost container only reads uncompressed JSON, so runs meant for the endpoint are
+published with ``MERLIN_MODEL_FORMAT=json MERLIN_MODEL_COMPRESSION=none``; ``registry artifact-uri``
+refuses to hand any other artifact to a deploy.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from xgboost import Booster, XGBRegressor
+
+FORMATS = ("json", "ubj")
+COMPRESSIONS = ("none", "gzip")
+DEFAULT_FORMAT = "ubj"
+DEFAULT_COMPRESSION = "gzip"
+META_SUFFIX = ".meta.json"
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass
+class ArtifactMeta:
+    """Sidecar describing a published model artifact."""
+
+    format: str
+    compression: str
+    feature_names: List[str]
+    dtypes: Dict[str, str] = field(default_factory=dict)
+    data_watermark: Optional[str] = None
+    num_trees: Optional[int] = None
+
+    def to_json(self) -> bytes:
+        return json.dumps(asdict(self), sort_keys=True).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> "ArtifactMeta":
+        return cls(**json.loads(data))
+
+
+def configured_format() -> Tuple[str, str]:
+    """``(format, compression)`` for newly published models (MERLIN_MODEL_FORMAT / MERLIN_MODEL_COMPRESSION)."""
+    fmt = os.getenv("MERLIN_MODEL_FORMAT", DEFAULT_FORMAT).lower()
+    compression = os.getenv("MERLIN_MODEL_COMPRESSION", DEFAULT_COMPRESSION).lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported model format {fmt}; expected one of {FORMATS}")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported model compression {compression}; expected one of {COMPRESSIONS}")
+    return fmt, compression
+
+
+def artifact_name(fmt: str = DEFAULT_FORMAT, compression: str = "none") -> str:
+    """``model.json``, ``model.ubj`` or ``model.ubj.gz``."""
+    return f"model.{fmt}" + (".gz" if compression == "gzip" else "")
+
+
+def format_of(key: str) -> Tuple[str, str]:
+    """Parse the format and compression from an artifact key's suffixes."""
+    suffixes = Path(key).suffixes
+    compression = "gzip" if suffixes and suffixes[-1] == ".gz" else "none"
+    if compression == "gzip":
+        suffixes = suffixes[:-1]
+    fmt = suffixes[-1].lstrip(".") if suffixes else "json"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported model artifact {key}; expected a .json or .ubj key (optionally .gz)")
+    return fmt, compression
+
+
+def meta_key(key: str) -> str:
+    """Sidecar key for an artifact key: ``.../model.ubj.gz`` -> ``.../model.meta.json``."""
+    path = Path(key)
+    stem = path.name.split(".", 1)[0]
+    return str(path.with_name(f"{stem}{META_SUFFIX}"))
+
+
+def serialize(booster: Booster, fmt: str = DEFAULT_FORMAT, compression: str = "none") -> bytes:
+    raw = bytes(booster.save_raw(raw_format=fmt))
+    if compression == "gzip":
+        # Level 6 keeps compression cheap; decompression cost is negligible next to parsing.
+        return gzip.compress(raw, compresslevel=6)
+    return raw
+
+
+def deserialize(data: bytes) -> XGBRegressor:
+    """Load JSON or UBJSON bytes, gzipped or not; XGBoost tells the two formats apart itself."""
+    if data[:2] == _GZIP_MAGIC:
+        data = gzip.decompress(data)
+    model = XGBRegressor()
+    model.load_model(bytearray(data))
+    return model
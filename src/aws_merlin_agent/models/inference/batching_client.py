@@ -0,0 +1,166 @@
+"""
+Micro-batched SageMaker inference for fleet runs.
+
+Instances from many SKUs are coalesced into requests of at most ``max_batch_instances`` rows (and
+roughly ``max_payload_bytes``), several requests are kept in flight over one pooled client, and the
+predictions are split back per SKU. Besides JSON the payload can be sent as headerless CSV or a
+NumPy ``.npy`` float32 matrix, which is both smaller and cheaper to encode.
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from aws_merlin_agent.config.settings import EnvironmentSettings
+from aws_merlin_agent.utils import aws
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+CONTENT_JSON = "application/json"
+CONTENT_CSV = "text/csv"
+CONTENT_NPY = "application/x-npy"
+SUPPORTED_CONTENT_TYPES = (CONTENT_JSON, CONTENT_CSV, CONTENT_NPY)
+
+# SageMaker real-time endpoints reject request bodies above 6 MB.
+DEFAULT_MAX_PAYLOAD_BYTES = 5_000_000
+
+
+def _payload_to_frame(payload: Dict[str, Any]) -> pd.DataFrame:
+    instances = payload.get("instances")
+    if instances is None:
+        raise ValueError("Payload missing 'instances' key")
+    if isinstance(instances, (dict, list)):
+        return pd.DataFrame(instances)
+    raise ValueError("Unsupported payload shape; expected list[dict] or dict[str, list]")
+
+
+def encode_batch(frame: pd.DataFrame, content_type: str) -> bytes:
+    """Serialize feature rows for ``invoke_endpoint``."""
+    if content_type == CONTENT_JSON:
+        return json.dumps({"instances": frame.to_dict(orient="records")}).encode("utf-8")
+    matrix = np.ascontiguousarray(frame.to_numpy(dtype=np.float32))
+    if content_type == CONTENT_CSV:
+        buffer = io.StringIO()
+        np.savetxt(buffer, matrix, delimiter=",", fmt="%.7g")
+        return buffer.getvalue().encode("utf-8")
+    if content_type == CONTENT_NPY:
+        buffer = io.BytesIO()
+        np.save(buffer, matrix, allow_pickle=False)
+        return buffer.getvalue()
+    raise ValueError(f"Unsupported content type {content_type}; expected one of {SUPPORTED_CONTENT_TYPES}")
+
+
+def decode_predictions(body: bytes, content_type: str) -> List[float]:
+    """Parse an endpoint response (JSON, CSV/newline text or ``.npy``) into a flat list."""
+    if not body or not body.strip():
+        return []
+    if content_type.startswith(CONTENT_NPY):
+        return np.load(io.BytesIO(body), allow_pickle=False).reshape(-1).tolist()
+    text = body.decode("utf-8").strip()
+    if content_type.startswith(CONTENT_JSON) or text[:1] in "[{":
+        parsed = json.loads(text)
+        if isinstance(parsed, dict):
+            parsed = parsed.get("predictions", [])
+        return [float(value["score"]) if isinstance(value, dict) else float(value) for value in parsed]
+    return [float(value) for value in text.replace("\n", ",").split(",") if value.strip()]
+
+
+class BatchingForecastClient:
+    """
+    Coalescing, concurrent ``invoke_endpoint`` client for many SKUs at once.
+
+    ``feature_order`` is the column order the endpoint's model was trained on; CSV and ``.npy``
+    bodies carry no column names, so every payload is laid out in exactly this order.
+    """
+
+    def __init__(
+        self,
+        endpoint_name: Optional[str] = None,
+        *,
+        feature_order: Sequence[str],
+        content_type: Optional[str] = None,
+        max_batch_instances: int = 500,
+        max_payload_bytes: int = DEFAULT_MAX_PAYLOAD_BYTES,
+        max_in_flight: int = 4,
+    ) -> None:
+        if not feature_order:
+            raise ValueError("feature_order must list the model's features in training order")
+        self.settings = EnvironmentSettings.load()
+        self.endpoint_name = (
+            endpoint_name or os.getenv("FORECAST_ENDPOINT_NAME") or f"merlin-{self.settings.env}-demand-forecast"
+        )
+        self.content_type = content_type or os.getenv("MERLIN_FORECAST_CONTENT_TYPE", CONTENT_JSON)
+        if self.content_type not in SUPPORTED_CONTENT_TYPES:
+            raise ValueError(f"Unsupported content type {self.content_type}")
+        self.max_batch_instances = max_batch_instances
+        self.max_payload_bytes = max_payload_bytes
+        self.max_in_flight = max_in_flight
+        self.feature_order = list(feature_order)
+        self.runtime = aws.client(
+            "sagemaker-runtime", region_name=self.settings.region, max_pool_connections=max(max_in_flight, 10)
+        )
+
+    def _batches(self, frame: pd.DataFrame) -> List[Tuple[int, int]]:
+        """Row ranges that respect both the instance and (estimated) byte limits."""
+        if frame.empty:
+            return []
+        sample = encode_batch(frame.iloc[: min(len(frame), 50)], self.content_type)
+        bytes_per_row = max(1, len(sample) // min(len(frame), 50))
+        rows_per_batch = max(1, min(self.max_batch_instances, self.max_payload_bytes // bytes_per_row))
+        return [(start, min(start + rows_per_batch, len(frame))) for start in range(0, len(frame), rows_per_batch)]
+
+    def _invoke(self, frame: pd.DataFrame) -> List[float]:
+        response = self.runtime.invoke_endpoint(
+            EndpointName=self.endpoint_name,
+            ContentType=self.content_type,
+            Accept=CONTENT_NPY if self.content_type == CONTENT_NPY else CONTENT_JSON,
+            Body=encode_batch(frame, self.content_type),
+        )
+        predictions = decode_predictions(response["Body"].read(), response.get("ContentType", CONTENT_JSON))
+        if len(predictions) != len(frame):
+            raise RuntimeError(f"Endpoint returned {len(predictions)} predictions for {len(frame)} instances")
+        return predictions
+
+    def predict_frame(self, frame: pd.DataFrame) -> List[float]:
+        """Score feature rows in order, split into concurrent requests."""
+        batches = self._batches(frame)
+        if not batches:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_in_flight, len(batches)))) as pool:
+            chunks = list(pool.map(lambda bounds: self._invoke(frame.iloc[bounds[0]:bounds[1]]), batches))
+        logger.debug("Scored %d rows in %d requests", len(frame), len(batches))
+        return [value for chunk in chunks for value in chunk]
+
+    def predict_many(self, payloads: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Predict every SKU's ``{"instances": ...}`` payload; returns ``{sku: {"predictions": [...]}}``."""
+        frames = {sku: _payload_to_frame(payload) for sku, payload in payloads.items()}
+        frames = {sku: frame for sku, frame in frames.items() if not frame.empty}
+        results: Dict[str, Dict[str, Any]] = {sku: {"predictions": []} for sku in payloads}
+        if not frames:
+            return results
+
+        columns = self.feature_order
+        for sku, frame in frames.items():
+            missing = [name for name in columns if name not in frame.columns]
+            if missing:
+                raise ValueError(f"Payload for {sku} is missing model features: {', '.join(missing)}")
+        spans: List[Tuple[str, int, int]] = []
+        offset = 0
+        for sku, frame in frames.items():
+            spans.append((sku, offset, offset + len(frame)))
+            offset += len(frame)
+        combined = pd.concat([frame.reindex(columns=columns) for frame in frames.values()], ignore_index=True)
+
+        predictions = self.predict_frame(combined)
+        logger.info("Forecast %d instances for %d SKUs", len(combined), len(frames))
+
+        for sku, start, end in spans:
+            results[sku] = {"predictions": predictions[start:end]}
+        return results
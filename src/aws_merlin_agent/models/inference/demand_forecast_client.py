@@ -2,27 +2,42 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
 
 from aws_merlin_agent.config.settings import EnvironmentSettings
-from aws_merlin_agent.models.inference.local_runner import LocalDemandForecaster
+from aws_merlin_agent.features.engineering import FORECAST_FEATURES
+from aws_merlin_agent.models.inference.batching_client import BatchingForecastClient
+from aws_merlin_agent.models.inference.horizon import forecast_horizon
+from aws_merlin_agent.models.inference.model_holder import ModelHolder, get_model_holder
+from aws_merlin_agent.models.inference.prediction_cache import PredictionCache, payload_fingerprint, prediction_cache
 from aws_merlin_agent.models.registry import latest_model
 from aws_merlin_agent.utils import aws
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
 
 
 class DemandForecastClient:
     """Lightweight wrapper around the SageMaker runtime API for demand forecasts."""
 
-    def __init__(self, endpoint_name: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        endpoint_name: Optional[str] = None,
+        cache: Optional[PredictionCache] = None,
+        batching: Optional[BatchingForecastClient] = None,
+    ) -> None:
         self.settings = EnvironmentSettings.load()
         self.mode = os.getenv("MERLIN_INFERENCE_MODE", "sagemaker")
+        self._batching = batching
+        # Repeat forecasts for unchanged rows are served from here while the active model is unchanged.
+        self.cache = cache or prediction_cache()
         env_endpoint = os.getenv("FORECAST_ENDPOINT_NAME")
         if self.mode == "local":
-            metadata = latest_model()
-            if metadata is None:
-                raise RuntimeError("No registered model found for local inference")
-            artifact = metadata["artifact_uri"]
-            self.local_runner = LocalDemandForecaster(artifact, self.settings.region)
+            # Shared per process; picks up newly registered runs in the background
+            self.local_runner: Optional[ModelHolder] = get_model_holder(self.settings.region)
             self.endpoint_name = None
             self.runtime = None
         else:
@@ -30,7 +45,33 @@ class DemandForecastClient:
             self.runtime = aws.client("sagemaker-runtime", region_name=self.settings.region)
             self.local_runner = None
 
+    def active_model_id(self) -> Optional[str]:
+        """Run id of the model currently answering requests, or None if it cannot be determined."""
+        if self.mode == "local":
+            return self.local_runner.model_id  # type: ignore[union-attr]
+        try:
+            metadata = latest_model()
+        except Exception as exc:  # registry unavailable: serve uncached
+            logger.warning("Could not resolve active model for prediction cache: %s", exc)
+            return None
+        return metadata["run_id"] if metadata else None
+
+    def _fingerprint(self, payload: Dict[str, Any]) -> str:
+        return payload_fingerprint({"target": self.endpoint_name or "local", "payload": payload})
+
     def predict(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        model_id = self.active_model_id() if self.cache.enabled else None
+        if model_id is None:
+            return self._predict_uncached(payload)
+        fingerprint = self._fingerprint(payload)
+        cached = self.cache.get(model_id, fingerprint)
+        if cached is not None:
+            return cached
+        response = self._predict_uncached(payload)
+        self.cache.put(response.get("model_id", model_id), fingerprint, response)
+        return response
+
+    def _predict_uncached(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         if self.mode == "local":
             return self.local_runner.predict(payload)  # type: ignore[union-attr]
         response = self.runtime.invoke_endpoint(  # type: ignore[union-attr]
@@ -39,3 +80,58 @@ class DemandForecastClient:
             Body=json.dumps(payload),
         )
         return json.loads(response["Body"].read().decode("utf-8"))
+
+    def predict_many(self, payloads: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Forecast many SKUs at once, coalescing their instances into as few requests as possible."""
+        model_id = self.active_model_id() if self.cache.enabled else None
+        if model_id is None:
+            return self._predict_many_uncached(payloads)
+        fingerprints = {sku: self._fingerprint(payload) for sku, payload in payloads.items()}
+        results: Dict[str, Dict[str, Any]] = {}
+        for sku, fingerprint in fingerprints.items():
+            cached = self.cache.get(model_id, fingerprint)
+            if cached is not None:
+                results[sku] = cached
+        misses = {sku: payload for sku, payload in payloads.items() if sku not in results}
+        if misses:
+            for sku, response in self._predict_many_uncached(misses).items():
+                self.cache.put(response.get("model_id", model_id), fingerprints[sku], response)
+                results[sku] = response
+        return {sku: results[sku] for sku in payloads}
+
+    def _predict_many_uncached(self, payloads: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        if self.mode == "local":
+            return {sku: self.local_runner.predict(payload) for sku, payload in payloads.items()}  # type: ignore[union-attr]
+        return self._batching_client().predict_many(payloads)
+
+    def predict_matrix(self, columns: Sequence[str], matrix: np.ndarray) -> np.ndarray:
+        """Score a feature array whose columns are named by ``columns``."""
+        if self.mode == "local":
+            return self.local_runner.predict_matrix(columns, matrix)  # type: ignore[union-attr]
+        frame = pd.DataFrame(matrix, columns=list(columns))
+        return np.asarray(self._batching_client().predict_frame(frame), dtype=np.float32)
+
+    def forecast_horizon(self, history: pd.DataFrame, horizon: int) -> Dict[str, Any]:
+        """Per-SKU daily forecasts for ``horizon`` days, one batched call per day across all SKUs."""
+        if self.mode == "local":
+            model_id = self.local_runner.model_id  # type: ignore[union-attr]
+            feature_names: List[str] = self.local_runner.forecaster.feature_names or FORECAST_FEATURES  # type: ignore[union-attr]
+        else:
+            model_id, feature_names = None, FORECAST_FEATURES
+        forecasts = forecast_horizon(history, horizon, self.predict_matrix, feature_names)
+        return {"horizon": horizon, "model_id": model_id, "forecasts": forecasts}
+
+    def explain_many(self, payloads: Dict[str, Dict[str, Any]], top_k: int = 3) -> Dict[str, Any]:
+        """
+        TreeSHAP drivers for each SKU's payload, computed locally in one booster call.
+
+        Endpoints only return predictions, so in SageMaker mode the registry's active artifact is
+        loaded into the shared local holder for explanations.
+        """
+        holder = self.local_runner or get_model_holder(self.settings.region)
+        return {"model_id": holder.model_id, "explanations": holder.forecaster.explain_many(payloads, top_k)}
+
+    def _batching_client(self) -> BatchingForecastClient:
+        if self._batching is None:
+            self._batching = BatchingForecastClient(self.endpoint_name, feature_order=FORECAST_FEATURES)
+        return self._batching
@@ -0,0 +1,67 @@
+"""
+Forecast explanations from XGBoost's native TreeSHAP (``pred_contribs``).
+
+Contributions for every instance of every SKU come from one booster call; per-SKU drivers are
+then reduced with ``np.add.reduceat`` over the stacked rows. ``format_drivers`` renders them as one
+short line per SKU so the LLM can explain a forecast from a few dozen tokens instead of the raw
+feature table.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+
+def _rank(mean_contributions: np.ndarray, feature_names: Sequence[str], top_k: int) -> List[Dict[str, Any]]:
+    order = np.argsort(-np.abs(mean_contributions), kind="stable")[:top_k]
+    return [
+        {
+            "feature": feature_names[idx],
+            "contribution": round(float(mean_contributions[idx]), 4),
+            "direction": "up" if mean_contributions[idx] >= 0 else "down",
+        }
+        for idx in order
+    ]
+
+
+def summarize_contributions(
+    contribs: np.ndarray,
+    feature_names: Sequence[str],
+    spans: Dict[str, tuple[int, int]],
+    top_k: int = 3,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Reduce a stacked ``pred_contribs`` result (features + bias column) to per-SKU explanations.
+
+    ``spans`` maps each SKU to its ``[start, end)`` rows. Each explanation carries the mean
+    baseline, the mean prediction (baseline + contributions) and the top drivers.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    live = [(sku, start, end) for sku, (start, end) in spans.items() if end > start]
+    if live:
+        starts = np.array([start for _, start, _ in live], dtype=np.intp)
+        counts = np.array([end - start for _, start, end in live], dtype=np.float64)[:, None]
+        means = np.add.reduceat(contribs, starts, axis=0) / counts
+        for (sku, _, _), row in zip(live, means):
+            features, bias = row[:-1], float(row[-1])
+            results[sku] = {
+                "baseline": round(bias, 4),
+                "prediction": round(bias + float(features.sum()), 4),
+                "top_drivers": _rank(features, feature_names, top_k),
+            }
+    for sku in spans:
+        results.setdefault(sku, {"baseline": None, "prediction": None, "top_drivers": []})
+    return {sku: results[sku] for sku in spans}
+
+
+def format_drivers(explanations: Dict[str, Dict[str, Any]]) -> str:
+    """``SKU-001: ~18.2 units/day; ad_spend +3.1, inventory_on_hand -1.4`` - one line per SKU."""
+    lines = []
+    for sku, explanation in explanations.items():
+        drivers = ", ".join(f"{d['feature']} {d['contribution']:+.1f}" for d in explanation["top_drivers"])
+        if explanation["prediction"] is None:
+            lines.append(f"{sku}: no data")
+        else:
+            lines.append(f"{sku}: ~{explanation['prediction']:.1f} units/day; {drivers}")
+    return "\n".join(lines)
@@ -0,0 +1,126 @@
+"""
+Vectorized multi-horizon demand forecasting.
+
+Instead of scoring one SKU and one day at a time, the state of every SKU (price, ad spend,
+inventory, trailing units) is held in NumPy arrays and the feature matrix for the next day is
+built for all SKUs at once. Each step is a single batched model call; its predictions feed the
+recursive features of the following day (inventory drawdown, the trailing 7-day units window that
+drives ``stockout_risk`` and the revenue/efficiency ratios), so a horizon of H days costs H calls
+regardless of the number of SKUs.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from aws_merlin_agent.features.engineering import FORECAST_FEATURES
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+ROLLING_WINDOW = 7
+
+# (columns, float32 matrix) -> one prediction per row
+MatrixPredictor = Callable[[List[str], np.ndarray], Sequence[float]]
+
+HISTORY_COLUMNS = ("sku", "date", "units_sold", "net_revenue", "ad_spend", "inventory_on_hand")
+
+
+def _trailing_units(history: pd.DataFrame, skus: List[str], window: int) -> np.ndarray:
+    """``(n_skus, window)`` matrix of the most recent units, right-aligned and NaN-padded."""
+    tail = history.groupby("sku", sort=False).tail(window)
+    offset = window - tail.groupby("sku", sort=False)["units_sold"].transform("size")
+    position = tail.groupby("sku", sort=False).cumcount() + offset
+    units = np.full((len(skus), window), np.nan, dtype=np.float64)
+    rows = pd.Index(skus).get_indexer(tail["sku"])
+    units[rows, position.to_numpy()] = tail["units_sold"].to_numpy(dtype=np.float64)
+    return units
+
+
+def forecast_horizon(
+    history: pd.DataFrame,
+    horizon: int,
+    predict: MatrixPredictor,
+    feature_names: Optional[Sequence[str]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Forecast ``horizon`` days for every SKU in ``history`` with one model call per day.
+
+    ``history`` holds daily rows with the ``HISTORY_COLUMNS``; ``predict`` scores a float32
+    matrix whose columns follow ``feature_names`` (the training feature order by default).
+    Returns ``{sku: [{"date": "YYYY-MM-DD", "units": float}, ...]}``.
+    """
+    if horizon < 1:
+        raise ValueError("horizon must be at least 1")
+    missing = [column for column in HISTORY_COLUMNS if column not in history.columns]
+    if missing:
+        raise ValueError(f"History is missing columns: {', '.join(missing)}")
+    columns = list(feature_names or FORECAST_FEATURES)
+    unknown = [name for name in columns if name not in FORECAST_FEATURES]
+    if unknown:
+        raise ValueError(f"Cannot project features: {', '.join(unknown)}")
+    if history.empty:
+        return {}
+
+    frame = history.copy()
+    frame["date"] = pd.to_datetime(frame["date"])
+    for column in HISTORY_COLUMNS[2:]:
+        frame[column] = pd.to_numeric(frame[column], errors="coerce").fillna(0.0)
+    frame = frame.sort_values(["sku", "date"], kind="stable")
+
+    grouped = frame.groupby("sku", sort=True)
+    totals = grouped[["units_sold", "net_revenue"]].sum()
+    last = grouped.tail(1).set_index("sku").loc[totals.index]
+    skus = list(totals.index)
+
+    # Per-SKU state, one array slot per SKU.
+    price = (totals["net_revenue"] / totals["units_sold"].clip(lower=1)).to_numpy(dtype=np.float64)
+    recent = grouped.tail(ROLLING_WINDOW).groupby("sku", sort=True)
+    ad_spend = recent["ad_spend"].mean().to_numpy(dtype=np.float64)
+    inventory = last["inventory_on_hand"].to_numpy(dtype=np.float64)
+    units = last["units_sold"].to_numpy(dtype=np.float64)
+    trailing = _trailing_units(frame, skus, ROLLING_WINDOW - 1)
+    lag = grouped.size().to_numpy(dtype=np.float64)
+    start = last["date"].to_numpy()
+
+    predictions = np.empty((len(skus), horizon), dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for step in range(horizon):
+            # The day's own units are unknown, so yesterday's (observed or predicted) value
+            # stands in for them in the ratio and rolling features.
+            net_revenue = price * units
+            features = {
+                "net_revenue": net_revenue,
+                "ad_spend": ad_spend,
+                "inventory_on_hand": inventory,
+                "revenue_per_unit": net_revenue / np.maximum(units, 1.0),
+                "ad_efficiency": np.where(ad_spend > 0, net_revenue / ad_spend, 0.0),
+                "stockout_risk": np.where(
+                    inventory > 0, (np.nansum(trailing, axis=1) + units) / inventory, 0.0
+                ),
+                "lag_days": lag + step,
+            }
+            matrix = np.empty((len(skus), len(columns)), dtype=np.float32)
+            for idx, name in enumerate(columns):
+                matrix[:, idx] = features[name]
+            predicted = np.maximum(np.asarray(predict(columns, matrix), dtype=np.float64).reshape(-1), 0.0)
+            if predicted.shape[0] != len(skus):
+                raise RuntimeError(f"Model returned {predicted.shape[0]} predictions for {len(skus)} SKUs")
+            predictions[:, step] = predicted
+
+            trailing = np.column_stack([trailing[:, 1:], predicted])
+            inventory = np.maximum(inventory - predicted, 0.0)
+            units = predicted
+
+    logger.info("Forecast %d days for %d SKUs in %d batched calls", horizon, len(skus), horizon)
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for row, sku in enumerate(skus):
+        first = pd.Timestamp(start[row])
+        results[sku] = [
+            {"date": (first + timedelta(days=step + 1)).strftime("%Y-%m-%d"), "units": float(predictions[row, step])}
+            for step in range(horizon)
+        ]
+    return results
@@ -1,59 +1,155 @@
 from __future__ import annotations
 
-import tempfile
+import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-import boto3
-import pandas as pd
-from xgboost import XGBRegressor
+import numpy as np
+from xgboost import DMatrix, XGBRegressor
 
+from aws_merlin_agent.models.artifacts import deserialize
+from aws_merlin_agent.models.inference.explanations import summarize_contributions
+from aws_merlin_agent.models.inference.model_cache import loaded_models
 from aws_merlin_agent.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-def _payload_to_frame(payload: Dict[str, Any]) -> pd.DataFrame:
-    instances = payload.get("instances")
-    if instances is None:
-        raise ValueError("Payload missing 'instances' key")
-    if isinstance(instances, dict):
-        return pd.DataFrame(instances)
-    if isinstance(instances, list):
-        return pd.DataFrame(instances)
-    raise ValueError("Unsupported payload shape; expected list[dict] or dict[str, list]")
+def _configured_nthread() -> Optional[int]:
+    env_threads = os.getenv("MERLIN_PREDICT_NTHREAD")
+    return int(env_threads) if env_threads else None
 
 
-def _parse_s3_uri(uri: str) -> tuple[str, str]:
-    if not uri.startswith("s3://"):
-        raise ValueError(f"Invalid S3 URI: {uri}")
-    without_scheme = uri[5:]
-    bucket, _, key = without_scheme.partition("/")
-    if not bucket or not key:
-        raise ValueError(f"Invalid S3 URI: {uri}")
-    return bucket, key
+def _set_nthread(model: XGBRegressor, nthread: Optional[int]) -> None:
+    # Only called before the model is handed out: the booster behind a URI is shared by every
+    # forecaster in the process (and the hot-swap holder), so it is never reconfigured afterwards.
+    if nthread:
+        model.get_booster().set_param({"nthread": nthread})
+
+
+def _read_model(path: Path, nthread: Optional[int] = None) -> XGBRegressor:
+    # Format is sniffed from the bytes, so ``model.json``, ``model.ubj`` and ``model.ubj.gz`` all load.
+    model = deserialize(Path(path).read_bytes())
+    _set_nthread(model, nthread if nthread is not None else _configured_nthread())
+    return model
 
 
 class LocalDemandForecaster:
-    """Loads an XGBoost regressor artifact from S3 and serves predictions locally."""
+    """Loads an XGBoost regressor artifact from S3 and serves predictions locally.
+
+    ``predict`` accepts ``{"instances": [...]}`` (row dicts or a dict of columns) and the columnar
+    ``{"columns": [...], "data": [[...], ...]}`` form. Either way the features are packed straight
+    into a contiguous float32 matrix in the booster's stored feature order and scored with
+    ``inplace_predict`` - no DataFrame is built. MERLIN_PREDICT_NTHREAD caps the threads per call;
+    it is applied once when the shared model is loaded. ``nthread`` only applies to a model the
+    caller owns (``model=`` or ``from_path``).
+    ``explain``/``explain_many`` return per-feature TreeSHAP contributions for the same payloads.
+    """
 
-    def __init__(self, artifact_uri: str, region: str) -> None:
+    def __init__(
+        self,
+        artifact_uri: str,
+        region: str,
+        nthread: Optional[int] = None,
+        model: Optional[XGBRegressor] = None,
+        version: Optional[str] = None,
+    ) -> None:
         self.artifact_uri = artifact_uri
         self.region = region
-        self.model = self._load_model()
+        self.version = version
+        if model is None:
+            if nthread is not None:
+                raise ValueError("nthread applies to a model passed in; set MERLIN_PREDICT_NTHREAD for shared models")
+            model = self._load_model()
+        else:
+            _set_nthread(model, nthread)
+        self.model = model
+        self.booster = self.model.get_booster()
+        self.feature_names: Optional[List[str]] = self.booster.feature_names
+        # Column layout -> positions of the model's features, validated once per distinct layout.
+        self._layouts: Dict[Tuple[str, ...], np.ndarray] = {}
+
+    @classmethod
+    def from_path(cls, path: Path, nthread: Optional[int] = None) -> "LocalDemandForecaster":
+        """Serve a model file that is already on local disk (benchmarks, offline tools)."""
+        return cls(str(path), region="", model=_read_model(Path(path), nthread))
 
     def _load_model(self) -> XGBRegressor:
-        bucket, key = _parse_s3_uri(self.artifact_uri)
-        s3 = boto3.client("s3", region_name=self.region)
-        with tempfile.TemporaryDirectory() as tmpdir:
-            local_path = Path(tmpdir) / "model.json"
-            s3.download_file(bucket, key, str(local_path))
-            model = XGBRegressor()
-            model.load_model(str(local_path))
-            logger.info("Loaded local model from %s", self.artifact_uri)
-            return model
+        # Shared across instances: warm callers reuse the parsed model, and the artifact is only
+        # re-downloaded when its S3 ETag changes.
+        return loaded_models().get(self.artifact_uri, _read_model, region=self.region, version=self.version)
+
+    def _layout(self, columns: Sequence[str]) -> np.ndarray:
+        key = tuple(columns)
+        positions = self._layouts.get(key)
+        if positions is None:
+            if self.feature_names is None:
+                positions = np.arange(len(key))
+            else:
+                index = {name: idx for idx, name in enumerate(key)}
+                missing = [name for name in self.feature_names if name not in index]
+                if missing:
+                    raise ValueError(f"Payload is missing model features: {', '.join(missing)}")
+                positions = np.array([index[name] for name in self.feature_names], dtype=np.intp)
+            self._layouts[key] = positions
+        return positions
+
+    def to_matrix(self, payload: Dict[str, Any]) -> np.ndarray:
+        """Pack a payload into a C-contiguous float32 matrix ordered like the model's features."""
+        if "columns" in payload and "data" in payload:
+            columns = list(payload["columns"])
+            data = np.asarray(payload["data"], dtype=np.float32).reshape(-1, len(columns))
+            return np.ascontiguousarray(data[:, self._layout(columns)])
+
+        instances = payload.get("instances")
+        if instances is None:
+            raise ValueError("Payload missing 'instances' key")
+        if isinstance(instances, dict):
+            columns = list(instances)
+            positions = self._layout(columns)
+            return np.column_stack([np.asarray(instances[columns[pos]], dtype=np.float32) for pos in positions])
+        if isinstance(instances, list):
+            if not instances:
+                return np.empty((0, len(self.feature_names or [])), dtype=np.float32)
+            columns = list(instances[0])
+            positions = self._layout(columns)
+            ordered = [columns[pos] for pos in positions]
+            return np.array([[row.get(name, np.nan) for name in ordered] for row in instances], dtype=np.float32)
+        raise ValueError("Unsupported payload shape; expected list[dict] or dict[str, list]")
+
+    def predict_matrix(self, columns: Sequence[str], matrix: np.ndarray) -> np.ndarray:
+        """Score a ``(rows, len(columns))`` array directly; returns a 1-D prediction array."""
+        data = np.asarray(matrix, dtype=np.float32)
+        if data.shape[0] == 0:
+            return np.empty(0, dtype=np.float32)
+        return self.booster.inplace_predict(
+            np.ascontiguousarray(data[:, self._layout(columns)]), validate_features=False
+        )
 
     def predict(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        frame = _payload_to_frame(payload)
-        predictions = self.model.predict(frame)
+        matrix = self.to_matrix(payload)
+        if matrix.shape[0] == 0:
+            return {"predictions": []}
+        predictions = self.booster.inplace_predict(matrix, validate_features=False)
         return {"predictions": predictions.tolist()}
+
+    def explain(self, payload: Dict[str, Any], top_k: int = 3) -> Dict[str, Any]:
+        """Mean TreeSHAP contributions over the payload's instances and its ``top_k`` drivers."""
+        return self.explain_many({"_": payload}, top_k)["_"]
+
+    def explain_many(self, payloads: Dict[str, Dict[str, Any]], top_k: int = 3) -> Dict[str, Dict[str, Any]]:
+        """Explain many SKUs with a single ``pred_contribs`` call over all of their instances."""
+        matrices = {sku: self.to_matrix(payload) for sku, payload in payloads.items()}
+        spans: Dict[str, Tuple[int, int]] = {}
+        offset = 0
+        for sku, matrix in matrices.items():
+            spans[sku] = (offset, offset + matrix.shape[0])
+            offset += matrix.shape[0]
+        names = list(self.feature_names or [f"f{idx}" for idx in range(self.booster.num_features())])
+        if offset == 0:
+            return summarize_contributions(np.empty((0, len(names) + 1)), names, spans, top_k)
+        stacked = np.concatenate([matrix for matrix in matrices.values() if matrix.shape[0]], axis=0)
+        contribs = self.booster.predict(
+            DMatrix(stacked, feature_names=self.feature_names), pred_contribs=True, validate_features=False
+        )
+        return summarize_contributions(contribs, names, spans, top_k)
@@ -0,0 +1,142 @@
+"""
+Persistent model artifact cache.
+
+Artifacts are downloaded once into MERLIN_MODEL_CACHE_DIR (``/tmp/merlin-models`` by default, which
+survives warm Lambda invocations) under a name derived from the artifact URI and its S3 ETag, and
+re-downloaded only when the ETag changes. Parsed models are held in a process-wide map so warm
+callers skip both the download and the parse; the ETag is re-checked at most every
+MERLIN_MODEL_CACHE_TTL_S seconds, or immediately when a caller asks for a different registry
+``version`` (run id) of the same URI.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from aws_merlin_agent.utils import aws
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL_S = 300.0
+
+
+def default_cache_dir() -> Path:
+    return Path(os.getenv("MERLIN_MODEL_CACHE_DIR", Path(tempfile.gettempdir()) / "merlin-models"))
+
+
+def parse_s3_uri(uri: str) -> tuple[str, str]:
+    if not uri.startswith("s3://"):
+        raise ValueError(f"Invalid S3 URI: {uri}")
+    without_scheme = uri[5:]
+    bucket, _, key = without_scheme.partition("/")
+    if not bucket or not key:
+        raise ValueError(f"Invalid S3 URI: {uri}")
+    return bucket, key
+
+
+class ArtifactCache:
+    """On-disk artifact store keyed by (artifact URI, ETag)."""
+
+    def __init__(self, directory: Optional[Path] = None, region: Optional[str] = None) -> None:
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.region = region
+
+    @property
+    def _s3(self):
+        return aws.client("s3", region_name=self.region)
+
+    def _slot(self, artifact_uri: str) -> Path:
+        return self.directory / hashlib.sha256(artifact_uri.encode("utf-8")).hexdigest()[:24]
+
+    def etag(self, artifact_uri: str) -> str:
+        bucket, key = parse_s3_uri(artifact_uri)
+        return self._s3.head_object(Bucket=bucket, Key=key)["ETag"].strip('"')
+
+    def fetch(self, artifact_uri: str, etag: Optional[str] = None) -> Path:
+        """Return a local copy of ``artifact_uri``, downloading only if this ETag is not cached."""
+        etag = etag or self.etag(artifact_uri)
+        slot = self._slot(artifact_uri)
+        local_path = slot / f"{etag}{''.join(Path(artifact_uri).suffixes)}"
+        if local_path.exists():
+            logger.debug("Model cache hit for %s (%s)", artifact_uri, etag)
+            return local_path
+
+        slot.mkdir(parents=True, exist_ok=True)
+        bucket, key = parse_s3_uri(artifact_uri)
+        # Download beside the target and rename so concurrent readers never see a partial file.
+        fd, tmp_name = tempfile.mkstemp(dir=slot, suffix=".part")
+        os.close(fd)
+        try:
+            self._s3.download_file(bucket, key, tmp_name)
+            os.replace(tmp_name, local_path)
+        finally:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+        for stale in slot.iterdir():
+            if stale != local_path and not stale.name.endswith(".part"):
+                stale.unlink(missing_ok=True)
+        logger.info("Cached model artifact %s (%s)", artifact_uri, etag)
+        return local_path
+
+
+class LoadedModels:
+    """Process-wide map of parsed models keyed by artifact URI, revalidated by ETag."""
+
+    def __init__(self, ttl_s: Optional[float] = None, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_s = float(os.getenv("MERLIN_MODEL_CACHE_TTL_S", DEFAULT_TTL_S)) if ttl_s is None else ttl_s
+        self._clock = clock
+        # uri -> (etag, model, checked_at, version)
+        self._models: Dict[str, Tuple[str, Any, float, Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        artifact_uri: str,
+        loader: Callable[[Path], Any],
+        region: Optional[str] = None,
+        cache: Optional[ArtifactCache] = None,
+        version: Optional[str] = None,
+    ) -> Any:
+        """
+        Parsed model for ``artifact_uri``.
+
+        ``version`` identifies the registry run the caller resolved; a run the cache has not seen
+        for this URI skips the TTL and revalidates the ETag, so a run re-published at the same key
+        is never answered with the previous run's model.
+        """
+        with self._lock:
+            entry = self._models.get(artifact_uri)
+            now = self._clock()
+            same_version = entry is not None and (version is None or entry[3] == version)
+            if same_version and now - entry[2] < self.ttl_s:
+                return entry[1]
+
+            cache = cache or ArtifactCache(region=region)
+            etag = cache.etag(artifact_uri)
+            version = version if version is not None else (entry[3] if entry else None)
+            if entry is not None and entry[0] == etag:
+                self._models[artifact_uri] = (etag, entry[1], now, version)
+                return entry[1]
+
+            model = loader(cache.fetch(artifact_uri, etag))
+            self._models[artifact_uri] = (etag, model, now, version)
+            logger.info("Loaded model %s (%s)", artifact_uri, etag)
+            return model
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+_LOADED = LoadedModels()
+
+
+def loaded_models() -> LoadedModels:
+    """Return the process-wide loaded-model map."""
+    return _LOADED
@@ -0,0 +1,124 @@
+"""
+Hot-swappable local model.
+
+``ModelHolder`` resolves the active run from the registry, loads it, and then polls the registry
+from a daemon thread every MERLIN_MODEL_REFRESH_S seconds. A newer run is downloaded and parsed on
+that thread and swapped in with a single reference assignment, so requests never wait on a load
+and in-flight predictions finish on the model they started with.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from aws_merlin_agent.models.inference.local_runner import LocalDemandForecaster
+from aws_merlin_agent.models.registry import latest_model
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_REFRESH_S = 300.0
+
+
+class ModelHolder:
+    """Owns the active ``LocalDemandForecaster`` for one model type and keeps it current."""
+
+    def __init__(
+        self,
+        region: str,
+        model_type: str = "demand_forecast",
+        refresh_interval_s: Optional[float] = None,
+        start: bool = True,
+    ) -> None:
+        self.region = region
+        self.model_type = model_type
+        self.refresh_interval_s = (
+            float(os.getenv("MERLIN_MODEL_REFRESH_S", DEFAULT_REFRESH_S))
+            if refresh_interval_s is None
+            else refresh_interval_s
+        )
+        self._active: Optional[Tuple[str, LocalDemandForecaster]] = None
+        self._swap_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if not self.refresh():
+            raise RuntimeError("No registered model found for local inference")
+        if start and self.refresh_interval_s > 0:
+            self._thread = threading.Thread(target=self._poll, name=f"model-refresh-{model_type}", daemon=True)
+            self._thread.start()
+
+    @property
+    def model_id(self) -> Optional[str]:
+        active = self._active
+        return active[0] if active else None
+
+    @property
+    def forecaster(self) -> LocalDemandForecaster:
+        active = self._active
+        if active is None:
+            raise RuntimeError("No model loaded")
+        return active[1]
+
+    def refresh(self) -> bool:
+        """Load the registry's active run if it differs from the current one; True if a model is active."""
+        metadata = latest_model(self.model_type, use_cache=False)
+        if metadata is None:
+            return self._active is not None
+        run_id = metadata["run_id"]
+        if run_id == self.model_id:
+            return True
+        # Loading happens outside the lock; only the reference swap is serialized.
+        # Keyed by run id so a run re-published at an existing key is reloaded, not served from cache.
+        forecaster = LocalDemandForecaster(metadata["artifact_uri"], self.region, version=run_id)
+        with self._swap_lock:
+            previous = self.model_id
+            self._active = (run_id, forecaster)
+        if previous:
+            logger.info("Swapped %s model %s -> %s", self.model_type, previous, run_id)
+        return True
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.refresh_interval_s):
+            try:
+                self.refresh()
+            except Exception as exc:  # keep serving the current model
+                logger.warning("Model refresh for %s failed: %s", self.model_type, exc)
+
+    def predict(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        run_id, forecaster = self._active  # type: ignore[misc]
+        result = forecaster.predict(payload)
+        result["model_id"] = run_id
+        return result
+
+    def predict_matrix(self, columns: Sequence[str], matrix: np.ndarray) -> np.ndarray:
+        return self.forecaster.predict_matrix(columns, matrix)
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+
+_holders: Dict[Tuple[str, str], ModelHolder] = {}
+_holders_lock = threading.Lock()
+
+
+def get_model_holder(region: str, model_type: str = "demand_forecast") -> ModelHolder:
+    """Return the process-wide holder (and refresh thread) for ``model_type``."""
+    with _holders_lock:
+        holder = _holders.get((region, model_type))
+        if holder is None:
+            holder = ModelHolder(region, model_type)
+            _holders[(region, model_type)] = holder
+        return holder
+
+
+def reset_holders() -> None:
+    """Stop every refresh thread and forget the holders."""
+    with _holders_lock:
+        for holder in _holders.values():
+            holder.close()
+        _holders.clear()
@@ -0,0 +1,218 @@
+"""
+Prediction cache for demand forecasts.
+
+Responses are keyed by the active model id plus a SHA-256 of the canonical feature payload (sorted
+keys, compact separators), so a repeat question about unchanged rows is answered without touching
+SageMaker or XGBoost. Entries live in a process-local LRU of MERLIN_PREDICTION_CACHE_SIZE entries
+(0 disables caching) and can additionally be shared between processes through a local directory
+(MERLIN_PREDICTION_CACHE_DIR) or the curated bucket (MERLIN_PREDICTION_CACHE_S3=1). Shared entries
+sit under the model id, and the local LRU is emptied whenever the active model changes, so a newly
+registered model never serves predictions from its predecessor.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+from botocore.exceptions import ClientError
+
+from aws_merlin_agent.config.settings import EnvironmentSettings
+from aws_merlin_agent.utils import aws
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_ENTRIES = 1024
+SHARED_PREFIX = "prediction-cache"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def payload_fingerprint(payload: Dict[str, Any]) -> str:
+    """Stable hash of a feature payload; dict key order does not matter."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=_json_default)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SharedPredictionStore:
+    """Cross-process backing store for cached responses."""
+
+    def get(self, model_id: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def put(self, model_id: str, fingerprint: str, response: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class LocalPredictionStore(SharedPredictionStore):
+    """One JSON file per entry under ``root/<model_id>/``."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def _path(self, model_id: str, fingerprint: str) -> Path:
+        return self.root / model_id / f"{fingerprint}.json"
+
+    def get(self, model_id: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        path = self._path(model_id, fingerprint)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def put(self, model_id: str, fingerprint: str, response: Dict[str, Any]) -> None:
+        path = self._path(model_id, fingerprint)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".part")
+        tmp.write_text(json.dumps(response, default=_json_default))
+        os.replace(tmp, path)
+
+
+class S3PredictionStore(SharedPredictionStore):
+    """Entries at ``s3://<bucket>/prediction-cache/<model_id>/<fingerprint>.json``."""
+
+    def __init__(self, bucket: str, region: Optional[str] = None, prefix: str = SHARED_PREFIX) -> None:
+        self.bucket = bucket
+        self.region = region
+        self.prefix = prefix.rstrip("/")
+
+    @property
+    def _s3(self):
+        return aws.client("s3", region_name=self.region)
+
+    def _key(self, model_id: str, fingerprint: str) -> str:
+        return f"{self.prefix}/{model_id}/{fingerprint}.json"
+
+    def get(self, model_id: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        try:
+            response = self._s3.get_object(Bucket=self.bucket, Key=self._key(model_id, fingerprint))
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return None
+            raise
+        return json.loads(response["Body"].read())
+
+    def put(self, model_id: str, fingerprint: str, response: Dict[str, Any]) -> None:
+        self._s3.put_object(
+            Bucket=self.bucket,
+            Key=self._key(model_id, fingerprint),
+            Body=json.dumps(response, default=_json_default).encode("utf-8"),
+            ContentType="application/json",
+        )
+
+
+def default_shared_store(settings: Optional[EnvironmentSettings] = None) -> Optional[SharedPredictionStore]:
+    """Local directory when MERLIN_PREDICTION_CACHE_DIR is set, S3 when MERLIN_PREDICTION_CACHE_S3=1."""
+    directory = os.getenv("MERLIN_PREDICTION_CACHE_DIR")
+    if directory:
+        return LocalPredictionStore(Path(directory))
+    if os.getenv("MERLIN_PREDICTION_CACHE_S3", "").lower() in ("1", "true", "yes"):
+        settings = settings or EnvironmentSettings.load()
+        return S3PredictionStore(settings.curated_bucket, settings.region)
+    return None
+
+
+class PredictionCache:
+    """LRU of forecast responses keyed by (model id, payload fingerprint)."""
+
+    def __init__(self, max_entries: Optional[int] = None, shared: Optional[SharedPredictionStore] = None) -> None:
+        self.max_entries = (
+            int(os.getenv("MERLIN_PREDICTION_CACHE_SIZE", DEFAULT_MAX_ENTRIES)) if max_entries is None else max_entries
+        )
+        self.shared = shared
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._model_id: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _bind(self, model_id: str) -> None:
+        # Called with the lock held; a different active model makes every local entry stale.
+        if model_id != self._model_id:
+            if self._model_id is not None:
+                logger.info("Active model changed %s -> %s; clearing prediction cache", self._model_id, model_id)
+            self._entries.clear()
+            self._model_id = model_id
+
+    def get(self, model_id: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._bind(model_id)
+            response = self._entries.get(fingerprint)
+            if response is not None:
+                self._entries.move_to_end(fingerprint)
+                self.hits += 1
+                return copy.deepcopy(response)
+        if self.shared is not None:
+            try:
+                response = self.shared.get(model_id, fingerprint)
+            except Exception as exc:  # the shared tier is best effort
+                logger.warning("Shared prediction cache read failed: %s", exc)
+                response = None
+            if response is not None:
+                self._remember(model_id, fingerprint, response)
+                with self._lock:
+                    self.hits += 1
+                return copy.deepcopy(response)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, model_id: str, fingerprint: str, response: Dict[str, Any]) -> None:
+        self._remember(model_id, fingerprint, response)
+        if self.shared is not None:
+            try:
+                self.shared.put(model_id, fingerprint, response)
+            except Exception as exc:
+                logger.warning("Shared prediction cache write failed: %s", exc)
+
+    def _remember(self, model_id: str, fingerprint: str, response: Dict[str, Any]) -> None:
+        with self._lock:
+            self._bind(model_id)
+            self._entries[fingerprint] = copy.deepcopy(response)
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._model_id = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_CACHE: Optional[PredictionCache] = None
+_cache_lock = threading.Lock()
+
+
+def prediction_cache() -> PredictionCache:
+    """Return the process-wide prediction cache, created on first use."""
+    global _CACHE
+    with _cache_lock:
+        if _CACHE is None:
+            _CACHE = PredictionCache(shared=default_shared_store())
+        return _CACHE
+
+
+def reset_prediction_cache() -> None:
+    """Forget the process-wide cache so the next call re-reads its configuration."""
+    global _CACHE
+    with _cache_lock:
+        _CACHE = None
@@ -1,25 +1,49 @@
 from __future__ import annotations
 
+import argparse
+import os
+import sys
+import threading
+import time
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from uuid import uuid4
 
-from boto3.dynamodb.conditions import Attr
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
 
 from aws_merlin_agent.config.settings import EnvironmentSettings
 from aws_merlin_agent.utils import aws, logging
 
 logger = logging.get_logger(__name__)
 
+MODEL_INDEX = "model_type-created_at-index"
+CHAMPION_PREFIX = "champion#"
+DEFAULT_CACHE_TTL_S = 60.0
+ENDPOINT_ARTIFACT_SUFFIX = ".json"
 
-def register_model(artifact_uri: str, metrics: Dict[str, float], model_type: str = "demand_forecast") -> str:
-    """Persist model metadata to the runs DynamoDB table and return the model identifier."""
-    settings = EnvironmentSettings.load()
-    dynamodb = aws.resource("dynamodb", region_name=settings.region)
-    table = dynamodb.Table(settings.dynamodb_table_runs)
+# model_type -> (fetched_at, metadata)
+_latest_cache: Dict[str, Tuple[float, Optional[Dict]]] = {}
+_cache_lock = threading.Lock()
+
+
+def register_model(
+    artifact_uri: str,
+    metrics: Dict[str, float],
+    model_type: str = "demand_forecast",
+    attributes: Optional[Dict[str, Any]] = None,
+    run_id: Optional[str] = None,
+) -> str:
+    """
+    Persist model metadata to the runs DynamoDB table and return the model identifier.
+
+    ``attributes`` are stored as extra top-level fields (e.g. the training data watermark).
+    ``run_id`` lets a caller that already published the artifact under its run id reuse it.
+    """
+    table = _runs_table()
 
-    model_id = str(uuid4())
+    model_id = run_id or str(uuid4())
     safe_metrics: Dict[str, Decimal] = {}
     for key, value in metrics.items():
         try:
@@ -39,18 +63,147 @@ def register_model(artifact_uri: str, metrics: Dict[str, float], model_type: str
         "metrics": safe_metrics,
         "created_at": datetime.utcnow().isoformat(),
     }
+    for key, value in (attributes or {}).items():
+        if key in item:
+            raise ValueError(f"Attribute {key} is reserved")
+        if value is not None:
+            item[key] = value
     table.put_item(Item=item)
+    invalidate_cache(model_type)
     logger.info("Registered model %s with metrics %s", model_id, metrics)
     return model_id
 
 
-def latest_model(model_type: str = "demand_forecast") -> Optional[Dict]:
-    """Fetch the most recent model metadata for the given type."""
+def _runs_table():
     settings = EnvironmentSettings.load()
-    dynamodb = aws.resource("dynamodb", region_name=settings.region)
-    table = dynamodb.Table(settings.dynamodb_table_runs)
-    response = table.scan(FilterExpression=Attr("model_type").eq(model_type))
+    return aws.resource("dynamodb", region_name=settings.region).Table(settings.dynamodb_table_runs)
+
+
+def _champion_key(model_type: str) -> str:
+    return f"{CHAMPION_PREFIX}{model_type}"
+
+
+def invalidate_cache(model_type: Optional[str] = None) -> None:
+    """Drop cached lookups for ``model_type`` (or all types)."""
+    with _cache_lock:
+        if model_type is None:
+            _latest_cache.clear()
+        else:
+            _latest_cache.pop(model_type, None)
+
+
+def set_champion(run_id: str, model_type: str = "demand_forecast") -> Dict:
+    """Pin ``run_id`` as the active model for ``model_type``; returns the pinned metadata."""
+    table = _runs_table()
+    item = table.get_item(Key={"run_id": run_id}).get("Item")
+    if item is None or item.get("model_type") != model_type:
+        raise ValueError(f"No {model_type} model registered with run_id {run_id}")
+    # The pointer carries a copy of the metadata so resolving it is a single read. It deliberately
+    # has no model_type attribute, which keeps it out of the model_type/created_at index.
+    table.put_item(
+        Item={
+            "run_id": _champion_key(model_type),
+            "champion_of": model_type,
+            "model": item,
+            "pinned_at": datetime.utcnow().isoformat(),
+        }
+    )
+    invalidate_cache(model_type)
+    logger.info("Pinned %s as %s champion", run_id, model_type)
+    return item
+
+
+def clear_champion(model_type: str = "demand_forecast") -> None:
+    """Remove the champion pointer so the newest registered model is active again."""
+    _runs_table().delete_item(Key={"run_id": _champion_key(model_type)})
+    invalidate_cache(model_type)
+
+
+def _latest_by_index(table, model_type: str) -> Optional[Dict]:
+    response = table.query(
+        IndexName=MODEL_INDEX,
+        KeyConditionExpression=Key("model_type").eq(model_type),
+        ScanIndexForward=False,
+        Limit=1,
+    )
     items = response.get("Items", [])
-    if not items:
-        return None
-    return max(items, key=lambda item: item.get("created_at", ""))
+    return items[0] if items else None
+
+
+def _latest_by_scan(table, model_type: str) -> Optional[Dict]:
+    latest: Optional[Dict] = None
+    kwargs: Dict = {"FilterExpression": Attr("model_type").eq(model_type)}
+    while True:
+        response = table.scan(**kwargs)
+        for item in response.get("Items", []):
+            if latest is None or item.get("created_at", "") > latest.get("created_at", ""):
+                latest = item
+        if "LastEvaluatedKey" not in response:
+            return latest
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def _newest(table, model_type: str) -> Optional[Dict]:
+    try:
+        return _latest_by_index(table, model_type)
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") not in ("ValidationException", "ResourceNotFoundException"):
+            raise
+        logger.warning("Runs table has no %s index; falling back to a full scan", MODEL_INDEX)
+        return _latest_by_scan(table, model_type)
+
+
+def newest_model(model_type: str = "demand_forecast") -> Optional[Dict]:
+    """Fetch the most recently registered run for the given type, ignoring any champion pin (uncached)."""
+    return _newest(_runs_table(), model_type)
+
+
+def latest_model(model_type: str = "demand_forecast", use_cache: bool = True) -> Optional[Dict]:
+    """
+    Fetch the active model metadata for the given type.
+
+    A pinned champion wins; otherwise the newest run is read from the ``model_type``/``created_at``
+    index with ``Limit=1``. Tables deployed before the index existed fall back to a paginated scan.
+    Results are cached for MERLIN_REGISTRY_CACHE_TTL_S seconds (default 60).
+    """
+    ttl_s = float(os.getenv("MERLIN_REGISTRY_CACHE_TTL_S", DEFAULT_CACHE_TTL_S))
+    now = time.monotonic()
+    if use_cache:
+        with _cache_lock:
+            cached = _latest_cache.get(model_type)
+        if cached is not None and now - cached[0] < ttl_s:
+            return cached[1]
+
+    table = _runs_table()
+    champion = table.get_item(Key={"run_id": _champion_key(model_type)}).get("Item")
+    model = champion["model"] if champion is not None else _newest(table, model_type)
+
+    with _cache_lock:
+        _latest_cache[model_type] = (now, model)
+    return model
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect the MERLIN model registry.")
+    parser.add_argument(
+        "command",
+        choices=["artifact-uri"],
+        help="artifact-uri: print the active model's artifact URI for a SageMaker deploy (JSON artifacts only)",
+    )
+    parser.add_argument("--model-type", default="demand_forecast")
+    args = parser.parse_args()
+    model = latest_model(args.model_type, use_cache=False)
+    if model is None:
+        sys.exit(f"No {args.model_type} model registered")
+    artifact_uri = model["artifact_uri"]
+    # The URI is handed to the SageMaker XGBoost container, which cannot read UBJSON or gzip.
+    if not artifact_uri.endswith(ENDPOINT_ARTIFACT_SUFFIX):
+        sys.exit(
+            f"Active model {model['run_id']} is published as {artifact_uri}, which the SageMaker endpoint "
+            "cannot serve; train it with MERLIN_MODEL_FORMAT=json MERLIN_MODEL_COMPRESSION=none"
+        )
+    print(artifact_uri)
+
+
+if __name__ == "__main__":
+    main()
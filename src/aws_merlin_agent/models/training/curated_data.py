@@ -0,0 +1,290 @@
+"""
+Curated sales dataset access for training.
+
+The Glue job writes ``sales_fact/`` as Hive-style ``sale_date=YYYY-MM-DD`` Parquet partitions. It
+is opened here as a ``pyarrow.dataset``: partitions outside the requested date window are pruned
+from the directory names before any file is opened, only the requested columns are decoded, and
+fragments are scanned on Arrow's thread pool with pre-buffered (coalesced) range reads, streaming
+record batches instead of downloading and concatenating whole files.
+
+S3 is read with Arrow's native (C++) client, so range reads and decoding never go through Python.
+A read-only boto3-backed Arrow filesystem is kept as the fallback for setups only boto3 understands:
+a custom endpoint (AWS_ENDPOINT_URL_S3 / AWS_ENDPOINT_URL, e.g. LocalStack), botocore-level test
+doubles, or an Arrow build without S3 support. MERLIN_ARROW_S3=boto3 forces it.
+"""
+from __future__ import annotations
+
+import io
+import os
+from datetime import date
+from typing import Iterator, List, Optional, Sequence, Union
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+from botocore.exceptions import ClientError
+
+from aws_merlin_agent.utils import aws
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+SALES_PREFIX = "sales_fact"
+PARTITION_COLUMN = "sale_date"
+TRAINING_COLUMNS = [
+    "seller_id",
+    "sku",
+    "date",
+    "units_sold",
+    "net_revenue_usd",
+    "ad_spend_usd",
+    "inventory_on_hand",
+    PARTITION_COLUMN,
+]
+# Curated column names -> the names ``build_feature_frame`` expects.
+FEATURE_RENAMES = {"net_revenue_usd": "net_revenue", "ad_spend_usd": "ad_spend"}
+DEFAULT_BATCH_SIZE = 64 * 1024
+
+DateLike = Union[str, date]
+
+
+class S3RangeFile(io.RawIOBase):
+    """Seekable read-only view of one S3 object; every read is a ranged GET."""
+
+    def __init__(self, client, bucket: str, key: str, size: int) -> None:
+        self._client = client
+        self.bucket = bucket
+        self.key = key
+        self.size = size
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self.size}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        end = self.size if size is None or size < 0 else min(self.size, self._pos + size)
+        if end <= self._pos:
+            return b""
+        response = self._client.get_object(Bucket=self.bucket, Key=self.key, Range=f"bytes={self._pos}-{end - 1}")
+        data = response["Body"].read()
+        self._pos += len(data)
+        return data
+
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+class BotoS3Handler(pafs.FileSystemHandler):
+    """Read-only Arrow filesystem over boto3; paths are ``bucket/key``."""
+
+    def __init__(self, region: Optional[str] = None) -> None:
+        self.region = region
+
+    @property
+    def _s3(self):
+        return aws.client("s3", region_name=self.region, max_pool_connections=32)
+
+    @staticmethod
+    def _split(path: str) -> tuple[str, str]:
+        bucket, _, key = path.strip("/").partition("/")
+        return bucket, key
+
+    def get_type_name(self) -> str:
+        return "merlin-boto3-s3"
+
+    def equals(self, other) -> bool:
+        return isinstance(other, BotoS3Handler) and other.region == self.region
+
+    def normalize_path(self, path: str) -> str:
+        return path.strip("/")
+
+    def _info(self, path: str) -> pafs.FileInfo:
+        bucket, key = self._split(path)
+        if key:
+            try:
+                head = self._s3.head_object(Bucket=bucket, Key=key)
+                return pafs.FileInfo(path, pafs.FileType.File, size=head["ContentLength"], mtime=head["LastModified"])
+            except ClientError as exc:
+                if exc.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey", "NotFound"):
+                    raise
+        prefix = f"{key.rstrip('/')}/" if key else ""
+        listing = self._s3.list_objects_v2(Bucket=bucket, Prefix=prefix, MaxKeys=1)
+        if listing.get("KeyCount", 0) or not key:
+            return pafs.FileInfo(path, pafs.FileType.Directory)
+        return pafs.FileInfo(path, pafs.FileType.NotFound)
+
+    def get_file_info(self, paths: List[str]) -> List[pafs.FileInfo]:
+        return [self._info(path) for path in paths]
+
+    def get_file_info_selector(self, selector: pafs.FileSelector) -> List[pafs.FileInfo]:
+        bucket, key = self._split(selector.base_dir)
+        prefix = f"{key.rstrip('/')}/" if key else ""
+        kwargs = {"Bucket": bucket, "Prefix": prefix}
+        if not selector.recursive:
+            kwargs["Delimiter"] = "/"
+        infos: List[pafs.FileInfo] = []
+        directories = set()
+        for page in self._s3.get_paginator("list_objects_v2").paginate(**kwargs):
+            for common in page.get("CommonPrefixes", []):
+                directories.add(common["Prefix"].rstrip("/"))
+            for obj in page.get("Contents", []):
+                if obj["Key"].endswith("/"):
+                    continue
+                infos.append(
+                    pafs.FileInfo(
+                        f"{bucket}/{obj['Key']}", pafs.FileType.File, size=obj["Size"], mtime=obj["LastModified"]
+                    )
+                )
+                if selector.recursive:
+                    parent = obj["Key"][len(prefix):].rpartition("/")[0]
+                    while parent:
+                        directories.add(f"{prefix}{parent}")
+                        parent = parent.rpartition("/")[0]
+        if not infos and not directories and not selector.allow_not_found:
+            if self._info(selector.base_dir).type == pafs.FileType.NotFound:
+                raise FileNotFoundError(f"s3://{selector.base_dir}")
+        infos.extend(pafs.FileInfo(f"{bucket}/{name}", pafs.FileType.Directory) for name in sorted(directories))
+        return infos
+
+    def open_input_file(self, path: str):
+        bucket, key = self._split(path)
+        size = self._s3.head_object(Bucket=bucket, Key=key)["ContentLength"]
+        return pa.PythonFile(S3RangeFile(self._s3, bucket, key, size), mode="r")
+
+    def open_input_stream(self, path: str):
+        return self.open_input_file(path)
+
+    def _read_only(self, *_args, **_kwargs):
+        raise NotImplementedError("The curated dataset filesystem is read-only")
+
+    create_dir = delete_dir = delete_dir_contents = delete_root_dir_contents = _read_only
+    delete_file = move = copy_file = open_output_stream = open_append_stream = _read_only
+
+
+def curated_filesystem(region: Optional[str] = None) -> pafs.FileSystem:
+    """Arrow's native S3 filesystem, or the boto3 handler when only boto3 can reach the bucket."""
+    backend = os.getenv("MERLIN_ARROW_S3", "native").lower()
+    if backend not in ("native", "boto3"):
+        raise ValueError(f"Unsupported MERLIN_ARROW_S3 backend {backend}; expected native or boto3")
+    custom_endpoint = os.getenv("AWS_ENDPOINT_URL_S3") or os.getenv("AWS_ENDPOINT_URL")
+    if backend == "native" and not custom_endpoint:
+        try:
+            return pafs.S3FileSystem(region=region)
+        except (ImportError, NotImplementedError, pa.ArrowNotImplementedError) as exc:
+            logger.warning("Arrow S3 filesystem unavailable (%s); reading through boto3", exc)
+    return pafs.PyFileSystem(BotoS3Handler(region))
+
+
+def open_sales_dataset(
+    bucket: str,
+    prefix: str = SALES_PREFIX,
+    region: Optional[str] = None,
+    filesystem: Optional[pafs.FileSystem] = None,
+) -> ds.Dataset:
+    """Discover the curated Parquet dataset (Hive partitions on ``sale_date``) without reading data."""
+    parquet = ds.ParquetFileFormat(default_fragment_scan_options=ds.ParquetFragmentScanOptions(pre_buffer=True))
+    return ds.dataset(
+        f"{bucket}/{prefix.strip('/')}",
+        filesystem=filesystem or curated_filesystem(region),
+        format=parquet,
+        partitioning="hive",
+    )
+
+
+def date_filter(
+    dataset: ds.Dataset, start_date: Optional[DateLike] = None, end_date: Optional[DateLike] = None
+) -> Optional[ds.Expression]:
+    """Inclusive ``sale_date`` window, typed to match the column (partition strings or dates)."""
+    if (start_date is None and end_date is None) or PARTITION_COLUMN not in dataset.schema.names:
+        return None
+    is_date = pa.types.is_date(dataset.schema.field(PARTITION_COLUMN).type)
+
+    def scalar(value: DateLike):
+        if is_date:
+            return value if isinstance(value, date) else date.fromisoformat(value)
+        return value.isoformat() if isinstance(value, date) else value
+
+    field = ds.field(PARTITION_COLUMN)
+    expression: Optional[ds.Expression] = None
+    if start_date is not None:
+        expression = field >= scalar(start_date)
+    if end_date is not None:
+        upper = field <= scalar(end_date)
+        expression = upper if expression is None else expression & upper
+    return expression
+
+
+def _columns(dataset: ds.Dataset, columns: Optional[Sequence[str]]) -> List[str]:
+    wanted = list(columns or TRAINING_COLUMNS)
+    return [name for name in wanted if name in dataset.schema.names]
+
+
+def iter_sales_batches(
+    bucket: str,
+    prefix: str = SALES_PREFIX,
+    region: Optional[str] = None,
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    columns: Optional[Sequence[str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    filesystem: Optional[pafs.FileSystem] = None,
+) -> Iterator[pa.RecordBatch]:
+    """Stream record batches of the pruned, projected dataset; memory stays bounded by the readahead."""
+    dataset = open_sales_dataset(bucket, prefix, region, filesystem)
+    yield from dataset.to_batches(
+        columns=_columns(dataset, columns),
+        filter=date_filter(dataset, start_date, end_date),
+        batch_size=batch_size,
+        use_threads=True,
+    )
+
+
+def count_sales_rows(
+    bucket: str,
+    prefix: str = SALES_PREFIX,
+    region: Optional[str] = None,
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    filesystem: Optional[pafs.FileSystem] = None,
+) -> int:
+    """Row count of the pruned window, answered from Parquet footers without decoding any columns."""
+    dataset = open_sales_dataset(bucket, prefix, region, filesystem)
+    return dataset.count_rows(filter=date_filter(dataset, start_date, end_date))
+
+
+def load_sales_table(
+    bucket: str,
+    prefix: str = SALES_PREFIX,
+    region: Optional[str] = None,
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    columns: Optional[Sequence[str]] = None,
+    filesystem: Optional[pafs.FileSystem] = None,
+) -> pa.Table:
+    """Materialize the pruned, projected dataset as one Arrow table, reading fragments concurrently."""
+    dataset = open_sales_dataset(bucket, prefix, region, filesystem)
+    table = dataset.to_table(
+        columns=_columns(dataset, columns),
+        filter=date_filter(dataset, start_date, end_date),
+        use_threads=True,
+    )
+    if table.num_rows == 0:
+        raise FileNotFoundError(f"No curated sales rows found at s3://{bucket}/{prefix} for the requested window")
+    logger.info("Loaded %d curated rows (%d columns) from s3://%s/%s", table.num_rows, table.num_columns, bucket, prefix)
+    return table
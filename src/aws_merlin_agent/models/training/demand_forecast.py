@@ -1,39 +1,138 @@
 from __future__ import annotations
 
 import argparse
+import io
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
 
 import pandas as pd
+import pyarrow as pa
 from sklearn.model_selection import train_test_split
-from xgboost import XGBRegressor
+from xgboost import Booster, XGBRegressor
 
 from aws_merlin_agent.features.engineering import build_feature_frame
+from aws_merlin_agent.models.artifacts import ArtifactMeta, format_of, meta_key, serialize
+from aws_merlin_agent.utils import aws
 from aws_merlin_agent.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+TrainingData = Union[str, pd.DataFrame, pa.Table]
 
-def train(input_path: str, model_output: str) -> float:
-    """Train a simple demand forecast model and persist artifacts for SageMaker deployment."""
-    logger.info("Loading training data from %s", input_path)
-    df = pd.read_parquet(input_path)
+# A 20% holdout needs at least two rows for R^2 to be defined.
+MIN_VALIDATION_ROWS = 10
+
+
+@dataclass
+class TrainingResult:
+    """A fitted demand model with its validation score."""
+
+    model: XGBRegressor
+    r2: float
+    feature_names: List[str]
+    rows: int
+    data_watermark: Optional[str] = None
+
+    @property
+    def booster(self) -> Booster:
+        return self.model.get_booster()
+
+    def to_bytes(self, fmt: str = "json", compression: str = "none") -> bytes:
+        """Serialized artifact; the defaults match what ``save_model(".json")`` writes."""
+        return serialize(self.booster, fmt, compression)
+
+    def metadata(self, fmt: str = "json", compression: str = "none") -> ArtifactMeta:
+        return ArtifactMeta(
+            format=fmt,
+            compression=compression,
+            feature_names=list(self.feature_names),
+            dtypes={name: "float32" for name in self.feature_names},
+            data_watermark=self.data_watermark,
+            num_trees=self.booster.num_boosted_rounds(),
+        )
+
+
+def _as_frame(data: TrainingData) -> pd.DataFrame:
+    if isinstance(data, str):
+        logger.info("Loading training data from %s", data)
+        return pd.read_parquet(data)
+    if isinstance(data, pa.Table):
+        return data.to_pandas()
+    return data
+
+
+def build_training_matrix(df: pd.DataFrame, lag_offset: int = 0) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Feature matrix and ``units_sold`` target in the column order the served model expects.
+
+    ``lag_offset`` continues ``lag_days`` from rows a warm-started model has already seen.
+    """
     features = build_feature_frame(df)
-    features["lag_days"] = range(len(features))
+    features["lag_days"] = range(lag_offset, lag_offset + len(features))
     y = features["units_sold"].astype(float)
     X = features.drop(columns=["units_sold"]).select_dtypes(include=["number"]).fillna(0.0)
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    return X, y
+
+
+def train(
+    data: TrainingData,
+    model_output: Optional[str] = None,
+    base_model: Optional[Booster] = None,
+    n_estimators: int = 250,
+    lag_offset: int = 0,
+) -> TrainingResult:
+    """
+    Train a simple demand forecast model.
 
+    ``data`` is a curated frame or Arrow table (or a Parquet path, for the CLI). The fitted model
+    is returned in memory; it is only written to disk when ``model_output`` is given. With
+    ``base_model`` the booster is warm-started and ``n_estimators`` more trees are added on top.
+    Below ``MIN_VALIDATION_ROWS`` rows the model is fit on everything and ``r2`` is NaN.
+    """
+    df = _as_frame(data)
+    X, y = build_training_matrix(df, lag_offset)
     model = XGBRegressor(
-        n_estimators=250,
+        n_estimators=n_estimators,
         max_depth=6,
         learning_rate=0.1,
         subsample=0.8,
     )
-    model.fit(X_train, y_train)
-    score = model.score(X_test, y_test)
+    if len(X) < MIN_VALIDATION_ROWS:
+        logger.warning("Only %d training rows; fitting on all of them without a holdout", len(X))
+        model.fit(X, y, xgb_model=base_model)
+        score = float("nan")
+    else:
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        model.fit(X_train, y_train, xgb_model=base_model)
+        score = model.score(X_test, y_test)
     logger.info("Validation R^2: %.3f", score)
-    model.save_model(model_output)
-    logger.info("Persisted model artifact to %s", model_output)
-    return float(score)
+    if model_output:
+        model.save_model(model_output)
+        logger.info("Persisted model artifact to %s", model_output)
+    return TrainingResult(model=model, r2=float(score), feature_names=list(X.columns), rows=len(df))
+
+
+def upload_model(result: TrainingResult, bucket: str, key: str, region: Optional[str] = None) -> str:
+    """
+    Stream the serialized model straight to S3 (no local file) and return its URI.
+
+    The format follows the key (``model.json``, ``model.ubj`` or ``model.ubj.gz``); an
+    ``ArtifactMeta`` sidecar is written next to it as ``model.meta.json``.
+    """
+    fmt, compression = format_of(key)
+    s3 = aws.client("s3", region_name=region)
+    # Sidecar first: whoever can see the artifact can also read its metadata.
+    s3.put_object(
+        Bucket=bucket,
+        Key=meta_key(key),
+        Body=result.metadata(fmt, compression).to_json(),
+        ContentType="application/json",
+    )
+    content_type = "application/json" if fmt == "json" and compression == "none" else "application/octet-stream"
+    s3.upload_fileobj(io.BytesIO(result.to_bytes(fmt, compression)), bucket, key, ExtraArgs={"ContentType": content_type})
+    uri = f"s3://{bucket}/{key}"
+    logger.info("Uploaded model artifact to %s", uri)
+    return uri
 
 
 if __name__ == "__main__":
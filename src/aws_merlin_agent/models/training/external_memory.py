@@ -0,0 +1,198 @@
+"""
+Out-of-core training for the demand model.
+
+``SalesBatchIter`` is an XGBoost ``DataIter`` over curated record batches: every batch is turned
+into features on its own (carrying the few trailing rows the rolling stockout window needs, and the
+running ``lag_days`` counter, across batch boundaries) so the result matches ``build_training_matrix``
+on the concatenated history. XGBoost pulls the batches once per pass and builds a quantized
+``ExtMemQuantileDMatrix`` whose pages are cached on local disk (or an in-memory ``QuantileDMatrix``,
+about one byte per feature value), so peak memory is bounded by the batch size rather than the
+length of the history. XGBoost 2.x has no ``ExtMemQuantileDMatrix``; there the same iterator backs
+a disk-cached ``DMatrix``, its external-memory mode.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import xgboost as xgb
+from sklearn.metrics import r2_score
+from xgboost import Booster, XGBRegressor
+
+from aws_merlin_agent.features.engineering import FORECAST_FEATURES, build_feature_frame
+from aws_merlin_agent.models.training.curated_data import FEATURE_RENAMES, PARTITION_COLUMN
+from aws_merlin_agent.models.training.demand_forecast import TrainingResult
+from aws_merlin_agent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+BatchSource = Callable[[], Iterable[pa.RecordBatch]]
+
+# ``build_feature_frame`` sums units over a 7-row window, so 6 rows of context cross each batch boundary.
+ROLLING_CONTEXT_ROWS = 6
+DEFAULT_HOLDOUT_EVERY = 5
+DEFAULT_MAX_HOLDOUT_ROWS = 100_000
+DEFAULT_MAX_BIN = 256
+
+
+class SalesBatchIter(xgb.DataIter):
+    """
+    Feed curated record batches to XGBoost, engineering features per batch.
+
+    ``batches`` is called at the start of every pass and must return a fresh iterable in the same
+    order. Every ``holdout_every``-th row is kept out of training; up to ``max_holdout_rows`` of
+    them are collected on the first pass for scoring.
+    """
+
+    def __init__(
+        self,
+        batches: BatchSource,
+        cache_prefix: Optional[str] = None,
+        lag_offset: int = 0,
+        holdout_every: int = DEFAULT_HOLDOUT_EVERY,
+        max_holdout_rows: int = DEFAULT_MAX_HOLDOUT_ROWS,
+    ) -> None:
+        super().__init__(cache_prefix=cache_prefix)
+        self._batches = batches
+        self.lag_offset = lag_offset
+        self.holdout_every = holdout_every
+        self.max_holdout_rows = max_holdout_rows
+        self.rows = 0
+        self.data_watermark: Optional[str] = None
+        self._holdout: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._holdout_rows = 0
+        self._first_pass = True
+        self._source: Optional[Iterator[pa.RecordBatch]] = None
+        self._tail: Optional[pd.DataFrame] = None
+        self._position = 0
+
+    def reset(self) -> None:
+        self._source = None
+
+    def next(self, input_data: Callable) -> bool:
+        if self._source is None:
+            self._source = iter(self._batches())
+            self._tail = None
+            self._position = 0
+        for batch in self._source:
+            if batch.num_rows == 0:
+                continue
+            X, y, is_holdout = self._features(batch)
+            if self._first_pass:
+                self._record(batch, X[is_holdout], y[is_holdout])
+            if is_holdout.all():
+                continue
+            input_data(data=X[~is_holdout], label=y[~is_holdout], feature_names=FORECAST_FEATURES)
+            return True
+        if self._first_pass and self.rows == 0:
+            raise FileNotFoundError("No curated sales rows found for the requested window")
+        self._first_pass = False
+        return False
+
+    def _features(self, batch: pa.RecordBatch) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        df = batch.to_pandas().rename(columns=FEATURE_RENAMES)
+        context = 0 if self._tail is None else len(self._tail)
+        frame = df if self._tail is None else pd.concat([self._tail, df], ignore_index=True)
+        features = build_feature_frame(frame).iloc[context:]
+        self._tail = frame.iloc[-ROLLING_CONTEXT_ROWS:]
+
+        start = self._position
+        self._position += len(features)
+        features["lag_days"] = np.arange(self.lag_offset + start, self.lag_offset + self._position)
+        X = features.reindex(columns=FORECAST_FEATURES).fillna(0.0).to_numpy(dtype=np.float32)
+        y = features["units_sold"].to_numpy(dtype=np.float32)
+        if self.holdout_every > 0:
+            is_holdout = np.arange(start, self._position) % self.holdout_every == 0
+        else:
+            is_holdout = np.zeros(len(features), dtype=bool)
+        return X, y, is_holdout
+
+    def _record(self, batch: pa.RecordBatch, X_holdout: np.ndarray, y_holdout: np.ndarray) -> None:
+        self.rows += batch.num_rows
+        column = PARTITION_COLUMN if PARTITION_COLUMN in batch.schema.names else "date"
+        if column in batch.schema.names:
+            latest = str(batch.column(column).to_pandas().astype(str).max())[:10]
+            self.data_watermark = max(filter(None, (self.data_watermark, latest)))
+        room = self.max_holdout_rows - self._holdout_rows
+        if room > 0 and len(y_holdout):
+            self._holdout.append((X_holdout[:room], y_holdout[:room]))
+            self._holdout_rows += min(room, len(y_holdout))
+
+    def holdout(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if not self._holdout:
+            return None
+        return np.concatenate([X for X, _ in self._holdout]), np.concatenate([y for _, y in self._holdout])
+
+
+def _external_memory_matrix(iterator: SalesBatchIter, max_bin: int) -> xgb.DMatrix:
+    ext_mem = getattr(xgb, "ExtMemQuantileDMatrix", None)  # XGBoost >= 3.0
+    if ext_mem is not None:
+        return ext_mem(iterator, max_bin=max_bin)
+    return xgb.DMatrix(iterator)
+
+
+def train_external_memory(
+    batches: BatchSource,
+    base_model: Optional[Booster] = None,
+    n_estimators: int = 250,
+    lag_offset: int = 0,
+    external_memory: bool = True,
+    max_bin: int = DEFAULT_MAX_BIN,
+    holdout_every: int = DEFAULT_HOLDOUT_EVERY,
+    cache_dir: Optional[str] = None,
+) -> TrainingResult:
+    """
+    Train the demand model from a stream of curated record batches.
+
+    Uses the same tree parameters as ``train``. With ``external_memory`` the quantized pages are
+    cached under ``cache_dir`` (a temporary directory by default) and removed afterwards. Raises
+    ``FileNotFoundError`` when the batches contain no rows.
+    """
+    params = {
+        "objective": "reg:squarederror",
+        "tree_method": "hist",
+        "max_depth": 6,
+        "learning_rate": 0.1,
+        "subsample": 0.8,
+        "max_bin": max_bin,
+    }
+    with tempfile.TemporaryDirectory(prefix="merlin-xgb-", dir=cache_dir) as workdir:
+        iterator = SalesBatchIter(
+            batches,
+            cache_prefix=os.path.join(workdir, "sales") if external_memory else None,
+            lag_offset=lag_offset,
+            holdout_every=holdout_every,
+        )
+        if external_memory:
+            dtrain = _external_memory_matrix(iterator, max_bin)
+        else:
+            dtrain = xgb.QuantileDMatrix(iterator, max_bin=max_bin)
+        logger.info(
+            "Built %s over %d curated rows (%d training rows)",
+            type(dtrain).__name__,
+            iterator.rows,
+            dtrain.num_row(),
+        )
+        booster = xgb.train(params, dtrain, num_boost_round=n_estimators, xgb_model=base_model)
+        del dtrain
+
+    score = float("nan")
+    holdout = iterator.holdout()
+    if holdout is not None and len(holdout[1]) > 1:
+        X_holdout, y_holdout = holdout
+        score = float(r2_score(y_holdout, booster.predict(xgb.DMatrix(X_holdout, feature_names=FORECAST_FEATURES))))
+    logger.info("Validation R^2: %.3f", score)
+
+    model = XGBRegressor()
+    model.load_model(bytearray(booster.save_raw(raw_format="json")))
+    return TrainingResult(
+        model=model,
+        r2=score,
+        feature_names=list(FORECAST_FEATURES),
+        rows=iterator.rows,
+        data_watermark=iterator.data_watermark,
+    )
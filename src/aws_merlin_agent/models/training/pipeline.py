@@ -1,76 +1,311 @@
+"""
+Demand forecast training pipeline.
+
+``full`` runs fit a new model on the whole requested window. ``incremental`` runs load the newest
+registered run - not a pinned champion, which would pin the watermark too - and keep boosting with
+only the ``sale_date`` partitions newer than its data watermark, which is recorded in the registry
+with every run. ``auto`` (the default) trains incrementally and falls back to a full retrain when
+there is no usable previous run or the last full retrain is older than MERLIN_FULL_RETRAIN_DAYS.
+The incremental window's rows are counted from Parquet metadata first; with fewer than
+MERLIN_MIN_INCREMENTAL_ROWS the run is skipped before any data is read, and the rows are picked up
+by a later run. Either mode can stream the window out of core (``--external-memory``), so the
+history does not have to fit in memory.
+
+Models are published in MERLIN_MODEL_FORMAT (``ubj`` by default) with MERLIN_MODEL_COMPRESSION
+(``gzip`` by default) next to a ``model.meta.json`` sidecar; see ``models.artifacts``. Runs that
+will be deployed to the SageMaker endpoint need ``json`` / ``none``.
+
+``--tune`` runs a parallel hyperparameter search over the window instead (see ``tuning``) and
+registers the best trial as a full retrain, with its parameters and validation metrics.
+"""
 from __future__ import annotations
 
 import argparse
-import tempfile
-from pathlib import Path
-from typing import Tuple
+import json
+import os
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from uuid import uuid4
 
-import boto3
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from xgboost import Booster
 
 from aws_merlin_agent.config.settings import EnvironmentSettings
-from aws_merlin_agent.models.registry import register_model
-from aws_merlin_agent.models.training.demand_forecast import train
+from aws_merlin_agent.models.artifacts import artifact_name, configured_format, meta_key
+from aws_merlin_agent.models.inference.local_runner import _read_model
+from aws_merlin_agent.models.inference.model_cache import ArtifactCache
+from aws_merlin_agent.models.registry import newest_model, register_model
+from aws_merlin_agent.models.training.curated_data import (
+    FEATURE_RENAMES,
+    PARTITION_COLUMN,
+    SALES_PREFIX,
+    count_sales_rows,
+    iter_sales_batches,
+    load_sales_table,
+)
+from aws_merlin_agent.models.training.demand_forecast import TrainingResult, train, upload_model
+from aws_merlin_agent.models.training.external_memory import train_external_memory
+from aws_merlin_agent.models.training.tuning import DEFAULT_MAX_TRIALS, tune
 from aws_merlin_agent.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+MODES = ("auto", "full", "incremental")
+DEFAULT_INCREMENTAL_ROUNDS = 25
+DEFAULT_FULL_RETRAIN_DAYS = 7.0
+DEFAULT_MIN_INCREMENTAL_ROWS = 50
+
+
+def _data_watermark(table: pa.Table) -> Optional[str]:
+    """Latest ``sale_date`` (or ``date``) in the training data, as ``YYYY-MM-DD``."""
+    column = PARTITION_COLUMN if PARTITION_COLUMN in table.column_names else "date"
+    if column not in table.column_names:
+        return None
+    value = pc.max(table.column(column)).as_py()
+    if value is None:
+        return None
+    return value.isoformat() if isinstance(value, date) else str(value)[:10]
+
+
+def _choose_mode(mode: str, previous: Optional[Dict[str, Any]], now: datetime) -> str:
+    if mode not in MODES:
+        raise ValueError(f"Unknown training mode {mode}; expected one of {MODES}")
+    if mode == "full":
+        return "full"
+    usable = previous is not None and previous.get("data_watermark") and previous.get("last_full_at")
+    if not usable:
+        if mode == "incremental":
+            raise ValueError("Incremental training needs a registered run with a data watermark")
+        logger.info("No previous run with a data watermark; running a full retrain")
+        return "full"
+    if mode == "auto":
+        max_age = timedelta(days=float(os.getenv("MERLIN_FULL_RETRAIN_DAYS", DEFAULT_FULL_RETRAIN_DAYS)))
+        if now - datetime.fromisoformat(previous["last_full_at"]) >= max_age:
+            logger.info("Last full retrain was at %s; running a full retrain", previous["last_full_at"])
+            return "full"
+    return "incremental"
+
+
+def _warm_start(previous: Dict[str, Any], region: str) -> Tuple[Booster, int, int]:
+    """Base booster, ``lag_days`` offset and number of trees to add for an incremental run."""
+    # Per-run keys are immutable, so the base is exactly the previous run's model (cached by ETag).
+    base_model = _read_model(ArtifactCache(region=region).fetch(previous["artifact_uri"])).get_booster()
+    rounds = int(os.getenv("MERLIN_INCREMENTAL_ROUNDS", DEFAULT_INCREMENTAL_ROUNDS))
+    return base_model, int(previous.get("rows_trained", 0)), rounds
+
+
+def _min_incremental_rows() -> int:
+    return int(os.getenv("MERLIN_MIN_INCREMENTAL_ROWS", DEFAULT_MIN_INCREMENTAL_ROWS))
+
+
+def _use_external_memory() -> bool:
+    return os.getenv("MERLIN_TRAINING_EXTERNAL_MEMORY", "").lower() in ("1", "true", "yes")
+
+
+def _publish(
+    result: TrainingResult, bucket: str, artifact_prefix: str, run_id: str, region: str
+) -> Tuple[str, Dict[str, str]]:
+    """
+    Upload in the configured artifact format under ``<prefix>/<run_id>/``; returns the URI and
+    the registry fields describing it.
+
+    Keys are never reused, so a registered run (the champion, a warm-start base) always refers to
+    the weights it was trained with.
+    """
+    fmt, compression = configured_format()
+    key = f"{artifact_prefix}/{run_id}/{artifact_name(fmt, compression)}"
+    artifact_uri = upload_model(result, bucket, key, region)
+    return artifact_uri, {
+        "artifact_format": fmt,
+        "artifact_compression": compression,
+        "meta_uri": f"s3://{bucket}/{meta_key(key)}",
+    }
+
 
-def _download_curated_sales(bucket: str, prefix: str, local_dir: Path, region: str) -> Tuple[Path, pd.DataFrame]:
-    s3 = boto3.client("s3", region_name=region)
-    paginator = s3.get_paginator("list_objects_v2")
-    frames = []
-    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
-        for obj in page.get("Contents", []):
-            key = obj["Key"]
-            if key.endswith(".parquet"):
-                local_path = local_dir / Path(key).name
-                s3.download_file(bucket, key, str(local_path))
-                frames.append(pd.read_parquet(local_path))
-    if not frames:
-        raise FileNotFoundError(f"No Parquet files found at s3://{bucket}/{prefix}")
-    df = pd.concat(frames, ignore_index=True)
-    return local_dir, df
-
-
-def run_training_job(env: str | None = None) -> str:
+def _curated_frame(table: pa.Table):
+    return table.to_pandas().rename(columns=FEATURE_RENAMES)
+
+
+def run_training_job(
+    env: str | None = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    mode: str = "auto",
+    external_memory: Optional[bool] = None,
+) -> str:
+    """
+    Train on the curated ``sale_date`` window [start_date, end_date] (all history by default).
+
+    With ``external_memory`` (default: MERLIN_TRAINING_EXTERNAL_MEMORY) the window is streamed
+    batch by batch into an on-disk quantized matrix instead of being loaded into one DataFrame.
+    """
     settings = EnvironmentSettings.load()
     if env:
         settings.env = env  # type: ignore[attr-defined]
-    curated_prefix = "sales_fact/"
     artifact_prefix = f"models/{settings.env}/demand_forecast"
+    now = datetime.utcnow()
+    if external_memory is None:
+        external_memory = _use_external_memory()
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmp_path = Path(tmpdir)
-        _, df = _download_curated_sales(settings.curated_bucket, curated_prefix, tmp_path, settings.region)
-        df = df.rename(
-            columns={
-                "net_revenue_usd": "net_revenue",
-                "ad_spend_usd": "ad_spend",
-            }
-        )
-        prepare_path = tmp_path / "training_data.parquet"
-        df.to_parquet(prepare_path, index=False)
+    # Chain from the newest run: a champion pin must not freeze the watermark of later runs.
+    previous = newest_model() if mode != "full" else None
+    mode = _choose_mode(mode, previous, now)
+
+    base_model = None
+    base_run_id: Optional[str] = None
+    prior_watermark: Optional[str] = None
+    last_full_at = now.isoformat()
+    lag_offset = 0
+    rounds = 250
+    if previous is not None and mode == "incremental":
+        base_run_id, prior_watermark = previous["run_id"], previous["data_watermark"]
+        last_full_at = previous["last_full_at"]
+        next_day = (date.fromisoformat(prior_watermark) + timedelta(days=1)).isoformat()
+        start_date = max(start_date, next_day) if start_date else next_day
+
+    try:
+        if base_run_id is not None:
+            # Too few rows for a meaningful holdout; leave the watermark alone so they accumulate.
+            new_rows = count_sales_rows(
+                settings.curated_bucket, SALES_PREFIX, settings.region, start_date=start_date, end_date=end_date
+            )
+            if new_rows == 0:
+                logger.info("No partitions after watermark %s; keeping model %s", prior_watermark, base_run_id)
+                return base_run_id
+            if new_rows < _min_incremental_rows():
+                logger.info(
+                    "Only %d rows after watermark %s (minimum %d); keeping model %s",
+                    new_rows,
+                    prior_watermark,
+                    _min_incremental_rows(),
+                    base_run_id,
+                )
+                return base_run_id
+        if external_memory:
+            if base_run_id is not None:
+                base_model, lag_offset, rounds = _warm_start(previous, settings.region)
+            result = train_external_memory(
+                lambda: iter_sales_batches(
+                    settings.curated_bucket, SALES_PREFIX, settings.region, start_date=start_date, end_date=end_date
+                ),
+                base_model=base_model,
+                n_estimators=rounds,
+                lag_offset=lag_offset,
+            )
+            current_watermark = result.data_watermark
+        else:
+            table = load_sales_table(
+                settings.curated_bucket, SALES_PREFIX, settings.region, start_date=start_date, end_date=end_date
+            )
+    except FileNotFoundError:
+        if base_run_id is None:
+            raise
+        logger.info("No partitions after watermark %s; keeping model %s", prior_watermark, base_run_id)
+        return base_run_id
+
+    if not external_memory:
+        if base_run_id is not None:
+            base_model, lag_offset, rounds = _warm_start(previous, settings.region)
+        result = train(_curated_frame(table), base_model=base_model, n_estimators=rounds, lag_offset=lag_offset)
+        current_watermark = _data_watermark(table)
+
+    watermarks = [value for value in (current_watermark, prior_watermark) if value]
+    result.data_watermark = max(watermarks) if watermarks else None
+    run_id = str(uuid4())
+    artifact_uri, artifact_attributes = _publish(
+        result, settings.curated_bucket, artifact_prefix, run_id, settings.region
+    )
 
-        model_path = tmp_path / "demand_forecast.json"
-        score = train(str(prepare_path), str(model_path))
+    attributes = {
+        "training_mode": mode,
+        "data_watermark": result.data_watermark,
+        "rows_trained": lag_offset + result.rows,
+        "num_trees": result.booster.num_boosted_rounds(),
+        "last_full_at": last_full_at,
+        "base_run_id": base_run_id,
+        **artifact_attributes,
+    }
+    metrics = {"r2": result.r2}
+    model_id = register_model(artifact_uri, metrics, attributes=attributes, run_id=run_id)
+    logger.info("Training complete (%s). Model %s stored at %s", mode, model_id, artifact_uri)
+    return model_id
+
+
+def run_tuning_job(
+    env: str | None = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    max_trials: int = DEFAULT_MAX_TRIALS,
+    max_workers: Optional[int] = None,
+) -> str:
+    """Search hyperparameters on the curated window and register the best model as a full retrain."""
+    settings = EnvironmentSettings.load()
+    if env:
+        settings.env = env  # type: ignore[attr-defined]
+    artifact_prefix = f"models/{settings.env}/demand_forecast"
+    now = datetime.utcnow()
 
-        artifact_key = f"{artifact_prefix}/model.json"
-        s3 = boto3.client("s3", region_name=settings.region)
-        s3.upload_file(str(model_path), settings.curated_bucket, artifact_key)
-        artifact_uri = f"s3://{settings.curated_bucket}/{artifact_key}"
+    table = load_sales_table(
+        settings.curated_bucket, SALES_PREFIX, settings.region, start_date=start_date, end_date=end_date
+    )
+    tuning = tune(_curated_frame(table), max_trials=max_trials, max_workers=max_workers)
+    result, best = tuning.best, tuning.best_trial
+    result.data_watermark = _data_watermark(table)
+    run_id = str(uuid4())
+    artifact_uri, artifact_attributes = _publish(
+        result, settings.curated_bucket, artifact_prefix, run_id, settings.region
+    )
 
-    metrics = {"r2": score}
-    model_id = register_model(artifact_uri, metrics)
-    logger.info("Training complete. Model %s stored at %s", model_id, artifact_uri)
+    attributes = {
+        "training_mode": "tuned",
+        "data_watermark": result.data_watermark,
+        "rows_trained": result.rows,
+        "num_trees": result.booster.num_boosted_rounds(),
+        "last_full_at": now.isoformat(),
+        "hyperparameters": json.dumps(tuning.best_params, sort_keys=True),
+        "tuning_trials": len(tuning.trials),
+        **artifact_attributes,
+    }
+    metrics = {
+        "r2": result.r2,
+        "rmse": best.rmse,
+        "best_iteration": best.best_iteration,
+        "tuning_seconds": tuning.wall_seconds,
+    }
+    model_id = register_model(artifact_uri, metrics, attributes=attributes, run_id=run_id)
+    logger.info("Tuning complete. Model %s (%s) stored at %s", model_id, tuning.best_params, artifact_uri)
     return model_id
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Run the MERLIN demand forecast training pipeline.")
     parser.add_argument("--env", help="Execution environment (dev/demo/prod)")
+    parser.add_argument("--start-date", help="First sale_date partition to train on (YYYY-MM-DD)")
+    parser.add_argument("--end-date", help="Last sale_date partition to train on (YYYY-MM-DD)")
+    parser.add_argument("--mode", choices=MODES, default="auto", help="Full retrain or warm start from the active model")
+    parser.add_argument(
+        "--external-memory",
+        action="store_true",
+        default=None,
+        help="Stream batches into an on-disk quantized matrix instead of loading the window into memory",
+    )
+    parser.add_argument("--tune", action="store_true", help="Run a parallel hyperparameter search instead")
+    parser.add_argument("--max-trials", type=int, default=DEFAULT_MAX_TRIALS, help="Configurations to evaluate")
+    parser.add_argument("--workers", type=int, help="Tuning processes (defaults to the available cores)")
     args = parser.parse_args()
-    run_training_job(args.env)
+    if args.tune:
+        run_tuning_job(
+            args.env, start_date=args.start_date, end_date=args.end_date, max_trials=args.max_trials, max_workers=args.workers
+        )
+        return
+    run_training_job(
+        args.env,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        mode=args.mode,
+        external_memory=args.external_memory,
+    )
 
 
 if __name__ == "__main__":
@@ -3,11 +3,20 @@ from __future__ import annotations
 from functools import lru_cache
 
 import boto3
+from botocore.config import Config
 
 
 @lru_cache(maxsize=None)
-def client(service_name: str, region_name: str | None = None):
-    """Return a cached boto3 client to avoid repeated session construction."""
+def client(service_name: str, region_name: str | None = None, max_pool_connections: int | None = None):
+    """Return a cached boto3 client to avoid repeated session construction.
+
+    ``max_pool_connections`` sizes the HTTP connection pool for callers that keep many requests
+    in flight on one client (botocore defaults to 10).
+    """
+    if max_pool_connections:
+        return boto3.client(
+            service_name, region_name=region_name, config=Config(max_pool_connections=max_pool_connections)
+        )
     return boto3.client(service_name, region_name=region_name)
 
 
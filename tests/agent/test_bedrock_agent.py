@@ -10,6 +10,11 @@ import pytest
 from aws_merlin_agent.agent.bedrock_agent import BedrockAgentOrchestrator, create_conversational_response
 
 
+def nova_body(payload):
+    """Wrap a Nova response payload the way invoke_model returns it."""
+    return {"body": MagicMock(read=lambda: json.dumps(payload).encode())}
+
+
 @pytest.fixture
 def mock_bedrock_runtime():
     """Mock Bedrock runtime client."""
@@ -43,7 +48,7 @@ def test_invoke_inline_agent_with_nova(mock_bedrock_runtime):
         },
         "stopReason": "end_turn"
     }
-    mock_bedrock_runtime.converse.return_value = mock_response
+    mock_bedrock_runtime.invoke_model.return_value = nova_body(mock_response)
     
     orchestrator = BedrockAgentOrchestrator()
     result = orchestrator.invoke_agent("How is SKU-001 performing?")
@@ -54,22 +59,26 @@ def test_invoke_inline_agent_with_nova(mock_bedrock_runtime):
     assert result["stop_reason"] == "end_turn"
     
     # Verify Nova Pro was called
-    mock_bedrock_runtime.converse.assert_called_once()
-    call_args = mock_bedrock_runtime.converse.call_args
+    mock_bedrock_runtime.invoke_model.assert_called_once()
+    call_args = mock_bedrock_runtime.invoke_model.call_args
     assert call_args[1]["modelId"] == "amazon.nova-pro-v1:0"
 
 
 def test_invoke_inline_agent_fallback_to_claude(mock_bedrock_runtime):
     """Test fallback to Claude when Nova fails."""
     # Mock Nova failure and Claude success
-    mock_bedrock_runtime.converse.side_effect = Exception("Nova not available")
-    
     mock_claude_response = {
         "body": MagicMock(read=lambda: json.dumps({
             "content": [{"text": "Analysis from Claude"}]
         }).encode())
     }
-    mock_bedrock_runtime.invoke_model.return_value = mock_claude_response
+
+    def side_effect_func(*args, **kwargs):
+        if "nova" in kwargs["modelId"]:
+            raise Exception("Nova not available")
+        return mock_claude_response
+
+    mock_bedrock_runtime.invoke_model.side_effect = side_effect_func
     
     orchestrator = BedrockAgentOrchestrator()
     result = orchestrator.invoke_agent("Analyze performance")
@@ -78,8 +87,8 @@ def test_invoke_inline_agent_fallback_to_claude(mock_bedrock_runtime):
     assert "Analysis from Claude" in result["response"]
     assert result["trace"]["model"] == "anthropic.claude-3-sonnet-20240229-v1:0"
     
-    # Verify Claude was called
-    mock_bedrock_runtime.invoke_model.assert_called_once()
+    # Verify Nova was tried once, then Claude
+    assert mock_bedrock_runtime.invoke_model.call_count == 2
 
 
 def test_create_conversational_response(mock_bedrock_runtime):
@@ -92,7 +101,7 @@ def test_create_conversational_response(mock_bedrock_runtime):
         },
         "stopReason": "end_turn"
     }
-    mock_bedrock_runtime.converse.return_value = mock_response
+    mock_bedrock_runtime.invoke_model.return_value = nova_body(mock_response)
     
     result = create_conversational_response("What should I do?")
     
@@ -111,7 +120,7 @@ def test_agent_with_session_continuity(mock_bedrock_runtime):
         },
         "stopReason": "end_turn"
     }
-    mock_bedrock_runtime.converse.return_value = mock_response
+    mock_bedrock_runtime.invoke_model.return_value = nova_body(mock_response)
     
     orchestrator = BedrockAgentOrchestrator()
     session_id = "test-session-123"
@@ -133,7 +142,7 @@ def test_agent_reasoning_trace_enabled(mock_bedrock_runtime):
         },
         "stopReason": "end_turn"
     }
-    mock_bedrock_runtime.converse.return_value = mock_response
+    mock_bedrock_runtime.invoke_model.return_value = nova_body(mock_response)
     
     orchestrator = BedrockAgentOrchestrator()
     result = orchestrator.invoke_agent("Query", enable_trace=True)
@@ -152,7 +161,7 @@ def test_agent_reasoning_trace_disabled(mock_bedrock_runtime):
         },
         "stopReason": "end_turn"
     }
-    mock_bedrock_runtime.converse.return_value = mock_response
+    mock_bedrock_runtime.invoke_model.return_value = nova_body(mock_response)
     
     orchestrator = BedrockAgentOrchestrator()
     result = orchestrator.invoke_agent("Query", enable_trace=False)
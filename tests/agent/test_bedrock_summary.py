@@ -47,7 +47,7 @@ def sample_rows():
 @pytest.fixture
 def mock_bedrock_runtime():
     """Mock Bedrock runtime client."""
-    with patch("aws_merlin_agent.agent.tools.bedrock_summary.aws.client") as mock_client:
+    with patch("aws_merlin_agent.bedrock.client.aws.client") as mock_client:
         mock_runtime = MagicMock()
         mock_client.return_value = mock_runtime
         yield mock_runtime
@@ -60,8 +60,8 @@ def test_summarize_rows_empty():
 
 
 def test_summarize_rows_with_nova(mock_bedrock_runtime, sample_rows):
-    """Test summarization using Nova Pro."""
-    # Mock Nova Pro response
+    """Test summarization using Nova Lite, the summary tier."""
+    # Mock Nova response
     mock_response = {
         "body": MagicMock(read=lambda: json.dumps({
             "output": {
@@ -83,10 +83,10 @@ def test_summarize_rows_with_nova(mock_bedrock_runtime, sample_rows):
     assert "45 total units" in result or "units sold" in result.lower()
     assert "$1,350" in result or "1350" in result
     
-    # Verify Nova Pro was called
+    # Verify Nova Lite was called
     mock_bedrock_runtime.invoke_model.assert_called_once()
     call_args = mock_bedrock_runtime.invoke_model.call_args
-    assert call_args[1]["modelId"] == "amazon.nova-pro-v1:0"
+    assert call_args[1]["modelId"] == "amazon.nova-lite-v1:0"
 
 
 def test_summarize_rows_fallback_to_claude(mock_bedrock_runtime, sample_rows):
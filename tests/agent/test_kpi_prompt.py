@@ -0,0 +1,76 @@
+"""
+Tests for the compact KPI prompt encoding.
+"""
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from aws_merlin_agent.agent.tools.kpi_prompt import (
+    build_kpi_prompt,
+    compute_kpi_aggregates,
+    encode_daily_table,
+    estimate_tokens,
+)
+
+
+def _rows(days, units=lambda i: 10 + i, inventory=lambda i: 100 - i):
+    start = date(2025, 10, 1)
+    return [
+        {
+            "seller_id": "SELLER-001",
+            "sku": "SKU-001",
+            "sale_date": (start + timedelta(days=i)).isoformat(),
+            "units_sold": str(units(i)),
+            "net_revenue_usd": f"{units(i) * 30:.2f}",
+            "ad_spend_usd": f"{units(i) * 3:.2f}",
+            "inventory_on_hand": str(inventory(i)),
+        }
+        for i in range(days)
+    ]
+
+
+def test_aggregates_are_precomputed():
+    rows = _rows(14, units=lambda i: 10 if i < 7 else 20, inventory=lambda i: 0 if i in (3, 4) else 50)
+    aggregates = compute_kpi_aggregates(list(reversed(rows)))
+
+    assert aggregates["units_total"] == 210
+    assert aggregates["acos_pct"] == pytest.approx(10.0)
+    assert aggregates["units_wow_pct"] == pytest.approx(100.0)
+    assert aggregates["units_slope"] > 0
+    assert aggregates["stockout_days"] == 2
+
+
+def test_short_history_and_zero_revenue():
+    rows = _rows(3, units=lambda i: 0)
+    aggregates = compute_kpi_aggregates(rows)
+
+    assert aggregates["acos_pct"] is None
+    assert aggregates["units_wow_pct"] is None
+
+
+def test_table_has_single_header():
+    table = encode_daily_table(_rows(3))
+    lines = table.splitlines()
+
+    assert lines[0] == "date|units|rev|ad|inv"
+    assert lines[1] == "2025-10-01|10|300|30|100"
+    assert "units_sold" not in table
+
+
+def test_prompt_is_smaller_than_json_rows():
+    rows = _rows(14)
+    prompt = build_kpi_prompt(rows)
+
+    assert "SKU-001" in prompt
+    assert estimate_tokens(prompt) * 2 < estimate_tokens(json.dumps(rows, indent=2))
+
+
+def test_budget_keeps_most_recent_days():
+    rows = _rows(60)
+    prompt = build_kpi_prompt(rows, token_budget=250)
+
+    assert estimate_tokens(prompt) <= 250
+    assert "2025-11-29" in prompt  # last day survives
+    assert "2025-10-01|" not in prompt  # oldest days are trimmed
+    assert "units_total=2370" in prompt  # aggregates still cover the whole period
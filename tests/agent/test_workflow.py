@@ -52,3 +52,47 @@ def test_lambda_handler_generates_forecast(monkeypatch, sample_rows, dummy_setti
 
     result = workflow.forecast(sku="SKU-001")
     assert result["predictions"][0] == 42.0
+
+
+class _StubAgent:
+    def __init__(self, action, **parameters):
+        self.response = {"action_required": action, "parameters": {"sku": "SKU-001", **parameters}}
+
+    def invoke_agent(self, **_kwargs):
+        return dict(self.response)
+
+
+def test_forecast_tool_survives_unavailable_explanations(monkeypatch, dummy_settings):
+    workflow = MerlinAgentWorkflow()
+    monkeypatch.setattr(workflow, "forecast", lambda sku: {"predictions": [20.0], "model_id": "run-2"})
+
+    def no_model(skus, top_k=3):
+        raise RuntimeError("No registered model found for local inference")
+
+    monkeypatch.setattr(workflow, "explain_forecast", no_model)
+    workflow.bedrock_agent = _StubAgent("forecast_demand", explain=True)
+    output = workflow.conversational_query("forecast SKU-001")["tool_output"]
+    assert output == {"predictions": [20.0], "model_id": "run-2"}
+
+    workflow.bedrock_agent = _StubAgent("explain_forecast")
+    assert "error" in workflow.conversational_query("why?")["tool_output"]
+
+
+def test_forecast_explanation_is_opt_in_and_flags_model_mismatch(monkeypatch, dummy_settings):
+    workflow = MerlinAgentWorkflow()
+    monkeypatch.setattr(workflow, "forecast", lambda sku: {"predictions": [20.0], "model_id": "run-2"})
+    calls = []
+
+    def explain(skus, top_k=3):
+        calls.append(skus)
+        return {"model_id": "run-1", "summary": "SKU-001: ~20.0 units/day; ad_spend +3.0"}
+
+    monkeypatch.setattr(workflow, "explain_forecast", explain)
+    workflow.bedrock_agent = _StubAgent("forecast_demand")
+    assert "explanation" not in workflow.conversational_query("forecast")["tool_output"]
+    assert calls == []
+
+    workflow.bedrock_agent = _StubAgent("forecast_demand", explain=True)
+    explanation = workflow.conversational_query("forecast and explain")["tool_output"]["explanation"]
+    assert explanation["summary"].startswith("SKU-001")
+    assert "run-1" in explanation["note"]
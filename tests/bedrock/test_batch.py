@@ -0,0 +1,102 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import boto3
+import pytest
+
+from aws_merlin_agent.agent.tools import bedrock_summary
+from aws_merlin_agent.bedrock.batch import LocalBatchBackend, S3BatchBackend
+
+
+def _rows(units, sku="SKU-001"):
+    return [
+        {"sku": sku, "sale_date": f"2025-10-1{i}", "units_sold": str(u), "net_revenue_usd": "100", "ad_spend_usd": "10"}
+        for i, u in enumerate(units)
+    ]
+
+
+def _fake_nova(model_id, body):
+    prompt = body["messages"][0]["content"][0]["text"]
+    if "BROKEN" in prompt:
+        raise RuntimeError("model error")
+    return {"output": {"message": {"content": [{"text": f"narrative from {model_id}"}]}}}
+
+
+def test_summary_batch_round_trip_through_local_backend(tmp_path, dummy_settings):
+    backend = LocalBatchBackend(tmp_path, invoke=_fake_nova)
+    rows_by_sku = {"SKU-001": _rows([10, 12]), "SKU-002": _rows([3, 4]), "SKU-EMPTY": []}
+
+    job_id = bedrock_summary.submit_summary_batch(rows_by_sku, backend=backend)
+    records = [json.loads(line) for line in (tmp_path / "jobs" / job_id / "records.jsonl").read_text().splitlines()]
+    assert [r["recordId"] for r in records] == ["R0000000000", "R0000000001"]
+    assert backend.metadata(job_id)["record_skus"] == {"R0000000000": "SKU-001", "R0000000001": "SKU-002"}
+    assert "inferenceConfig" in records[0]["modelInput"]
+
+    results = bedrock_summary.collect_summary_batch(job_id, backend=backend)
+    assert results["SKU-001"]["status"] == "success"
+    assert results["SKU-001"]["summary"] == "narrative from amazon.nova-lite-v1:0"
+    stored = json.loads((tmp_path / "narratives" / "SKU-002.json").read_text())
+    assert stored["job_id"] == job_id
+
+
+def test_failed_batch_records_fall_back_to_basic_summary(tmp_path, dummy_settings):
+    backend = LocalBatchBackend(tmp_path, invoke=_fake_nova)
+    rows_by_sku = {"SKU-001": _rows([10]), "BROKEN": _rows([5], sku="BROKEN")}
+
+    job_id = bedrock_summary.submit_summary_batch(rows_by_sku, backend=backend)
+    assert backend.status(job_id) == "PartiallyCompleted"
+
+    results = bedrock_summary.collect_summary_batch(job_id, rows_by_sku=rows_by_sku, backend=backend)
+    assert results["SKU-001"]["status"] == "success"
+    assert results["BROKEN"]["status"] == "fallback"
+    assert "Units Sold: 5" in results["BROKEN"]["summary"]
+
+
+def test_s3_backend_rejects_jobs_below_bedrock_minimum():
+    backend = S3BatchBackend("bucket", "arn:aws:iam::123456789012:role/batch", "us-east-1")
+    with pytest.raises(ValueError):
+        backend.submit("job", "amazon.nova-pro-v1:0", [{"recordId": "1", "modelInput": {}}])
+
+
+def test_s3_backend_collects_jobs_reported_with_a_model_arn(dummy_settings, moto_aws):
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket="merlin-test-curated")
+    s3.put_object(
+        Bucket="merlin-test-curated",
+        Key="bedrock-batch/job/metadata.json",
+        Body=json.dumps({"record_skus": {"R0000000000": "SKU-001"}}).encode(),
+    )
+    output = {"recordId": "R0000000000", "modelOutput": _fake_nova("amazon.nova-lite-v1:0", {"messages": [{"content": [{"text": "ok"}]}]})}
+    s3.put_object(Bucket="merlin-test-curated", Key="bedrock-batch/job/output/abc/records.jsonl.out", Body=json.dumps(output).encode())
+    bedrock = MagicMock()
+    bedrock.get_model_invocation_job.return_value = {
+        "status": "Completed",
+        "jobName": "job",
+        "modelId": "arn:aws:bedrock:us-east-1::foundation-model/amazon.nova-lite-v1:0",
+        "outputDataConfig": {"s3OutputDataConfig": {"s3Uri": "s3://merlin-test-curated/bedrock-batch/job/output/"}},
+    }
+    backend = S3BatchBackend("merlin-test-curated", "arn:aws:iam::123456789012:role/batch", "us-east-1")
+
+    real_client = boto3.client
+    with patch(
+        "aws_merlin_agent.utils.aws.client",
+        side_effect=lambda service, region_name=None: bedrock if service == "bedrock" else real_client(service, region_name=region_name),
+    ):
+        assert backend.model_id("job-arn") == "amazon.nova-lite-v1:0"
+        results = bedrock_summary.collect_summary_batch("job-arn", backend=backend)
+
+    assert results["SKU-001"]["status"] == "success"
+    assert results["SKU-001"]["model_id"] == "amazon.nova-lite-v1:0"
+    stored = json.loads(s3.get_object(Bucket="merlin-test-curated", Key="narratives/SKU-001.json")["Body"].read())
+    assert stored["model_id"] == "amazon.nova-lite-v1:0"
+
+
+def test_skus_are_encoded_in_result_keys(tmp_path, dummy_settings):
+    backend = LocalBatchBackend(tmp_path, invoke=_fake_nova)
+    rows_by_sku = {"TEE/RED 10": _rows([10], sku="TEE/RED 10")}
+
+    job_id = bedrock_summary.submit_summary_batch(rows_by_sku, backend=backend)
+    results = bedrock_summary.collect_summary_batch(job_id, backend=backend)
+
+    assert results["TEE/RED 10"]["status"] == "success"
+    assert [path.name for path in (tmp_path / "narratives").iterdir()] == ["TEE%2FRED%2010.json"]
@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+from aws_merlin_agent.bedrock import circuit
+from aws_merlin_agent.bedrock.circuit import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitOpenError,
+    call_with_fallback,
+)
+from aws_merlin_agent.bedrock.rate_limit import RateLimitTimeout
+from aws_merlin_agent.bedrock.router import ModelRouter, RoutingPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_on_error_rate_and_recovers_through_half_open():
+    clock = FakeClock()
+    breaker = CircuitBreaker("model", CircuitBreakerConfig(min_calls=4, open_seconds=10), clock=clock)
+    breaker.record_success(100)
+    breaker.record_success(100)
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow_request()
+
+    clock.now = 11
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # only one trial call at a time
+    breaker.record_success(100)
+    assert breaker.state == STATE_CLOSED
+
+
+def test_breaker_reopens_when_trial_call_fails():
+    clock = FakeClock()
+    breaker = CircuitBreaker("model", CircuitBreakerConfig(min_calls=1, open_seconds=5), clock=clock)
+    breaker.record_failure()
+    clock.now = 6
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+
+
+def test_breaker_opens_on_slow_calls():
+    breaker = CircuitBreaker("model", CircuitBreakerConfig(min_calls=3, slow_call_ms=1000, slow_rate_threshold=0.6))
+    for _ in range(3):
+        breaker.record_success(2000)
+    assert breaker.state == STATE_OPEN
+
+
+def test_call_with_fallback_skips_open_circuit(monkeypatch):
+    monkeypatch.setenv("MERLIN_CIRCUIT_BREAKER", '{"min_calls": 1}')
+    calls = []
+
+    def invoke(model_id):
+        calls.append(model_id)
+        if model_id == "primary":
+            raise RuntimeError("throttled")
+        return "ok"
+
+    router = ModelRouter(RoutingPolicy())
+    assert call_with_fallback(["primary", "backup"], invoke, router) == ("backup", "ok")
+    assert call_with_fallback(["primary", "backup"], invoke, router) == ("backup", "ok")
+    # The second request never touched the failing model.
+    assert calls == ["primary", "backup", "backup"]
+
+
+def test_call_with_fallback_raises_when_all_circuits_open(monkeypatch):
+    monkeypatch.setenv("MERLIN_CIRCUIT_BREAKER", '{"min_calls": 1}')
+    circuit.breaker_for("only").record_failure()
+    with pytest.raises(CircuitOpenError):
+        call_with_fallback(["only"], lambda model_id: "unused", ModelRouter(RoutingPolicy()))
+
+
+def test_hedged_request_returns_faster_fallback():
+    router = ModelRouter(RoutingPolicy(hedge_percentile=95.0, hedge_min_delay_ms=10.0, min_latency_samples=1))
+    router.record_latency("slow", 20.0)
+    release = threading.Event()
+
+    def invoke(model_id):
+        if model_id == "slow":
+            release.wait(2)
+            return "slow answer"
+        return "fast answer"
+
+    start = time.perf_counter()
+    try:
+        assert call_with_fallback(["slow", "fast"], invoke, router) == ("fast", "fast answer")
+    finally:
+        release.set()
+    assert time.perf_counter() - start < 1.0
+
+
+def test_local_rate_limit_timeout_falls_back_without_opening_the_circuit(monkeypatch):
+    monkeypatch.setenv("MERLIN_CIRCUIT_BREAKER", '{"min_calls": 1}')
+
+    def invoke(model_id):
+        if model_id == "primary":
+            raise RateLimitTimeout("quota exhausted locally")
+        return "ok"
+
+    router = ModelRouter(RoutingPolicy())
+    assert call_with_fallback(["primary", "backup"], invoke, router) == ("backup", "ok")
+    assert circuit.breaker_for("primary").state == STATE_CLOSED
+
+
+def test_rate_limited_trial_call_keeps_the_half_open_slot():
+    clock = FakeClock()
+    breaker = CircuitBreaker("model", CircuitBreakerConfig(min_calls=1, open_seconds=5), clock=clock)
+    breaker.record_failure()
+    clock.now = 6
+    assert breaker.allow_request()
+    breaker.release()
+    assert breaker.allow_request()
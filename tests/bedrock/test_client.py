@@ -0,0 +1,158 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from aws_merlin_agent.bedrock import client as client_module
+from aws_merlin_agent.bedrock.adapters import ImageInput, TextRequest, adapter_for
+from aws_merlin_agent.bedrock.client import BedrockClient
+from aws_merlin_agent.bedrock.rate_limit import QuotaConfig, QuotaLimiter, RateLimitTimeout, TokenBucket
+
+
+def _body(payload):
+    return {"body": MagicMock(read=lambda: json.dumps(payload).encode())}
+
+
+def _throttle():
+    return ClientError({"Error": {"Code": "ThrottlingException", "Message": "slow down"}}, "InvokeModel")
+
+
+NOVA_OK = {
+    "output": {"message": {"content": [{"text": "ok"}]}},
+    "stopReason": "end_turn",
+    "usage": {"inputTokens": 12, "outputTokens": 3},
+}
+
+
+@pytest.fixture
+def runtime():
+    with patch("aws_merlin_agent.bedrock.client.aws.client") as mock_client:
+        mock_runtime = MagicMock()
+        mock_client.return_value = mock_runtime
+        yield mock_runtime
+
+
+def test_adapters_build_family_specific_bodies():
+    request = TextRequest(prompt="Describe", system="Be brief", images=[ImageInput(b"img", "jpeg")], max_tokens=50)
+    nova = adapter_for("amazon.nova-lite-v1:0").build_body(request)
+    assert nova["messages"][0]["content"][0]["image"]["format"] == "jpeg"
+    assert nova["messages"][0]["content"][-1] == {"text": "Describe"}
+    assert nova["system"] == [{"text": "Be brief"}]
+
+    claude = adapter_for("us.anthropic.claude-3-sonnet-20240229-v1:0").build_body(request)
+    assert claude["system"] == "Be brief"
+    assert claude["messages"][0]["content"][0]["source"]["media_type"] == "image/jpeg"
+
+    with pytest.raises(ValueError):
+        adapter_for("cohere.command-r-v1:0")
+
+
+def test_throttled_calls_retry_with_jitter_and_record_usage(runtime, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(client_module.time, "sleep", sleeps.append)
+    runtime.invoke_model.side_effect = [_throttle(), _throttle(), _body(NOVA_OK)]
+
+    llm = BedrockClient("us-east-1")
+    completion = llm.complete("amazon.nova-lite-v1:0", TextRequest(prompt="hi", max_tokens=10))
+
+    assert completion.text == "ok"
+    assert len(sleeps) == 2
+    assert all(0 <= delay <= 8.0 for delay in sleeps)
+    usage = llm.ledger.snapshot()["amazon.nova-lite-v1:0"]
+    assert usage == {"requests": 1, "input_tokens": 12, "output_tokens": 3, "throttled": 2, "failures": 0}
+
+
+def test_throttling_gives_up_after_max_retries(runtime, monkeypatch):
+    monkeypatch.setattr(client_module.time, "sleep", lambda _: None)
+    monkeypatch.setenv("MERLIN_BEDROCK_QUOTAS", '{"max_retries": 1}')
+    runtime.invoke_model.side_effect = _throttle()
+
+    llm = BedrockClient("us-east-1", limiter=QuotaLimiter())
+    with pytest.raises(ClientError):
+        llm.complete("amazon.nova-lite-v1:0", TextRequest(prompt="hi"))
+    assert runtime.invoke_model.call_count == 2
+    assert llm.ledger.snapshot()["amazon.nova-lite-v1:0"]["failures"] == 1
+
+
+def test_generate_falls_back_across_families(runtime):
+    def side_effect(**kwargs):
+        if "nova" in kwargs["modelId"]:
+            raise RuntimeError("unavailable")
+        return _body({"content": [{"text": "from claude"}], "usage": {"input_tokens": 5, "output_tokens": 2}})
+
+    runtime.invoke_model.side_effect = side_effect
+    completion = BedrockClient("us-east-1").generate(
+        TextRequest(prompt="hi"), ["amazon.nova-pro-v1:0", "anthropic.claude-3-sonnet-20240229-v1:0"]
+    )
+    assert completion.model_id.startswith("anthropic.")
+    assert completion.text == "from claude"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_paces_requests_at_refill_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_second=2.0, capacity=2.0, clock=clock, sleep=clock.sleep)
+    for _ in range(6):
+        bucket.acquire(1)
+    # Two requests fit in the initial burst, the remaining four wait 0.5s each.
+    assert clock.now == pytest.approx(2.0)
+
+    with pytest.raises(RateLimitTimeout):
+        bucket.acquire(2, timeout=0.1)
+
+
+def test_limiter_applies_headroom_and_settles_overruns():
+    config = QuotaConfig(quotas={"m": {"rpm": 60, "tpm": 600}}, headroom=0.5, burst_seconds=10)
+    limiter = QuotaLimiter(config)
+    buckets = limiter._model_buckets("m")
+    assert buckets["rpm"].rate == pytest.approx(0.5)
+    assert buckets["tpm"].capacity == pytest.approx(50)
+
+    limiter.acquire("m", estimated_tokens=20)
+    limiter.settle("m", estimated_tokens=20, actual_tokens=60)
+    assert buckets["tpm"].try_acquire(1) > 0
+
+
+def test_limiter_refunds_unused_reservations():
+    limiter = QuotaLimiter(QuotaConfig(quotas={"m": {"rpm": 600, "tpm": 600}}, headroom=1.0, burst_seconds=10))
+    bucket = limiter._model_buckets("m")["tpm"]
+
+    limiter.acquire("m", estimated_tokens=80)
+    limiter.settle("m", estimated_tokens=80, actual_tokens=10)
+    assert bucket.try_acquire(90) == 0  # 70 of the 80 reserved came back
+    limiter.settle("m", estimated_tokens=100, actual_tokens=0)
+    assert bucket._tokens <= bucket.capacity  # refunds never overfill the bucket
+
+
+def test_limiter_gives_back_the_request_slot_when_tokens_time_out():
+    config = QuotaConfig(quotas={"m": {"rpm": 6, "tpm": 60}}, headroom=1.0, burst_seconds=10, acquire_timeout_s=0.0)
+    limiter = QuotaLimiter(config)
+    buckets = limiter._model_buckets("m")
+    buckets["tpm"].consume(buckets["tpm"].capacity)
+
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire("m", estimated_tokens=5)
+    assert buckets["rpm"].try_acquire(1) == 0  # the only request slot in the burst is still free
+
+
+def test_throttled_attempts_refund_their_token_reservation(runtime, monkeypatch):
+    monkeypatch.setattr(client_module.time, "sleep", lambda _: None)
+    runtime.invoke_model.side_effect = [_throttle(), _throttle(), _body(NOVA_OK)]
+    limiter = QuotaLimiter(QuotaConfig(quotas={"amazon.nova-lite-v1:0": {"rpm": 600, "tpm": 6000}}, headroom=1.0))
+    bucket = limiter._model_buckets("amazon.nova-lite-v1:0")["tpm"]
+    bucket.rate = 1e-9  # freeze refill so the balance only reflects reservations
+
+    BedrockClient("us-east-1", limiter=limiter).complete("amazon.nova-lite-v1:0", TextRequest(prompt="hi" * 200))
+
+    assert bucket._tokens == pytest.approx(bucket.capacity - 15)  # only the 12 + 3 tokens actually used
@@ -0,0 +1,89 @@
+import json
+
+from aws_merlin_agent.agent.tools.kpi_prompt import build_kpi_prompt
+from aws_merlin_agent.bedrock.router import (
+    CLAUDE_SONNET,
+    NOVA_LITE,
+    NOVA_MICRO,
+    NOVA_PRO,
+    TIER_COMPLEX,
+    TIER_SIMPLE,
+    TIER_STANDARD,
+    ModelRouter,
+    RoutingPolicy,
+)
+
+
+def test_classifies_requests_by_complexity():
+    router = ModelRouter(RoutingPolicy())
+    assert router.classify("hi") == TIER_SIMPLE
+    assert router.classify("What is the inventory on hand for SKU-001?") == TIER_STANDARD
+    assert router.classify("Compare SKU-001 and SKU-002 ad efficiency") == TIER_COMPLEX
+    assert router.classify("How is SKU-001 performing?") == TIER_COMPLEX
+
+
+def test_task_tier_and_token_cap():
+    router = ModelRouter(RoutingPolicy())
+    decision = router.route("ok", task="summary")
+    assert decision.tier == TIER_STANDARD
+    assert decision.model_id == NOVA_LITE
+    assert decision.max_tokens == 500
+    assert decision.candidates == [NOVA_LITE, CLAUDE_SONNET]
+
+    # A known task is not reclassified from its prompt text.
+    pinned = router.route("Compare SKU-001 and SKU-002 ad efficiency", task="summary")
+    assert pinned.tier == TIER_STANDARD
+    assert router.route("Compare SKU-001 and SKU-002 ad efficiency").tier == TIER_COMPLEX
+
+
+def test_real_kpi_summary_prompts_route_to_the_standard_tier():
+    router = ModelRouter(RoutingPolicy())
+    for days in (3, 30):
+        rows = [
+            {
+                "sku": "SKU-001",
+                "sale_date": f"2024-01-{day + 1:02d}",
+                "units_sold": 10 + day,
+                "net_revenue_usd": 200.0 + day,
+                "ad_spend_usd": 20.0,
+                "inventory_on_hand": 100 - day,
+            }
+            for day in range(days)
+        ]
+        decision = router.route(build_kpi_prompt(rows), task="summary")
+        assert decision.tier == TIER_STANDARD
+        assert decision.model_id == NOVA_LITE
+        assert decision.max_tokens == 500
+
+
+def test_vision_requests_skip_text_only_models():
+    router = ModelRouter(RoutingPolicy(task_tiers={}))
+    decision = router.route("hi", task="vision", requires_vision=True)
+    assert decision.model_id != NOVA_MICRO
+    assert decision.model_id == NOVA_LITE
+
+
+def test_routes_away_from_model_breaching_slo():
+    policy = RoutingPolicy(min_latency_samples=3)
+    router = ModelRouter(policy)
+    for _ in range(5):
+        router.record_latency(NOVA_MICRO, 5000.0)
+    assert router.route("hi").model_id == NOVA_LITE
+
+    for _ in range(5):
+        router.record_latency(NOVA_LITE, 9000.0)
+    # Both breach the SLO, so the fastest observed model wins.
+    assert router.route("hi").model_id == NOVA_MICRO
+
+
+def test_policy_overrides_from_environment(monkeypatch, tmp_path):
+    config = tmp_path / "routing.json"
+    config.write_text(json.dumps({"fallback_chain": [NOVA_LITE], "task_tiers": {"agent": TIER_STANDARD}}))
+    monkeypatch.setenv("MERLIN_MODEL_ROUTING", str(config))
+    policy = RoutingPolicy.load()
+    assert policy.fallback_chain == [NOVA_LITE]
+    assert policy.task_tiers["agent"] == TIER_STANDARD
+    assert policy.task_tiers["summary"] == TIER_STANDARD
+
+    monkeypatch.setenv("MERLIN_MODEL_ROUTING", '{"simple_max_chars": 10}')
+    assert RoutingPolicy.load().simple_max_chars == 10
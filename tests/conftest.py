@@ -31,10 +31,39 @@ def dummy_settings(monkeypatch):
     monkeypatch.setenv("MERLIN_CREATIVE_BUCKET", "merlin-test-creative")
     monkeypatch.setenv("MERLIN_RUNS_TABLE", "merlin-test-runs")
     monkeypatch.setenv("MERLIN_ACTIONS_TABLE", "merlin-test-actions")
+    monkeypatch.setenv("MERLIN_VIDEO_JOBS_TABLE", "merlin-test-video-jobs")
     yield
 
 
 @pytest.fixture
-def moto_aws():
+def moto_aws(monkeypatch):
+    # moto patches botocore only, so Arrow datasets must read through the boto3 filesystem.
+    monkeypatch.setenv("MERLIN_ARROW_S3", "boto3")
     with mock_aws():
         yield
+
+
+@pytest.fixture(autouse=True)
+def reset_bedrock_state():
+    """Keep router, quota, usage and circuit breaker state from leaking between tests."""
+    from aws_merlin_agent.bedrock import circuit, client, router
+
+    router.get_router.cache_clear()
+    client.get_limiter.cache_clear()
+    client.get_ledger.cache_clear()
+    circuit.reset_breakers()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def isolated_model_cache(tmp_path, monkeypatch):
+    """Give each test its own artifact cache directory, empty model/prediction caches and a cold registry cache."""
+    from aws_merlin_agent.models import registry
+    from aws_merlin_agent.models.inference import model_cache, model_holder, prediction_cache
+
+    monkeypatch.setenv("MERLIN_MODEL_CACHE_DIR", str(tmp_path / "model-cache"))
+    model_cache.loaded_models().clear()
+    registry.invalidate_cache()
+    prediction_cache.reset_prediction_cache()
+    yield
+    model_holder.reset_holders()
@@ -0,0 +1,84 @@
+import base64
+import json
+from unittest.mock import MagicMock, patch
+
+import boto3
+
+from aws_merlin_agent.creative import nova_assets
+from aws_merlin_agent.creative.asset_store import request_digest
+
+IMAGE = b"\x89PNG\r\n\x1a\n" + b"\x01" * 64
+
+
+def test_digest_ignores_key_order_and_tracks_seed():
+    body = nova_assets.build_canvas_request("red mug", seed=1)
+    reordered = json.loads(json.dumps(body, sort_keys=True))
+    assert request_digest("m", body) == request_digest("m", reordered)
+    assert request_digest("m", body) != request_digest("m", nova_assets.build_canvas_request("red mug", seed=2))
+
+
+def test_listing_image_is_stored_once_and_reused(dummy_settings, moto_aws):
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket="merlin-test-creative")
+    runtime = MagicMock()
+    runtime.invoke_model.return_value = {
+        "body": MagicMock(read=lambda: json.dumps({"images": [base64.b64encode(IMAGE).decode()]}).encode())
+    }
+
+    real_client = boto3.client
+    with patch(
+        "aws_merlin_agent.utils.aws.client",
+        side_effect=lambda service, region_name=None: runtime if service == "bedrock-runtime" else real_client(service, region_name=region_name),
+    ):
+        first = nova_assets.generate_listing_image("red mug", "SKU-1")
+        second = nova_assets.generate_listing_image("red mug", "SKU-1")
+
+    assert first["status"] == "success"
+    assert "image_base64" not in first
+    assert second == {**first, "status": "cached"}
+    assert runtime.invoke_model.call_count == 1
+
+    key = first["asset_uri"].split("s3://merlin-test-creative/", 1)[1]
+    assert s3.get_object(Bucket="merlin-test-creative", Key=key)["Body"].read() == IMAGE
+
+
+def _canvas_runtime(images_per_call):
+    runtime = MagicMock()
+    payload = {"images": [base64.b64encode(IMAGE).decode()] * images_per_call}
+    runtime.invoke_model.side_effect = lambda **kwargs: {"body": MagicMock(read=lambda: json.dumps(payload).encode())}
+    return runtime
+
+
+def _patched_clients(runtime):
+    real_client = boto3.client
+    return patch(
+        "aws_merlin_agent.utils.aws.client",
+        side_effect=lambda service, region_name=None: runtime if service == "bedrock-runtime" else real_client(service, region_name=region_name),
+    )
+
+
+def test_short_canvas_response_is_still_reused(dummy_settings, moto_aws):
+    boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="merlin-test-creative")
+    runtime = _canvas_runtime(images_per_call=2)
+
+    with _patched_clients(runtime):
+        first = nova_assets.generate_listing_variants("red mug", variants=4)
+        second = nova_assets.generate_listing_variants("red mug", variants=4)
+
+    assert len(first["asset_uris"]) == 2
+    assert second == {**first, "status": "cached"}
+    assert runtime.invoke_model.call_count == 1
+
+
+def test_incomplete_set_without_manifest_is_regenerated(dummy_settings, moto_aws):
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket="merlin-test-creative")
+    runtime = _canvas_runtime(images_per_call=3)
+    with _patched_clients(runtime):
+        first = nova_assets.generate_listing_variants("red mug", variants=3)
+        # Simulate a crash between the image uploads and the manifest write.
+        s3.delete_object(Bucket="merlin-test-creative", Key=f"assets/generated/{first['cache_key']}/manifest.json")
+        second = nova_assets.generate_listing_variants("red mug", variants=3)
+
+    assert second["status"] == "success"
+    assert runtime.invoke_model.call_count == 2
@@ -0,0 +1,108 @@
+import base64
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+import boto3
+import pytest
+
+from aws_merlin_agent.creative import batch_pipeline, nova_assets
+
+CORRUPT_IMAGE = b"\x89PNG\r\n\x1a\n" + b"\x02" * 64
+
+
+@pytest.fixture
+def image():
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), (240, 240, 240)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def creative_env(dummy_settings, moto_aws, monkeypatch):
+    monkeypatch.setenv("MERLIN_BEDROCK_QUOTAS", '{"quotas": {"amazon.nova-canvas-v1:0": {"rpm": 6000, "tpm": 0}}}')
+    boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="merlin-test-creative")
+    runtime = MagicMock()
+    real_client = boto3.client
+    with patch(
+        "aws_merlin_agent.utils.aws.client",
+        side_effect=lambda service, region_name=None: runtime if service == "bedrock-runtime" else real_client(service, region_name=region_name),
+    ):
+        yield runtime
+
+
+def _canvas(image, broken=(), corrupt=()):
+    def invoke(**kwargs):
+        body = json.loads(kwargs["body"])
+        text = body["textToImageParams"]["text"]
+        if any(word in text for word in broken):
+            raise RuntimeError("content filtered")
+        count = body["imageGenerationConfig"]["numberOfImages"]
+        data = CORRUPT_IMAGE if any(word in text for word in corrupt) else image
+        payload = {"images": [base64.b64encode(data).decode()] * count}
+        return {"body": MagicMock(read=lambda: json.dumps(payload).encode())}
+
+    return invoke
+
+
+def test_quota_concurrency_follows_limits():
+    assert batch_pipeline.quota_concurrency() == 2  # 10 rpm at 90% headroom, 10s per image
+    assert batch_pipeline.quota_concurrency(latency_s=600, ceiling=4) == 4
+
+
+def test_batch_generates_variants_and_resumes(creative_env, tmp_path, image):
+    entries = [{"sku": f"SKU-{i}", "prompt": f"mug {i}"} for i in range(2)] + [{"sku": "SKU-X", "prompt": "BROKEN mug"}]
+    output = tmp_path / "results.jsonl"
+
+    creative_env.invoke_model.side_effect = _canvas(image, broken=("BROKEN",))
+    first = batch_pipeline.run_creative_batch(entries, output, variants=3, max_workers=2)
+
+    assert first["counts"] == {"skipped": 0, "success": 2, "error": 1}
+    records = {record["sku"]: record for record in map(json.loads, output.read_text().splitlines())}
+    assert len(records["SKU-0"]["asset_uris"]) == 3
+    assert creative_env.invoke_model.call_count == 3
+
+    creative_env.invoke_model.side_effect = _canvas(image)
+    second = batch_pipeline.run_creative_batch(entries, output, variants=3, max_workers=2)
+
+    assert second["counts"] == {"skipped": 2, "success": 1}
+    assert creative_env.invoke_model.call_count == 4
+
+
+def test_undecodable_image_fails_only_its_own_entry(creative_env, tmp_path, image):
+    entries = [{"sku": "SKU-0", "prompt": "mug"}, {"sku": "SKU-X", "prompt": "GARBLED mug"}, {"sku": "SKU-1", "prompt": "cup"}]
+    output = tmp_path / "results.jsonl"
+    creative_env.invoke_model.side_effect = _canvas(image, corrupt=("GARBLED",))
+
+    summary = batch_pipeline.run_creative_batch(entries, output, thumbnail_size=32, max_workers=1)
+
+    assert summary["counts"] == {"skipped": 0, "success": 2, "error": 1}
+    records = {record["sku"]: record for record in map(json.loads, output.read_text().splitlines())}
+    assert records["SKU-X"]["status"] == "error"
+    assert records["SKU-X"]["error"]
+    assert len(records["SKU-1"]["thumbnail_uris"]) == 1
+
+
+def test_failed_analysis_is_retried_on_resume(creative_env, tmp_path, image, monkeypatch):
+    entries = [{"sku": "SKU-0", "prompt": "mug", "questions": ["Is the background white?"]}]
+    output = tmp_path / "results.jsonl"
+    creative_env.invoke_model.side_effect = _canvas(image)
+    analyses = []
+
+    def analyze(image_bytes, questions):
+        analyses.append(questions)
+        if len(analyses) == 1:
+            return nova_assets.VisionAnswers({q: "Analysis failed: throttled" for q in questions}, error="throttled")
+        return nova_assets.VisionAnswers({q: "Yes" for q in questions})
+
+    monkeypatch.setattr(nova_assets, "analyze_product_image", analyze)
+    first = batch_pipeline.run_creative_batch(entries, output, max_workers=1)
+    assert first["counts"] == {"skipped": 0, "analysis_error": 1}
+    record = json.loads(output.read_text().splitlines()[0])
+    assert record["status"] == "analysis_error" and record["error"] == "throttled"
+
+    second = batch_pipeline.run_creative_batch(entries, output, max_workers=1)
+    assert second["counts"] == {"skipped": 0, "cached": 1}
+    assert len(analyses) == 2
+    assert creative_env.invoke_model.call_count == 1  # the images were reused
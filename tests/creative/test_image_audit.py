@@ -0,0 +1,111 @@
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+import boto3
+import pytest
+
+from aws_merlin_agent.creative import image_audit, nova_assets
+
+PHOTO_A = b"\x89PNG\r\n\x1a\n" + b"\x0a" * 64
+PHOTO_B = b"\xff\xd8\xff\xe0" + b"\x0b" * 64
+
+
+@pytest.fixture
+def photos():
+    Image = pytest.importorskip("PIL.Image")
+    gradient = Image.linear_gradient("L").resize((128, 128)).convert("RGB")
+    png, jpeg = io.BytesIO(), io.BytesIO()
+    gradient.save(png, format="PNG")
+    gradient.rotate(90).save(jpeg, format="JPEG")
+    return png.getvalue(), jpeg.getvalue()
+
+
+def _fake_runtime(text):
+    runtime = MagicMock()
+    payload = {"output": {"message": {"content": [{"text": text}]}}}
+    runtime.invoke_model.side_effect = lambda **kwargs: {"body": MagicMock(read=lambda: json.dumps(payload).encode())}
+    return runtime
+
+
+def _patched_clients(runtime):
+    real_client = boto3.client
+    return patch(
+        "aws_merlin_agent.utils.aws.client",
+        side_effect=lambda service, region_name=None: runtime if service == "bedrock-runtime" else real_client(service, region_name=region_name),
+    )
+
+
+def test_group_hashes_collapses_near_duplicates():
+    hashes = ["p:ffffffffffffffff", "p:fffffffffffffff0", "p:0000000000000000", "s:abc", "s:abc"]
+    assert image_audit.group_hashes(hashes, max_distance=4) == [0, 0, 2, 3, 3]
+    assert image_audit.group_hashes(hashes, max_distance=0) == [0, 1, 2, 3, 3]
+
+
+def test_perceptual_hash_tolerates_recompression():
+    Image = pytest.importorskip("PIL.Image")
+    img = Image.linear_gradient("L").resize((400, 400)).convert("RGB")
+    png, jpeg = io.BytesIO(), io.BytesIO()
+    img.save(png, format="PNG")
+    img.resize((200, 200)).save(jpeg, format="JPEG", quality=60)
+
+    hashes = [image_audit.image_hash(png.getvalue()), image_audit.image_hash(jpeg.getvalue())]
+    assert image_audit.group_hashes(hashes) == [0, 0]
+
+
+def test_audit_analyzes_unique_images_once_and_caches(dummy_settings, moto_aws, monkeypatch, photos):
+    monkeypatch.setattr(image_audit, "Image", None)  # exact SHA-256 grouping
+    photo_a, photo_b = photos
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket="merlin-test-creative")
+    s3.put_object(Bucket="merlin-test-creative", Key="listings/sku-3.png", Body=photo_a)
+    runtime = _fake_runtime("Clean white background")
+    catalog = {"SKU-1": photo_a, "SKU-2": photo_b, "SKU-3": "listings/sku-3.png", "SKU-4": photo_b}
+
+    with _patched_clients(runtime):
+        first = image_audit.audit_catalog_images(catalog, ["Is the background white?"])
+        second = image_audit.audit_catalog_images(catalog, ["Is the background white?"])
+
+    assert first["stats"] == {"hash_mode": "exact", "exact_fallbacks": 0, "listings": 4, "unique_images": 2, "analyzed": 2, "cache_hits": 0}
+    assert first["results"]["SKU-3"]["duplicate_of"] == "SKU-1"
+    assert first["results"]["SKU-4"]["answers"] == {"Is the background white?": "Clean white background"}
+    assert runtime.invoke_model.call_count == 2
+    assert second["stats"]["cache_hits"] == 2
+    assert second["results"]["SKU-2"]["source"] == "cached"
+
+
+def test_undecodable_image_falls_back_to_exact_hash(dummy_settings, moto_aws, photos):
+    photo_a, photo_b = photos
+    boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="merlin-test-creative")
+    catalog = {"SKU-1": photo_a, "SKU-2": PHOTO_B, "SKU-3": photo_b}
+
+    with _patched_clients(_fake_runtime("Looks fine")):
+        report = image_audit.audit_catalog_images(catalog, ["Is the background white?"])
+
+    assert report["stats"]["hash_mode"] == "mixed"
+    assert report["stats"]["exact_fallbacks"] == 1
+    assert report["stats"]["analyzed"] == 3
+    assert report["results"]["SKU-2"]["image_hash"].startswith("s:")
+    assert report["results"]["SKU-3"]["image_hash"].startswith("p:")
+
+
+def test_failed_analysis_is_reported_from_the_error_field(dummy_settings, moto_aws, monkeypatch):
+    monkeypatch.setattr(image_audit, "Image", None)
+    boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="merlin-test-creative")
+    question = "What does the label say?"
+
+    def analyze(image_bytes, questions):
+        if image_bytes == PHOTO_A:
+            return nova_assets.VisionAnswers({question: "Analysis failed: throttled"}, error="throttled")
+        return nova_assets.VisionAnswers({question: "Analysis failed: smudged print"})  # a real answer
+
+    monkeypatch.setattr(nova_assets, "analyze_product_image", analyze)
+    report = image_audit.audit_catalog_images({"SKU-1": PHOTO_A, "SKU-2": PHOTO_B}, [question])
+
+    assert report["results"]["SKU-1"]["source"] == "error"
+    assert report["results"]["SKU-1"]["error"] == "throttled"
+    assert report["results"]["SKU-2"]["source"] == "analyzed"
+    assert "error" not in report["results"]["SKU-2"]
+    cache = image_audit.AuditCache(image_audit.AssetStore("merlin-test-creative", "us-east-1"))
+    assert cache.get(report["results"]["SKU-1"]["image_hash"], [question]) is None
+    assert cache.get(report["results"]["SKU-2"]["image_hash"], [question]) is not None
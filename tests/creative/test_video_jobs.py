@@ -0,0 +1,112 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import boto3
+import pytest
+
+from aws_merlin_agent.creative import nova_assets, video_jobs
+from aws_merlin_agent.creative.video_jobs import DynamoVideoJobStore, LocalVideoJobStore, VideoJob
+
+
+@pytest.fixture
+def runtime():
+    with patch("aws_merlin_agent.utils.aws.client") as mock_client:
+        mock_runtime = MagicMock()
+        mock_client.return_value = mock_runtime
+        yield mock_runtime
+
+
+def _arn(name):
+    return f"arn:aws:bedrock:us-east-1:123456789012:async-invoke/{name}"
+
+
+def test_submit_returns_without_waiting_for_render(runtime, dummy_settings, tmp_path, monkeypatch):
+    monkeypatch.setenv("MERLIN_VIDEO_JOBS_DIR", str(tmp_path))
+    runtime.start_async_invoke.return_value = {"invocationArn": _arn("job-1")}
+
+    result = nova_assets.generate_promotional_video("Blue Mug", ["ceramic", "dishwasher safe"])
+
+    assert result["status"] == "submitted"
+    assert result["job_id"] == _arn("job-1")
+    kwargs = runtime.start_async_invoke.call_args.kwargs
+    assert kwargs["modelId"] == "amazon.nova-reel-v1:0"
+    assert kwargs["outputDataConfig"]["s3OutputDataConfig"]["s3Uri"] == "s3://merlin-test-creative/videos/blue-mug/"
+    assert LocalVideoJobStore(tmp_path).get(_arn("job-1")).status == "InProgress"
+
+
+def test_bulk_submit_and_collect(runtime, dummy_settings, tmp_path, monkeypatch):
+    # Default Reel quota paces submissions several seconds apart; lift it for the test.
+    monkeypatch.setenv("MERLIN_BEDROCK_QUOTAS", '{"quotas": {"amazon.nova-reel-v1:0": {"rpm": 6000, "tpm": 0}}}')
+    store = LocalVideoJobStore(tmp_path)
+    runtime.start_async_invoke.side_effect = [{"invocationArn": _arn(f"job-{i}")} for i in range(3)]
+    jobs = video_jobs.submit_video_jobs(
+        [{"product_name": f"SKU-{i}", "key_features": ["fast"]} for i in range(3)], store=store
+    )
+    assert len(jobs) == 3
+
+    paginator = MagicMock()
+    paginator.paginate.return_value = [
+        {
+            "asyncInvokeSummaries": [
+                {
+                    "invocationArn": _arn("job-0"),
+                    "status": "Completed",
+                    "outputDataConfig": {"s3OutputDataConfig": {"s3Uri": "s3://merlin-test-creative/videos/sku-0/abc"}},
+                },
+                {"invocationArn": _arn("job-1"), "status": "Failed", "failureMessage": "blocked"},
+            ]
+        }
+    ]
+    runtime.get_paginator.return_value = paginator
+    runtime.get_async_invoke.return_value = {"invocationArn": _arn("job-2"), "status": "InProgress"}
+
+    finished = video_jobs.collect_completed_videos(store)
+
+    assert finished[_arn("job-0")]["asset_uri"] == "s3://merlin-test-creative/videos/sku-0/abc/output.mp4"
+    assert finished[_arn("job-1")]["failure_message"] == "blocked"
+    assert _arn("job-2") not in finished
+    runtime.get_async_invoke.assert_called_once_with(invocationArn=_arn("job-2"))
+    # The listing window starts before the oldest job's locally recorded time, so it is included.
+    oldest = min(datetime.fromisoformat(job.submitted_at) for job in jobs)
+    assert paginator.paginate.call_args.kwargs["submitTimeAfter"] <= oldest - video_jobs.LIST_SUBMIT_TIME_MARGIN
+
+
+def test_dynamo_store_queries_status_index(dummy_settings, moto_aws):
+    boto3.client("dynamodb", region_name="us-east-1").create_table(
+        TableName="merlin-test-video-jobs",
+        KeySchema=[{"AttributeName": "job_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[
+            {"AttributeName": "job_id", "AttributeType": "S"},
+            {"AttributeName": "status", "AttributeType": "S"},
+            {"AttributeName": "submitted_at", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": video_jobs.STATUS_INDEX,
+                "KeySchema": [
+                    {"AttributeName": "status", "KeyType": "HASH"},
+                    {"AttributeName": "submitted_at", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    store = DynamoVideoJobStore("merlin-test-video-jobs", "us-east-1")
+    store.put(VideoJob(job_id="a", product_name="A", prompt="p", output_uri="s3://b/a/", submitted_at="2024-01-02"))
+    for job_id, submitted_at in (("c", "2024-01-03"), ("b", "2024-01-01")):
+        store.put(
+            VideoJob(
+                job_id=job_id,
+                product_name=job_id.upper(),
+                prompt="p",
+                output_uri=f"s3://b/{job_id}/",
+                status="Completed",
+                submitted_at=submitted_at,
+            )
+        )
+
+    assert store.get("a").product_name == "A"
+    with patch.object(store._table.meta.client, "scan", side_effect=AssertionError("status listing scanned")):
+        assert [job.job_id for job in store.list_jobs("Completed")] == ["b", "c"]
+    assert sorted(job.job_id for job in store.list_jobs()) == ["a", "b", "c"]
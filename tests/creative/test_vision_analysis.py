@@ -0,0 +1,105 @@
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from aws_merlin_agent.creative import nova_assets
+from aws_merlin_agent.creative.image_prep import detect_image_format, prepare_image
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+JPEG_HEADER = b"\xff\xd8\xff\xe0" + b"\x00" * 32
+
+
+def _image_bytes(fmt):
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), (30, 90, 200)).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def _nova(text):
+    payload = {"output": {"message": {"content": [{"text": text}]}}, "usage": {"inputTokens": 10, "outputTokens": 5}}
+    return {"body": MagicMock(read=lambda: json.dumps(payload).encode())}
+
+
+@pytest.fixture
+def runtime():
+    with patch("aws_merlin_agent.bedrock.client.aws.client") as mock_client:
+        mock_runtime = MagicMock()
+        mock_client.return_value = mock_runtime
+        yield mock_runtime
+
+
+def test_detects_format_from_magic_bytes():
+    assert detect_image_format(PNG_HEADER) == "png"
+    assert detect_image_format(JPEG_HEADER) == "jpeg"
+    assert detect_image_format(b"GIF89a....") == "gif"
+    assert detect_image_format(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "webp"
+    with pytest.raises(ValueError):
+        detect_image_format(b"not an image")
+
+
+def test_prepare_image_downscales_when_pillow_available():
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.new("RGB", (3000, 1500), (200, 30, 30)).save(buffer, format="PNG")
+
+    prepared = prepare_image(buffer.getvalue(), max_dimension=512)
+
+    assert prepared.format == "jpeg"
+    with Image.open(io.BytesIO(prepared.data)) as img:
+        assert max(img.size) == 512
+
+
+def test_prepare_image_returns_original_when_pillow_cannot_decode():
+    pytest.importorskip("PIL.Image")
+
+    prepared = prepare_image(JPEG_HEADER)
+
+    assert prepared.data == JPEG_HEADER
+    assert prepared.format == "jpeg"
+
+
+def test_parse_vision_answers_handles_json_and_numbered_lines():
+    questions = ["What color?", "Any text?"]
+    fenced = '```json\n{"1": "Red", "2": "No"}\n```'
+    assert nova_assets.parse_vision_answers(fenced, questions) == {"What color?": "Red", "Any text?": "No"}
+    assert nova_assets.parse_vision_answers("1. Red\n2) No", questions) == {"What color?": "Red", "Any text?": "No"}
+
+
+def test_single_mode_asks_all_questions_in_one_call(runtime):
+    runtime.invoke_model.return_value = _nova('{"1": "Blue mug", "2": "Ceramic"}')
+
+    answers = nova_assets.analyze_product_image(_image_bytes("JPEG"), ["What is it?", "What material?"])
+
+    assert answers == {"What is it?": "Blue mug", "What material?": "Ceramic"}
+    assert answers.error is None
+    assert runtime.invoke_model.call_count == 1
+    body = json.loads(runtime.invoke_model.call_args.kwargs["body"])
+    assert body["messages"][0]["content"][0]["image"]["format"] == "jpeg"
+
+
+def test_single_mode_retries_missing_answers_individually(runtime):
+    runtime.invoke_model.side_effect = [_nova('{"1": "Blue mug"}'), _nova("Ceramic")]
+
+    answers = nova_assets.analyze_product_image(_image_bytes("PNG"), ["What is it?", "What material?"])
+
+    assert answers == {"What is it?": "Blue mug", "What material?": "Ceramic"}
+    assert runtime.invoke_model.call_count == 2
+
+
+def test_per_question_mode_issues_one_call_per_question(runtime):
+    runtime.invoke_model.side_effect = lambda **kwargs: _nova("answer")
+
+    answers = nova_assets.analyze_product_image(_image_bytes("PNG"), ["a?", "b?", "c?"], mode="per_question")
+
+    assert answers == {"a?": "answer", "b?": "answer", "c?": "answer"}
+    assert runtime.invoke_model.call_count == 3
+
+
+def test_failed_analysis_sets_error_field(runtime, dummy_settings):
+    answers = nova_assets.analyze_product_image(b"not an image", ["What is it?"])
+
+    assert answers.error
+    assert answers["What is it?"].startswith("Analysis failed")
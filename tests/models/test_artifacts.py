@@ -0,0 +1,74 @@
+import boto3
+import numpy as np
+import pandas as pd
+import pytest
+
+from aws_merlin_agent.models.artifacts import ArtifactMeta, deserialize, format_of, meta_key
+from aws_merlin_agent.models.inference.local_runner import LocalDemandForecaster
+from aws_merlin_agent.models.inference.model_cache import ArtifactCache
+from aws_merlin_agent.models.training.demand_forecast import train, upload_model
+
+BUCKET = "merlin-test-curated"
+
+
+def _sales(days=40):
+    rng = np.random.default_rng(11)
+    units = rng.integers(5, 30, days)
+    return pd.DataFrame(
+        {
+            "seller_id": ["seller-123"] * days,
+            "sku": ["SKU-001"] * days,
+            "date": pd.date_range("2024-01-01", periods=days).strftime("%Y-%m-%d"),
+            "units_sold": units,
+            "net_revenue": units * 20.0,
+            "ad_spend": rng.uniform(10, 30, days),
+            "inventory_on_hand": rng.integers(40, 120, days),
+        }
+    )
+
+
+def test_format_and_sidecar_keys():
+    assert format_of("models/dev/model.json") == ("json", "none")
+    assert format_of("models/dev/model.ubj") == ("ubj", "none")
+    assert format_of("models/dev/model.ubj.gz") == ("ubj", "gzip")
+    assert meta_key("models/dev/model.ubj.gz") == "models/dev/model.meta.json"
+    with pytest.raises(ValueError):
+        format_of("models/dev/model.pkl")
+
+
+@pytest.mark.parametrize("fmt,compression", [("json", "none"), ("ubj", "none"), ("ubj", "gzip")])
+def test_every_format_round_trips(fmt, compression):
+    result = train(_sales())
+    restored = deserialize(result.to_bytes(fmt, compression))
+    X = pd.DataFrame(np.ones((3, len(result.feature_names))), columns=result.feature_names)
+    np.testing.assert_allclose(restored.predict(X), result.model.predict(X))
+    assert restored.get_booster().feature_names == result.feature_names
+
+
+def test_compressed_ubj_is_smaller_than_json():
+    result = train(_sales())
+    assert len(result.to_bytes("ubj", "gzip")) < len(result.to_bytes("json")) / 2
+
+
+def test_uploaded_artifact_has_sidecar_and_loads_through_cache(dummy_settings, moto_aws):
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket=BUCKET)
+    result = train(_sales())
+    result.data_watermark = "2024-02-09"
+
+    uri = upload_model(result, BUCKET, "models/test/demand_forecast/model.ubj.gz", "us-east-1")
+    meta = ArtifactMeta.from_json(
+        s3.get_object(Bucket=BUCKET, Key="models/test/demand_forecast/model.meta.json")["Body"].read()
+    )
+    assert (meta.format, meta.compression) == ("ubj", "gzip")
+    assert meta.feature_names == result.feature_names
+    assert meta.dtypes["lag_days"] == "float32" and meta.data_watermark == "2024-02-09"
+
+    assert ArtifactCache(region="us-east-1").fetch(uri).name.endswith(".ubj.gz")
+    forecaster = LocalDemandForecaster(uri, region="us-east-1")
+    rows = [dict.fromkeys(result.feature_names, 1.0)]
+    np.testing.assert_allclose(
+        forecaster.predict({"instances": rows})["predictions"],
+        result.model.predict(pd.DataFrame(rows)),
+        rtol=1e-6,
+    )
@@ -0,0 +1,88 @@
+import io
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from aws_merlin_agent.models.inference.batching_client import (
+    CONTENT_CSV,
+    CONTENT_JSON,
+    CONTENT_NPY,
+    BatchingForecastClient,
+    decode_predictions,
+)
+
+
+FEATURES = ["lag_days", "units_lag"]
+
+
+def _payload(n, base):
+    return {"instances": [{"lag_days": i, "units_lag": base + i} for i in range(n)]}
+
+
+class FakeEndpoint:
+    """Echoes units_lag back as the prediction so per-SKU splitting can be checked."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def invoke_endpoint(self, **kwargs):
+        with self.lock:
+            self.calls.append(kwargs)
+        body, content_type = kwargs["Body"], kwargs["ContentType"]
+        if content_type == CONTENT_JSON:
+            values = [row["units_lag"] for row in json.loads(body)["instances"]]
+        elif content_type == CONTENT_CSV:
+            values = np.loadtxt(io.StringIO(body.decode()), delimiter=",", ndmin=2)[:, 1].tolist()
+        else:
+            values = np.load(io.BytesIO(body))[:, 1]
+            buffer = io.BytesIO()
+            np.save(buffer, values)
+            return {"Body": MagicMock(read=lambda: buffer.getvalue()), "ContentType": CONTENT_NPY}
+        return {"Body": MagicMock(read=lambda: "\n".join(map(str, values)).encode()), "ContentType": "text/csv"}
+
+
+@pytest.mark.parametrize("content_type", [CONTENT_JSON, CONTENT_CSV, CONTENT_NPY])
+def test_coalesces_skus_and_splits_predictions(dummy_settings, content_type):
+    endpoint = FakeEndpoint()
+    with patch("aws_merlin_agent.models.inference.batching_client.aws.client", return_value=endpoint):
+        client = BatchingForecastClient(
+            "demand", feature_order=FEATURES, content_type=content_type, max_batch_instances=4
+        )
+        results = client.predict_many({"A": _payload(3, 100), "B": _payload(2, 200), "C": {"instances": []}})
+
+    assert results["A"]["predictions"] == [100, 101, 102]
+    assert results["B"]["predictions"] == [200, 201]
+    assert results["C"]["predictions"] == []
+    assert len(endpoint.calls) == 2  # 5 instances, at most 4 per request
+    assert {call["ContentType"] for call in endpoint.calls} == {content_type}
+
+
+def test_decode_predictions_accepts_common_shapes():
+    assert decode_predictions(b'{"predictions": [1, 2]}', CONTENT_JSON) == [1.0, 2.0]
+    assert decode_predictions(b'[{"score": 3}]', CONTENT_JSON) == [3.0]
+    assert decode_predictions(b"1.5,2.5", CONTENT_CSV) == [1.5, 2.5]
+    assert decode_predictions(b"", CONTENT_JSON) == []
+    assert decode_predictions(b"  \n", CONTENT_CSV) == []
+
+
+@pytest.mark.parametrize("content_type", [CONTENT_CSV, CONTENT_NPY])
+def test_columns_follow_feature_order_not_payload_key_order(dummy_settings, content_type):
+    endpoint = FakeEndpoint()
+    reordered = {"instances": [{"units_lag": 300 + i, "lag_days": i} for i in range(2)]}
+    with patch("aws_merlin_agent.models.inference.batching_client.aws.client", return_value=endpoint):
+        client = BatchingForecastClient("demand", feature_order=FEATURES, content_type=content_type)
+        results = client.predict_many({"A": reordered, "B": _payload(2, 200)})
+        with pytest.raises(ValueError, match="units_lag"):
+            client.predict_many({"C": {"instances": [{"lag_days": 1}]}})
+
+    assert results["A"]["predictions"] == [300, 301]
+    assert results["B"]["predictions"] == [200, 201]
+
+
+def test_feature_order_is_required(dummy_settings):
+    with pytest.raises(TypeError):
+        BatchingForecastClient("demand")
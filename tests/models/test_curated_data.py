@@ -0,0 +1,81 @@
+import io
+
+import boto3
+import pandas as pd
+import pyarrow.fs as pafs
+import pytest
+
+from aws_merlin_agent.models.training import curated_data
+from aws_merlin_agent.models.training.curated_data import curated_filesystem, iter_sales_batches, load_sales_table
+
+BUCKET = "merlin-test-curated"
+DATES = ["2024-02-01", "2024-02-02", "2024-02-03"]
+
+
+@pytest.fixture
+def partitioned_sales(dummy_settings, moto_aws):
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket=BUCKET)
+    for day, sale_date in enumerate(DATES):
+        frame = pd.DataFrame(
+            {
+                "seller_id": ["seller-123"] * 4,
+                "sku": [f"SKU-00{i}" for i in range(4)],
+                "date": [sale_date] * 4,
+                "units_sold": [10 + day] * 4,
+                "net_revenue_usd": [200.0] * 4,
+                "ad_spend_usd": [20.0] * 4,
+                "inventory_on_hand": [50] * 4,
+                "notes": ["unused"] * 4,
+            }
+        )
+        buffer = io.BytesIO()
+        frame.to_parquet(buffer, index=False)
+        s3.put_object(Bucket=BUCKET, Key=f"sales_fact/sale_date={sale_date}/part-0.parquet", Body=buffer.getvalue())
+    s3.put_object(Bucket=BUCKET, Key="sales_fact/_SUCCESS", Body=b"")
+    return s3
+
+
+def test_window_prunes_partitions_and_columns(partitioned_sales, mocker):
+    client = curated_data.aws.client("s3", region_name="us-east-1", max_pool_connections=32)
+    spy = mocker.spy(client, "get_object")
+
+    table = load_sales_table(BUCKET, region="us-east-1", start_date="2024-02-02", end_date="2024-02-03")
+
+    assert table.num_rows == 8
+    assert "notes" not in table.column_names
+    assert sorted(set(table.column("sale_date").to_pylist())) == ["2024-02-02", "2024-02-03"]
+    reads = {}
+    for call in spy.call_args_list:
+        assert "Range" in call.kwargs
+        reads[call.kwargs["Key"]] = reads.get(call.kwargs["Key"], 0) + 1
+    # Discovery reads one footer for the schema; the pruned partition's column data is never fetched.
+    assert reads.get("sales_fact/sale_date=2024-02-01/part-0.parquet", 0) <= 1
+    assert reads["sales_fact/sale_date=2024-02-02/part-0.parquet"] >= 2
+
+
+def test_batches_stream_requested_columns(partitioned_sales):
+    batches = list(
+        iter_sales_batches(BUCKET, region="us-east-1", columns=["sku", "units_sold", "sale_date"], batch_size=2)
+    )
+    assert sum(batch.num_rows for batch in batches) == 12
+    assert all(batch.num_rows <= 2 for batch in batches)
+    assert batches[0].schema.names == ["sku", "units_sold", "sale_date"]
+
+
+def test_empty_window_raises(partitioned_sales):
+    with pytest.raises(FileNotFoundError):
+        load_sales_table(BUCKET, region="us-east-1", start_date="2025-01-01")
+
+
+def test_native_s3_is_the_default_filesystem(monkeypatch):
+    for name in ("MERLIN_ARROW_S3", "AWS_ENDPOINT_URL", "AWS_ENDPOINT_URL_S3"):
+        monkeypatch.delenv(name, raising=False)
+    assert isinstance(curated_filesystem("us-east-1"), pafs.S3FileSystem)
+
+    monkeypatch.setenv("AWS_ENDPOINT_URL_S3", "http://localhost:4566")
+    assert isinstance(curated_filesystem("us-east-1"), pafs.PyFileSystem)
+
+    monkeypatch.delenv("AWS_ENDPOINT_URL_S3")
+    monkeypatch.setenv("MERLIN_ARROW_S3", "boto3")
+    assert isinstance(curated_filesystem("us-east-1"), pafs.PyFileSystem)
@@ -0,0 +1,54 @@
+import boto3
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from xgboost import XGBRegressor
+
+from aws_merlin_agent.models.training.demand_forecast import train, upload_model
+
+
+def _sales(days=40):
+    rng = np.random.default_rng(5)
+    units = rng.integers(5, 30, days)
+    return pd.DataFrame(
+        {
+            "seller_id": ["seller-123"] * days,
+            "sku": ["SKU-001"] * days,
+            "date": pd.date_range("2024-01-01", periods=days).strftime("%Y-%m-%d"),
+            "units_sold": units,
+            "net_revenue": units * 20.0,
+            "ad_spend": rng.uniform(10, 30, days),
+            "inventory_on_hand": rng.integers(40, 120, days),
+        }
+    )
+
+
+def test_train_accepts_frames_tables_and_paths(tmp_path):
+    frame = _sales()
+    path = tmp_path / "sales.parquet"
+    frame.to_parquet(path, index=False)
+
+    from_frame = train(frame)
+    from_table = train(pa.Table.from_pandas(frame))
+    from_path = train(str(path), str(tmp_path / "model.json"))
+
+    assert from_frame.rows == 40
+    assert from_frame.feature_names == list(from_frame.booster.feature_names)
+    assert from_frame.r2 == from_table.r2 == from_path.r2
+    assert (tmp_path / "model.json").exists()
+
+
+def test_upload_model_streams_loadable_artifact(dummy_settings, moto_aws, tmp_path):
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket="merlin-test-curated")
+    result = train(_sales())
+
+    uri = upload_model(result, "merlin-test-curated", "models/test/model.json", "us-east-1")
+    assert uri == "s3://merlin-test-curated/models/test/model.json"
+
+    local = tmp_path / "downloaded.json"
+    s3.download_file("merlin-test-curated", "models/test/model.json", str(local))
+    restored = XGBRegressor()
+    restored.load_model(str(local))
+    X = pd.DataFrame(np.ones((2, len(result.feature_names))), columns=result.feature_names)
+    np.testing.assert_allclose(restored.predict(X), result.model.predict(X))
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from xgboost import XGBRegressor
+
+from aws_merlin_agent.models.inference.explanations import format_drivers
+from aws_merlin_agent.models.inference.local_runner import LocalDemandForecaster
+
+FEATURES = ["ad_spend", "inventory_on_hand", "lag_days"]
+
+
+@pytest.fixture
+def forecaster(tmp_path):
+    rng = np.random.default_rng(3)
+    frame = pd.DataFrame(rng.random((200, 3)), columns=FEATURES)
+    model = XGBRegressor(n_estimators=20, max_depth=3)
+    model.fit(frame, 30 * frame["ad_spend"] - 5 * frame["inventory_on_hand"])
+    path = tmp_path / "model.json"
+    model.save_model(str(path))
+    return LocalDemandForecaster.from_path(path, nthread=1), model, frame
+
+
+def test_explain_many_uses_one_call_and_matches_predictions(forecaster, mocker):
+    runner, model, frame = forecaster
+    payloads = {
+        "SKU-1": {"instances": frame.iloc[:7].to_dict(orient="records")},
+        "SKU-EMPTY": {"instances": []},
+        "SKU-2": {"instances": frame.iloc[7:10][list(reversed(FEATURES))].to_dict(orient="list")},
+    }
+    spy = mocker.spy(runner.booster, "predict")
+    explanations = runner.explain_many(payloads, top_k=2)
+    assert spy.call_count == 1
+
+    assert list(explanations) == ["SKU-1", "SKU-EMPTY", "SKU-2"]
+    assert explanations["SKU-EMPTY"]["top_drivers"] == []
+    np.testing.assert_allclose(
+        explanations["SKU-1"]["prediction"], model.predict(frame.iloc[:7][FEATURES]).mean(), rtol=1e-3
+    )
+    np.testing.assert_allclose(
+        explanations["SKU-2"]["prediction"], model.predict(frame.iloc[7:10][FEATURES]).mean(), rtol=1e-3
+    )
+    drivers = explanations["SKU-1"]["top_drivers"]
+    assert len(drivers) == 2
+    assert drivers[0]["feature"] == "ad_spend"
+    assert abs(drivers[0]["contribution"]) >= abs(drivers[1]["contribution"])
+
+
+def test_format_drivers_is_compact(forecaster):
+    runner, _, frame = forecaster
+    explanation = runner.explain({"instances": frame.iloc[:3].to_dict(orient="records")}, top_k=1)
+    text = format_drivers({"SKU-1": explanation, "SKU-2": {"prediction": None, "top_drivers": []}})
+    first, second = text.splitlines()
+    assert first.startswith("SKU-1: ~") and "ad_spend" in first
+    assert second == "SKU-2: no data"
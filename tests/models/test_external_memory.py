@@ -0,0 +1,114 @@
+import io
+
+import boto3
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+import xgboost as xgb
+
+from aws_merlin_agent.features.engineering import FORECAST_FEATURES
+from aws_merlin_agent.models.registry import latest_model
+from aws_merlin_agent.models.training.demand_forecast import build_training_matrix
+from aws_merlin_agent.models.training.external_memory import SalesBatchIter, train_external_memory
+from aws_merlin_agent.models.training.pipeline import run_training_job
+
+BUCKET = "merlin-test-curated"
+
+
+def _sales(rows=300, start_day=1):
+    rng = np.random.default_rng(start_day)
+    return pd.DataFrame(
+        {
+            "seller_id": ["seller-123"] * rows,
+            "sku": [f"SKU-{i % 5}" for i in range(rows)],
+            "date": [f"2024-03-{start_day + i // 50:02d}" for i in range(rows)],
+            "units_sold": rng.integers(1, 40, rows),
+            "net_revenue_usd": rng.random(rows) * 500,
+            "ad_spend_usd": rng.random(rows) * 50,
+            "inventory_on_hand": rng.integers(0, 120, rows),
+            "sale_date": [f"2024-03-{start_day + i // 50:02d}" for i in range(rows)],
+        }
+    )
+
+
+def test_batch_features_match_in_memory_matrix():
+    sales = _sales()
+    table = pa.Table.from_pandas(sales, preserve_index=False)
+    iterator = SalesBatchIter(lambda: table.to_batches(max_chunksize=37), lag_offset=10, holdout_every=0)
+    chunks = []
+    while iterator.next(lambda data, label, feature_names: chunks.append((data, label))):
+        pass
+
+    X, y = build_training_matrix(sales.rename(columns={"net_revenue_usd": "net_revenue", "ad_spend_usd": "ad_spend"}), 10)
+    assert list(X.columns) == FORECAST_FEATURES
+    np.testing.assert_allclose(np.concatenate([c[0] for c in chunks]), X.to_numpy(dtype=np.float32), rtol=1e-6)
+    np.testing.assert_allclose(np.concatenate([c[1] for c in chunks]), y.to_numpy(dtype=np.float32))
+    assert iterator.rows == len(sales) and iterator.data_watermark == "2024-03-06"
+
+
+@pytest.mark.parametrize("external_memory", [True, False])
+def test_train_from_batches(tmp_path, external_memory):
+    table = pa.Table.from_pandas(_sales(), preserve_index=False)
+    result = train_external_memory(
+        lambda: table.to_batches(max_chunksize=64),
+        n_estimators=20,
+        external_memory=external_memory,
+        cache_dir=str(tmp_path),
+    )
+    assert result.rows == 300 and result.booster.num_boosted_rounds() == 20
+    assert result.feature_names == FORECAST_FEATURES
+    assert np.isfinite(result.r2)
+    assert list(tmp_path.iterdir()) == []  # page cache removed after training
+
+
+def test_disk_cached_dmatrix_fallback_without_ext_mem_quantile(tmp_path, monkeypatch):
+    # XGBoost 2.x (the locked version) has no ExtMemQuantileDMatrix.
+    monkeypatch.delattr(xgb, "ExtMemQuantileDMatrix", raising=False)
+    table = pa.Table.from_pandas(_sales(), preserve_index=False)
+    result = train_external_memory(lambda: table.to_batches(max_chunksize=64), n_estimators=10, cache_dir=str(tmp_path))
+    assert result.rows == 300 and result.booster.num_boosted_rounds() == 10
+    assert np.isfinite(result.r2)
+
+
+def test_empty_window_raises():
+    with pytest.raises(FileNotFoundError):
+        train_external_memory(lambda: iter([]), n_estimators=2)
+
+
+@pytest.fixture
+def curated_sales(dummy_settings, moto_aws, monkeypatch):
+    monkeypatch.setenv("MERLIN_TRAINING_EXTERNAL_MEMORY", "1")
+    monkeypatch.setenv("MERLIN_INCREMENTAL_ROUNDS", "5")
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket=BUCKET)
+    boto3.client("dynamodb", region_name="us-east-1").create_table(
+        TableName="merlin-test-runs",
+        KeySchema=[{"AttributeName": "run_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "run_id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    return s3
+
+
+def _put(s3, frame):
+    for sale_date, part in frame.groupby("sale_date"):
+        buffer = io.BytesIO()
+        part.drop(columns=["sale_date"]).to_parquet(buffer, index=False)
+        s3.put_object(Bucket=BUCKET, Key=f"sales_fact/sale_date={sale_date}/part-0.parquet", Body=buffer.getvalue())
+
+
+def test_pipeline_streams_full_and_incremental_runs(curated_sales):
+    _put(curated_sales, _sales())
+    first = run_training_job()
+    full = latest_model(use_cache=False)
+    assert full["training_mode"] == "full" and full["data_watermark"] == "2024-03-06"
+    assert int(full["rows_trained"]) == 300 and int(full["num_trees"]) == 250
+
+    assert run_training_job() == first
+
+    _put(curated_sales, _sales(rows=50, start_day=7))
+    run_training_job()
+    warm = latest_model(use_cache=False)
+    assert warm["training_mode"] == "incremental" and warm["data_watermark"] == "2024-03-07"
+    assert int(warm["rows_trained"]) == 350 and int(warm["num_trees"]) == 255
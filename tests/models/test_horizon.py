@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aws_merlin_agent.features.engineering import FORECAST_FEATURES
+from aws_merlin_agent.models.inference.horizon import forecast_horizon
+
+
+def _history(skus=("SKU-B", "SKU-A"), days=9):
+    rows = []
+    for offset, sku in enumerate(skus):
+        for day in range(days - offset):  # uneven history lengths
+            units = 10 + offset * 5 + day
+            rows.append(
+                {
+                    "sku": sku,
+                    "date": f"2024-03-{day + 1:02d}",
+                    "units_sold": units,
+                    "net_revenue": units * (20 + offset),
+                    "ad_spend": 15.0,
+                    "inventory_on_hand": 200 - day * 10,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def _reference(history, horizon, model):
+    """Naive per-SKU, per-day loop over plain Python lists."""
+    out = {}
+    for sku, group in history.sort_values("date").groupby("sku"):
+        units = group["units_sold"].astype(float).tolist()
+        price = group["net_revenue"].sum() / max(group["units_sold"].sum(), 1)
+        ad = group["ad_spend"].tail(7).mean()
+        inventory = float(group["inventory_on_hand"].iloc[-1])
+        preds = []
+        for step in range(horizon):
+            prev = units[-1]
+            revenue = price * prev
+            row = {
+                "net_revenue": revenue,
+                "ad_spend": ad,
+                "inventory_on_hand": inventory,
+                "revenue_per_unit": revenue / max(prev, 1),
+                "ad_efficiency": revenue / ad if ad > 0 else 0.0,
+                "stockout_risk": (sum(units[-6:]) + prev) / inventory if inventory > 0 else 0.0,
+                "lag_days": len(group) + step,
+            }
+            pred = max(model(row), 0.0)
+            preds.append(pred)
+            units.append(pred)
+            inventory = max(inventory - pred, 0.0)
+        out[sku] = preds
+    return out
+
+
+def _linear(row):
+    return 0.5 * row["net_revenue"] / 20 + 2 * row["stockout_risk"] + 0.1 * row["lag_days"] - 0.01 * row["inventory_on_hand"]
+
+
+def test_matches_naive_loop_with_one_call_per_day():
+    history = _history()
+    calls = []
+
+    def predict(columns, matrix):
+        calls.append(matrix.shape)
+        assert matrix.dtype == np.float32
+        return [_linear(dict(zip(columns, row))) for row in matrix.astype(float)]
+
+    result = forecast_horizon(history, 5, predict)
+    assert calls == [(2, len(FORECAST_FEATURES))] * 5
+    expected = _reference(history, 5, _linear)
+    for sku in ("SKU-A", "SKU-B"):
+        np.testing.assert_allclose([day["units"] for day in result[sku]], expected[sku], rtol=1e-4)
+    assert result["SKU-A"][0]["date"] == "2024-03-09"
+    assert result["SKU-B"][0]["date"] == "2024-03-10"
+
+
+def test_respects_model_feature_order_and_validates_inputs():
+    history = _history(skus=("SKU-A",))
+    seen = {}
+
+    def predict(columns, matrix):
+        seen["columns"] = columns
+        return matrix[:, 0]
+
+    result = forecast_horizon(history, 2, predict, feature_names=["lag_days", "ad_spend"])
+    assert seen["columns"] == ["lag_days", "ad_spend"]
+    assert [day["units"] for day in result["SKU-A"]] == [9.0, 10.0]
+
+    with pytest.raises(ValueError, match="Cannot project"):
+        forecast_horizon(history, 2, predict, feature_names=["weather"])
+    with pytest.raises(ValueError, match="inventory_on_hand"):
+        forecast_horizon(history.drop(columns=["inventory_on_hand"]), 2, predict)
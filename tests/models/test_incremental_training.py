@@ -0,0 +1,145 @@
+import io
+import math
+
+import boto3
+import pandas as pd
+import pytest
+
+from aws_merlin_agent.models import registry
+from aws_merlin_agent.models.registry import latest_model
+from aws_merlin_agent.models.training import pipeline
+from aws_merlin_agent.models.training.demand_forecast import train
+from aws_merlin_agent.models.training.pipeline import run_training_job
+
+BUCKET = "merlin-test-curated"
+
+
+def _put_partition(s3, sale_date, day):
+    frame = pd.DataFrame(
+        {
+            "seller_id": ["seller-123"] * 6,
+            "sku": [f"SKU-00{i}" for i in range(6)],
+            "date": [sale_date] * 6,
+            "units_sold": [10 + day + i for i in range(6)],
+            "net_revenue_usd": [20.0 * (10 + day + i) for i in range(6)],
+            "ad_spend_usd": [20.0 + i for i in range(6)],
+            "inventory_on_hand": [80 - day] * 6,
+        }
+    )
+    buffer = io.BytesIO()
+    frame.to_parquet(buffer, index=False)
+    s3.put_object(Bucket=BUCKET, Key=f"sales_fact/sale_date={sale_date}/part-0.parquet", Body=buffer.getvalue())
+
+
+@pytest.fixture
+def training_env(dummy_settings, moto_aws, monkeypatch):
+    monkeypatch.setenv("MERLIN_INCREMENTAL_ROUNDS", "5")
+    monkeypatch.setenv("MERLIN_MIN_INCREMENTAL_ROWS", "6")  # one partition of six SKUs
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket=BUCKET)
+    boto3.client("dynamodb", region_name="us-east-1").create_table(
+        TableName="merlin-test-runs",
+        KeySchema=[{"AttributeName": "run_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "run_id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    for day in range(3):
+        _put_partition(s3, f"2024-02-0{day + 1}", day)
+    return s3
+
+
+def test_incremental_runs_continue_from_the_watermark(training_env, monkeypatch):
+    first = run_training_job()
+    full = latest_model(use_cache=False)
+    assert full["training_mode"] == "full"
+    assert full["data_watermark"] == "2024-02-03"
+    assert int(full["rows_trained"]) == 18 and int(full["num_trees"]) == 250
+
+    assert run_training_job() == first  # nothing newer than the watermark
+
+    _put_partition(training_env, "2024-02-04", 3)
+    second = run_training_job()
+    warm = latest_model(use_cache=False)
+    assert warm["run_id"] == second
+    assert warm["training_mode"] == "incremental"
+    assert warm["base_run_id"] == first
+    assert warm["data_watermark"] == "2024-02-04"
+    assert int(warm["rows_trained"]) == 24 and int(warm["num_trees"]) == 255
+    assert warm["last_full_at"] == full["last_full_at"]
+    # Every run keeps its own artifact, so older runs (a pinned champion, a rollback) stay intact.
+    assert warm["artifact_uri"] != full["artifact_uri"] and f"/{first}/" in full["artifact_uri"]
+    training_env.head_object(Bucket=BUCKET, Key=full["artifact_uri"].split(f"{BUCKET}/", 1)[1])
+
+    _put_partition(training_env, "2024-02-05", 4)
+    run_training_job()
+    assert int(latest_model(use_cache=False)["num_trees"]) == 260  # chained from the warm-started model
+
+    monkeypatch.setenv("MERLIN_FULL_RETRAIN_DAYS", "0")
+    run_training_job()
+    assert latest_model(use_cache=False)["training_mode"] == "full"
+
+
+def test_small_incremental_window_is_deferred_until_enough_rows_arrive(training_env, monkeypatch):
+    monkeypatch.setenv("MERLIN_MIN_INCREMENTAL_ROWS", "10")
+    first = run_training_job()
+
+    _put_partition(training_env, "2024-02-04", 3)
+    assert run_training_job() == first  # 6 new rows: too few to train on
+    assert latest_model(use_cache=False)["data_watermark"] == "2024-02-03"
+
+    _put_partition(training_env, "2024-02-05", 4)
+    run_training_job()
+    warm = latest_model(use_cache=False)
+    assert warm["training_mode"] == "incremental" and warm["data_watermark"] == "2024-02-05"
+    assert int(warm["rows_trained"]) == 30
+
+
+def test_deferred_run_is_decided_before_any_training(training_env, monkeypatch):
+    monkeypatch.setenv("MERLIN_MIN_INCREMENTAL_ROWS", "10")
+    first = run_training_job()
+    _put_partition(training_env, "2024-02-04", 3)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("a deferred run must not train")
+
+    monkeypatch.setattr(pipeline, "train_external_memory", fail)
+    monkeypatch.setattr(pipeline, "train", fail)
+    assert run_training_job(external_memory=True) == first
+    assert run_training_job(external_memory=False) == first
+
+
+def test_incremental_runs_chain_past_a_pinned_champion(training_env):
+    first = run_training_job()
+    registry.set_champion(first)
+
+    _put_partition(training_env, "2024-02-04", 3)
+    second = run_training_job()
+    _put_partition(training_env, "2024-02-05", 4)
+    third = run_training_job()
+
+    assert latest_model(use_cache=False)["run_id"] == first  # the pin still serves traffic
+    newest = registry.newest_model()
+    assert newest["run_id"] == third
+    assert newest["base_run_id"] == second
+    assert newest["data_watermark"] == "2024-02-05"
+    assert int(newest["rows_trained"]) == 30
+
+
+def test_tiny_training_window_skips_the_holdout():
+    frame = pd.DataFrame(
+        {
+            "sku": ["SKU-001"] * 3,
+            "date": ["2024-02-01", "2024-02-02", "2024-02-03"],
+            "units_sold": [10, 12, 11],
+            "net_revenue": [200.0, 240.0, 220.0],
+            "ad_spend": [20.0, 21.0, 22.0],
+            "inventory_on_hand": [80, 79, 78],
+        }
+    )
+    result = train(frame, n_estimators=5)
+    assert result.rows == 3 and math.isnan(result.r2)
+
+
+def test_explicit_incremental_requires_a_previous_run(training_env):
+    with pytest.raises(ValueError, match="watermark"):
+        run_training_job(mode="incremental")
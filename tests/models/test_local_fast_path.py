@@ -0,0 +1,69 @@
+import json
+
+import boto3
+import numpy as np
+import pandas as pd
+import pytest
+from xgboost import XGBRegressor
+
+from aws_merlin_agent.models.inference.local_runner import LocalDemandForecaster
+
+URI = "s3://merlin-test-curated/models/fast/model.json"
+
+
+@pytest.fixture
+def forecaster(dummy_settings, moto_aws, tmp_path, monkeypatch):
+    monkeypatch.setenv("MERLIN_PREDICT_NTHREAD", "1")
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(rng.random((64, 3)), columns=["lag_days", "ad_spend", "inventory_on_hand"])
+    model = XGBRegressor(n_estimators=10, max_depth=3)
+    model.fit(frame, frame["ad_spend"] * 10 + frame["lag_days"])
+    path = tmp_path / "model.json"
+    model.save_model(str(path))
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket="merlin-test-curated")
+    s3.upload_file(str(path), "merlin-test-curated", "models/fast/model.json")
+    return LocalDemandForecaster(URI, "us-east-1"), model, frame
+
+
+def test_payload_formats_match_sklearn_predict(forecaster):
+    runner, model, frame = forecaster
+    sample = frame.iloc[:5]
+    expected = model.predict(sample)
+    shuffled = sample[["inventory_on_hand", "lag_days", "ad_spend"]].assign(extra=1.0)
+
+    payloads = [
+        {"instances": shuffled.to_dict(orient="records")},
+        {"instances": shuffled.to_dict(orient="list")},
+        {"columns": list(shuffled.columns), "data": shuffled.to_numpy().tolist()},
+    ]
+    for payload in payloads:
+        np.testing.assert_allclose(runner.predict(payload)["predictions"], expected, rtol=1e-5)
+    assert len(runner._layouts) == 1  # one schema validation for the shared column layout
+
+
+def test_shared_model_threads_are_set_once_at_load(forecaster):
+    runner, _, _ = forecaster
+    assert json.loads(runner.booster.save_config())["learner"]["generic_param"]["nthread"] == "1"
+    assert LocalDemandForecaster(URI, "us-east-1").booster is runner.booster
+    with pytest.raises(ValueError, match="MERLIN_PREDICT_NTHREAD"):
+        LocalDemandForecaster(URI, "us-east-1", nthread=4)
+
+
+def test_missing_feature_is_rejected(forecaster):
+    runner, _, _ = forecaster
+    with pytest.raises(ValueError, match="inventory_on_hand"):
+        runner.predict({"columns": ["lag_days", "ad_spend"], "data": [[1.0, 2.0]]})
+    assert runner.predict({"instances": []}) == {"predictions": []}
+
+
+def test_from_path_serves_local_file(tmp_path):
+    frame = pd.DataFrame(np.random.default_rng(1).random((16, 2)), columns=["lag_days", "ad_spend"])
+    model = XGBRegressor(n_estimators=3, max_depth=2)
+    model.fit(frame, frame["ad_spend"])
+    path = tmp_path / "model.json"
+    model.save_model(str(path))
+
+    runner = LocalDemandForecaster.from_path(path, nthread=1)
+    swapped = frame[["ad_spend", "lag_days"]].to_numpy()
+    np.testing.assert_allclose(runner.predict_matrix(["ad_spend", "lag_days"], swapped), model.predict(frame), rtol=1e-5)
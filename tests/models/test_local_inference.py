@@ -42,7 +42,7 @@ def test_local_inference_uses_registered_model(monkeypatch, dummy_settings, moto
         BillingMode="PAY_PER_REQUEST",
     )
 
-    register_model("s3://merlin-test-curated/models/test/demand_forecast/model.json", {"r2": 1.0})
+    model_id = register_model("s3://merlin-test-curated/models/test/demand_forecast/model.json", {"r2": 1.0})
 
     client = DemandForecastClient()
     engineered = build_feature_frame(df)
@@ -51,3 +51,9 @@ def test_local_inference_uses_registered_model(monkeypatch, dummy_settings, moto
     response = client.predict({"instances": inference_features.to_dict(orient="records")})
     assert "predictions" in response
     assert len(response["predictions"]) == 1
+    assert response["model_id"] == model_id
+
+    horizon = client.forecast_horizon(df.assign(sku=["SKU-001", "SKU-002"]), horizon=3)
+    assert horizon["model_id"] == model_id
+    assert sorted(horizon["forecasts"]) == ["SKU-001", "SKU-002"]
+    assert [day["date"] for day in horizon["forecasts"]["SKU-002"]] == ["2024-02-03", "2024-02-04", "2024-02-05"]
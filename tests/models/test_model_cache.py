@@ -0,0 +1,60 @@
+import boto3
+import pytest
+
+from aws_merlin_agent.models.inference.model_cache import ArtifactCache, LoadedModels
+
+URI = "s3://merlin-test-curated/models/demand_forecast/model.json"
+
+
+@pytest.fixture
+def bucket(moto_aws):
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket="merlin-test-curated")
+    s3.put_object(Bucket="merlin-test-curated", Key="models/demand_forecast/model.json", Body=b'{"v": 1}')
+    return s3
+
+
+def test_artifact_cache_downloads_once_per_etag(bucket, tmp_path):
+    cache = ArtifactCache(tmp_path, region="us-east-1")
+    first = cache.fetch(URI)
+    first.write_bytes(b"sentinel")  # a second fetch for the same ETag must not re-download
+    assert cache.fetch(URI).read_bytes() == b"sentinel"
+
+    bucket.put_object(Bucket="merlin-test-curated", Key="models/demand_forecast/model.json", Body=b'{"v": 2}')
+    refreshed = cache.fetch(URI)
+    assert refreshed.read_bytes() == b'{"v": 2}'
+    assert not first.exists()
+
+
+def test_loaded_models_skip_reload_until_etag_changes(bucket, tmp_path):
+    now = [0.0]
+    models = LoadedModels(ttl_s=60, clock=lambda: now[0])
+    cache = ArtifactCache(tmp_path, region="us-east-1")
+    loads = []
+
+    def loader(path):
+        loads.append(path)
+        return path.read_bytes()
+
+    assert models.get(URI, loader, cache=cache) == b'{"v": 1}'
+    bucket.put_object(Bucket="merlin-test-curated", Key="models/demand_forecast/model.json", Body=b'{"v": 2}')
+    assert models.get(URI, loader, cache=cache) == b'{"v": 1}'  # within TTL: no S3 call at all
+
+    now[0] = 61.0
+    assert models.get(URI, loader, cache=cache) == b'{"v": 2}'
+    now[0] = 200.0
+    assert models.get(URI, loader, cache=cache) == b'{"v": 2}'  # ETag unchanged: no reload
+    assert len(loads) == 2
+
+
+def test_new_version_bypasses_ttl(bucket, tmp_path):
+    models = LoadedModels(ttl_s=60, clock=lambda: 0.0)
+    cache = ArtifactCache(tmp_path, region="us-east-1")
+
+    def loader(path):
+        return path.read_bytes()
+
+    assert models.get(URI, loader, cache=cache, version="run-1") == b'{"v": 1}'
+    bucket.put_object(Bucket="merlin-test-curated", Key="models/demand_forecast/model.json", Body=b'{"v": 2}')
+    assert models.get(URI, loader, cache=cache, version="run-1") == b'{"v": 1}'  # same run: TTL applies
+    assert models.get(URI, loader, cache=cache, version="run-2") == b'{"v": 2}'
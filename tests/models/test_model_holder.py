@@ -0,0 +1,87 @@
+import time
+
+import boto3
+import numpy as np
+import pandas as pd
+import pytest
+from xgboost import XGBRegressor
+
+from aws_merlin_agent.models.inference.model_holder import ModelHolder
+from aws_merlin_agent.models.registry import register_model
+
+FEATURES = ["lag_days", "ad_spend"]
+
+
+@pytest.fixture
+def registry_env(dummy_settings, moto_aws):
+    boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="merlin-test-curated")
+    boto3.client("dynamodb", region_name="us-east-1").create_table(
+        TableName="merlin-test-runs",
+        KeySchema=[{"AttributeName": "run_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "run_id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def _register(tmp_path, name, level, key=None):
+    frame = pd.DataFrame(np.random.default_rng(0).random((32, 2)), columns=FEATURES)
+    model = XGBRegressor(n_estimators=5, max_depth=2)
+    model.fit(frame, np.full(len(frame), level))
+    path = tmp_path / f"{name}.json"
+    model.save_model(str(path))
+    key = key or f"models/{name}/model.json"
+    boto3.client("s3", region_name="us-east-1").upload_file(str(path), "merlin-test-curated", key)
+    return register_model(f"s3://merlin-test-curated/{key}", {"r2": 1.0})
+
+
+PAYLOAD = {"columns": FEATURES, "data": [[0.5, 0.5]]}
+
+
+def test_refresh_swaps_without_disturbing_in_flight_model(registry_env, tmp_path):
+    first = _register(tmp_path, "v1", 10.0)
+    holder = ModelHolder("us-east-1", start=False)
+    response = holder.predict(PAYLOAD)
+    assert response["model_id"] == first
+    in_flight = holder.forecaster
+
+    time.sleep(0.001)  # distinct created_at
+    second = _register(tmp_path, "v2", 50.0)
+    assert holder.refresh()
+
+    swapped = holder.predict(PAYLOAD)
+    assert swapped["model_id"] == second
+    assert swapped["predictions"][0] > response["predictions"][0]
+    assert in_flight.predict(PAYLOAD)["predictions"] == response["predictions"]
+
+
+def test_refresh_reloads_a_run_published_at_the_same_key(registry_env, tmp_path):
+    _register(tmp_path, "v1", 10.0, key="models/shared/model.json")
+    holder = ModelHolder("us-east-1", start=False)
+    before = holder.predict(PAYLOAD)["predictions"][0]
+
+    time.sleep(0.001)
+    second = _register(tmp_path, "v2", 50.0, key="models/shared/model.json")
+    assert holder.refresh()
+
+    swapped = holder.predict(PAYLOAD)
+    assert swapped["model_id"] == second
+    assert swapped["predictions"][0] > before + 20  # the new weights, not the cached booster
+
+
+def test_background_thread_picks_up_new_runs(registry_env, tmp_path):
+    _register(tmp_path, "v1", 10.0)
+    holder = ModelHolder("us-east-1", refresh_interval_s=0.05)
+    try:
+        time.sleep(0.001)
+        second = _register(tmp_path, "v2", 50.0)
+        deadline = time.time() + 5
+        while holder.model_id != second and time.time() < deadline:
+            time.sleep(0.05)
+        assert holder.model_id == second
+    finally:
+        holder.close()
+
+
+def test_holder_requires_a_registered_model(registry_env):
+    with pytest.raises(RuntimeError):
+        ModelHolder("us-east-1", start=False)
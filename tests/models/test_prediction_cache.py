@@ -0,0 +1,95 @@
+import time
+
+import boto3
+import numpy as np
+import pandas as pd
+import pytest
+from xgboost import XGBRegressor
+
+from aws_merlin_agent.models.inference.demand_forecast_client import DemandForecastClient
+from aws_merlin_agent.models.inference.prediction_cache import (
+    LocalPredictionStore,
+    PredictionCache,
+    payload_fingerprint,
+)
+from aws_merlin_agent.models.registry import register_model
+
+FEATURES = ["lag_days", "ad_spend"]
+
+
+def test_fingerprint_ignores_key_order():
+    assert payload_fingerprint({"instances": [{"a": 1, "b": np.float32(2.0)}]}) == payload_fingerprint(
+        {"instances": [{"b": 2.0, "a": 1}]}
+    )
+    assert payload_fingerprint({"instances": [{"a": 1}]}) != payload_fingerprint({"instances": [{"a": 2}]})
+
+
+def test_lru_eviction_and_model_change():
+    cache = PredictionCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.put("m1", key, {"predictions": [key]})
+    assert cache.get("m1", "a") == {"predictions": ["a"]}  # "a" becomes most recent
+    cache.put("m1", "c", {"predictions": ["c"]})
+    assert cache.get("m1", "b") is None
+    assert cache.get("m1", "a") is not None
+
+    assert cache.get("m2", "a") is None  # a new active model drops the old entries
+    assert len(cache) == 0
+
+
+def test_shared_store_is_visible_across_caches(tmp_path):
+    store = LocalPredictionStore(tmp_path)
+    PredictionCache(shared=store).put("m1", "abc", {"predictions": [1.0]})
+    other = PredictionCache(shared=store)
+    assert other.get("m1", "abc") == {"predictions": [1.0]}
+    assert other.get("m2", "abc") is None
+
+
+@pytest.fixture
+def registry_env(monkeypatch, dummy_settings, moto_aws):
+    monkeypatch.setenv("MERLIN_INFERENCE_MODE", "local")
+    monkeypatch.setenv("MERLIN_MODEL_REFRESH_S", "0")
+    boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="merlin-test-curated")
+    boto3.client("dynamodb", region_name="us-east-1").create_table(
+        TableName="merlin-test-runs",
+        KeySchema=[{"AttributeName": "run_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "run_id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def _register(tmp_path, name, level):
+    frame = pd.DataFrame(np.random.default_rng(0).random((32, 2)), columns=FEATURES)
+    model = XGBRegressor(n_estimators=5, max_depth=2)
+    model.fit(frame, np.full(len(frame), level))
+    path = tmp_path / f"{name}.json"
+    model.save_model(str(path))
+    key = f"models/{name}/model.json"
+    boto3.client("s3", region_name="us-east-1").upload_file(str(path), "merlin-test-curated", key)
+    return register_model(f"s3://merlin-test-curated/{key}", {"r2": 1.0})
+
+
+def test_client_skips_model_for_repeat_payloads(registry_env, tmp_path):
+    first = _register(tmp_path, "v1", 10.0)
+    client = DemandForecastClient()
+    calls = []
+    holder = client.local_runner
+    original = holder.predict
+    holder.predict = lambda payload: calls.append(payload) or original(payload)
+
+    payload = {"instances": [{"lag_days": 0.5, "ad_spend": 0.5}]}
+    response = client.predict(payload)
+    assert client.predict({"instances": [{"ad_spend": 0.5, "lag_days": 0.5}]}) == response
+    assert len(calls) == 1 and response["model_id"] == first
+
+    many = client.predict_many({"SKU-1": payload, "SKU-2": {"instances": [{"lag_days": 0.1, "ad_spend": 0.9}]}})
+    assert many["SKU-1"] == response
+    assert len(calls) == 2  # only SKU-2 was scored
+
+    time.sleep(0.001)  # distinct created_at
+    second = _register(tmp_path, "v2", 50.0)
+    assert holder.refresh()
+    refreshed = client.predict(payload)
+    assert refreshed["model_id"] == second
+    assert refreshed["predictions"][0] > response["predictions"][0]
+    assert len(calls) == 3
@@ -0,0 +1,116 @@
+import boto3
+import pytest
+
+from aws_merlin_agent.models import registry
+
+
+def _create_runs_table(with_index=True):
+    kwargs = {}
+    attributes = [{"AttributeName": "run_id", "AttributeType": "S"}]
+    if with_index:
+        attributes += [
+            {"AttributeName": "model_type", "AttributeType": "S"},
+            {"AttributeName": "created_at", "AttributeType": "S"},
+        ]
+        kwargs["GlobalSecondaryIndexes"] = [
+            {
+                "IndexName": registry.MODEL_INDEX,
+                "KeySchema": [
+                    {"AttributeName": "model_type", "KeyType": "HASH"},
+                    {"AttributeName": "created_at", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+        ]
+    boto3.client("dynamodb", region_name="us-east-1").create_table(
+        TableName="merlin-test-runs",
+        KeySchema=[{"AttributeName": "run_id", "KeyType": "HASH"}],
+        AttributeDefinitions=attributes,
+        BillingMode="PAY_PER_REQUEST",
+        **kwargs,
+    )
+
+
+def test_latest_model_queries_index_for_one_item(dummy_settings, moto_aws, monkeypatch):
+    _create_runs_table()
+    newest = registry.register_model("s3://bucket/new/model.json", {"r2": 0.7})
+    registry.register_model("s3://bucket/other/model.json", {"r2": 0.9}, model_type="price_elasticity")
+    table = registry._runs_table()
+    calls = []
+
+    class RecordingTable:
+        def __getattr__(self, name):
+            return getattr(table, name)
+
+        def query(self, **kwargs):
+            calls.append(kwargs)
+            return table.query(**kwargs)
+
+    monkeypatch.setattr(registry, "_runs_table", RecordingTable)
+    monkeypatch.setattr(registry, "_latest_by_scan", lambda *args: pytest.fail("scanned despite index"))
+
+    assert registry.latest_model()["run_id"] == newest
+    assert calls[0]["IndexName"] == registry.MODEL_INDEX
+    assert calls[0]["Limit"] == 1
+    assert calls[0]["ScanIndexForward"] is False
+
+
+# Ordering is asserted on the scan fallback: moto applies Limit before sorting GSI results.
+def test_latest_model_falls_back_to_scan_without_index(dummy_settings, moto_aws):
+    _create_runs_table(with_index=False)
+    registry.register_model("s3://bucket/old/model.json", {"r2": 0.5})
+    newest = registry.register_model("s3://bucket/new/model.json", {"r2": 0.7})
+    registry.register_model("s3://bucket/other/model.json", {"r2": 0.9}, model_type="price_elasticity")
+
+    assert registry.latest_model()["run_id"] == newest
+
+
+def test_champion_pointer_overrides_newest_and_cache_is_invalidated(dummy_settings, moto_aws):
+    _create_runs_table(with_index=False)
+    champion = registry.register_model("s3://bucket/champion/model.json", {"r2": 0.9})
+    newest = registry.register_model("s3://bucket/new/model.json", {"r2": 0.6})
+    assert registry.latest_model()["run_id"] == newest
+
+    registry.set_champion(champion)
+    assert registry.latest_model()["run_id"] == champion
+
+    registry.clear_champion()
+    assert registry.latest_model()["run_id"] == newest
+
+    with pytest.raises(ValueError):
+        registry.set_champion("missing")
+
+
+def test_latest_model_is_cached(dummy_settings, moto_aws, mocker):
+    _create_runs_table()
+    registry.register_model("s3://bucket/new/model.json", {"r2": 0.6})
+    registry.latest_model()
+    query = mocker.spy(registry, "_latest_by_index")
+
+    registry.latest_model()
+    registry.latest_model(use_cache=False)
+
+    assert query.call_count == 1
+
+
+def test_cli_prints_active_artifact_uri(dummy_settings, moto_aws, monkeypatch, capsys):
+    _create_runs_table()
+    monkeypatch.setattr("sys.argv", ["registry", "artifact-uri"])
+    with pytest.raises(SystemExit):
+        registry.main()
+
+    first = registry.register_model("s3://bucket/models/run-1/model.json", {"r2": 0.5})
+    registry.register_model("s3://bucket/models/run-2/model.json", {"r2": 0.7})
+    registry.set_champion(first)
+    registry.main()
+    assert capsys.readouterr().out.strip() == "s3://bucket/models/run-1/model.json"
+
+
+def test_cli_rejects_artifacts_the_endpoint_cannot_serve(dummy_settings, moto_aws, monkeypatch, capsys):
+    _create_runs_table()
+    monkeypatch.setattr("sys.argv", ["registry", "artifact-uri"])
+    registry.register_model("s3://bucket/models/run-1/model.ubj.gz", {"r2": 0.5})
+
+    with pytest.raises(SystemExit, match="MERLIN_MODEL_FORMAT=json"):
+        registry.main()
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,93 @@
+import io
+import json
+
+import boto3
+import numpy as np
+import pandas as pd
+import pytest
+
+from aws_merlin_agent.models.registry import latest_model
+from aws_merlin_agent.models.training.pipeline import run_tuning_job
+from aws_merlin_agent.models.training.tuning import sample_configs, time_ordered_split, tune
+
+BUCKET = "merlin-test-curated"
+
+
+def _history(days=20, skus=4):
+    rng = np.random.default_rng(0)
+    rows = []
+    for day in range(days):
+        for sku in range(skus):
+            units = 10 + sku * 3 + day % 5 + rng.normal()
+            rows.append(
+                {
+                    "sku": f"SKU-{sku}",
+                    "date": (pd.Timestamp("2024-01-01") + pd.Timedelta(days=day)).strftime("%Y-%m-%d"),
+                    "units_sold": units,
+                    "net_revenue": units * 20.0,
+                    "ad_spend": 10.0 + sku,
+                    "inventory_on_hand": 100 - day,
+                }
+            )
+    # Shuffled on purpose: the split must come from the dates, not the row order.
+    return pd.DataFrame(rows).sample(frac=1.0, random_state=1)
+
+
+def test_sample_configs_uses_grid_or_seeded_sample():
+    space = {"max_depth": [2, 4], "learning_rate": [0.1, 0.3]}
+    assert len(sample_configs(space, max_trials=10)) == 4
+    sampled = sample_configs(space, max_trials=3, seed=7)
+    assert len(sampled) == 3 and sampled == sample_configs(space, max_trials=3, seed=7)
+
+
+def test_time_ordered_split_holds_out_latest_days():
+    df = _history()
+    X_train, y_train, X_val, y_val = time_ordered_split(df, validation_fraction=0.2)
+    assert len(X_train) == 64 and len(X_val) == 16  # the last 4 of 20 days
+    assert X_train["lag_days"].max() < X_val["lag_days"].min()
+
+
+def test_tune_picks_lowest_validation_rmse_with_early_stopping():
+    space = {"max_depth": [2, 3], "learning_rate": [0.3]}
+    result = tune(_history(), search_space=space, max_workers=2, max_rounds=200, early_stopping_rounds=5)
+
+    assert len(result.trials) == 2
+    assert result.best_trial.rmse == min(trial.rmse for trial in result.trials)
+    assert all(trial.seconds > 0 and trial.best_iteration < 199 for trial in result.trials)
+    # Refit on the whole window, including the held-out days, with the early-stopped tree count.
+    assert result.best.booster.num_boosted_rounds() == result.best_trial.best_iteration + 1
+    assert result.best.rows == 80
+    assert result.best.feature_names[-1] == "lag_days"
+
+
+@pytest.fixture
+def curated_sales(dummy_settings, moto_aws):
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket=BUCKET)
+    boto3.client("dynamodb", region_name="us-east-1").create_table(
+        TableName="merlin-test-runs",
+        KeySchema=[{"AttributeName": "run_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "run_id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    history = _history(days=10).rename(columns={"net_revenue": "net_revenue_usd", "ad_spend": "ad_spend_usd"})
+    for sale_date, frame in history.groupby("date"):
+        buffer = io.BytesIO()
+        frame.to_parquet(buffer, index=False)
+        s3.put_object(Bucket=BUCKET, Key=f"sales_fact/sale_date={sale_date}/part-0.parquet", Body=buffer.getvalue())
+    return s3
+
+
+def test_tuning_job_registers_best_trial(curated_sales):
+    model_id = run_tuning_job(max_trials=2, max_workers=1)
+
+    record = latest_model(use_cache=False)
+    assert record["run_id"] == model_id
+    assert record["training_mode"] == "tuned"
+    assert record["data_watermark"] == "2024-01-10"  # the refit model saw every day up to it
+    assert int(record["num_trees"]) == int(record["metrics"]["best_iteration"]) + 1
+    assert int(record["tuning_trials"]) == 2
+    assert set(json.loads(record["hyperparameters"])) >= {"max_depth", "learning_rate"}
+    assert {"r2", "rmse", "best_iteration", "tuning_seconds"} <= set(record["metrics"])
+    curated_sales.head_object(Bucket=BUCKET, Key=f"models/test/demand_forecast/{model_id}/model.ubj.gz")
+    assert record["artifact_format"] == "ubj" and record["artifact_compression"] == "gzip"